@@ -1,13 +1,40 @@
+import time
+STARTUP_STARTED = time.perf_counter() # Antes de las demás importaciones, para medirlas en el informe de arranque
 import os
 import subprocess
 import tkinter as tk
 import tkinter.ttk as ttk
 from tkinter import filedialog, messagebox
-from tkinterdnd2 import TkinterDnD, DND_FILES
-import cv2
-from PIL import Image, ImageTk
 import threading
-import time
+import hashlib
+import hmac
+import json
+import math
+import sqlite3
+import argparse
+import multiprocessing
+import sys
+import queue
+import uuid
+import ctypes
+import select
+import socket
+import struct
+import tempfile
+import shutil
+import signal
+import itertools
+import functools
+import atexit
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# Módulos pesados que se importan al usarse por primera vez (ver require_numpy, require_cv2 y require_pil)
+np = None
+cv2 = None
+Image = None
+ImageTk = None
 
 # --- Variables Globales para Widgets Tkinter (para permitir el acceso desde varias funciones) ---
 entry_file_path = None
@@ -17,6 +44,10 @@ entry_end_time = None
 entry_output_name = None
 status_label = None
 output_format_combobox = None
+job_priority_combobox = None
+media_backend_combobox = None
+encoding_profile_combobox = None
+render_server_entry = None
 waveform_canvas = None
 waveform_start_line = None
 waveform_end_line = None
@@ -29,6 +60,196 @@ time_ruler_canvas = None
 selected_start_time_label = None
 selected_end_time_label = None
 
+# Ventana de tiempo visible (zoom): inicio y duración en segundos; 0 significa el archivo completo
+view_start_seconds = 0.0
+view_span_seconds = 0.0
+spectrogram_canvas = None
+
+# Archivos ingresados por arrastrar y soltar: ruta -> {"duration": segundos, "channels": n}
+ingested_media = {}
+file_list_tree = None
+
+# Modo en vivo: casilla de la interfaz y estado del archivo en grabación que se sigue (ver start_live_tracking)
+live_mode_var = None
+live_state = None
+
+# Picos de audio por canal del archivo actual (ver extract_channel_peaks); None mientras se calculan
+waveform_peaks = None
+
+# Coincidencias del jingle de referencia: lista de tuplas (segundos, confianza)
+jingle_matches = []
+
+# Límites de escena detectados en el archivo actual (segundos), usados como puntos de ajuste de la selección
+scene_boundaries = []
+
+# Rangos adicionales (segundos) agregados con Mayús + arrastrar; se exportan junto a la selección principal
+extra_selection_ranges = []
+waveform_drag_adds_range = False
+
+# Lista de decisiones de edición: rangos ordenados de uno o varios archivos (ver edl_add_range)
+edit_decision_list = []
+edl_tree = None
+entry_edl_audio_filters = None
+entry_edl_video_filters = None
+
+# Evita que aparezca una ventana de consola en Windows (no existe en otros sistemas)
+NO_WINDOW_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+NEW_PROCESS_GROUP_FLAGS = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+
+# Carpeta donde se guardan los resultados de análisis reutilizables entre sesiones
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cortador_cache")
+
+# --- Trazas de Rendimiento ---
+
+TRACE_MAX_EVENTS = 200000 # Eventos guardados para exportar; al llenarse se descartan los más viejos
+TRACE_STATS_WINDOW = 500 # Duraciones recientes por etapa con las que se calculan p50/p95
+TRACE_STATS_REFRESH_MS = 1000
+
+TRACE_ENABLED = False # Apagado, cada punto instrumentado cuesta una consulta a esta variable
+trace_events = deque(maxlen=TRACE_MAX_EVENTS) # (etapa, inicio_ns, duración_ns, id de hilo, argumentos)
+trace_stats = {} # etapa -> deque con las últimas duraciones en ns
+trace_thread_names = {} # id de hilo -> nombre, para rotular las filas del visor de trazas
+_trace_lock = threading.Lock()
+
+class TraceSpan:
+    """Mide un tramo de código con 'with' y lo registra al salir."""
+    __slots__ = ("name", "args", "started")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_trace(self.name, self.started, time.perf_counter_ns() - self.started, self.args)
+        return False
+
+class _NullTraceSpan:
+    """Tramo que no hace nada; se reutiliza siempre el mismo mientras las trazas están apagadas."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_TRACE_SPAN = _NullTraceSpan()
+
+def trace_span(name, **args):
+    """Retorna un tramo medible para usar con 'with' (uno nulo si las trazas están apagadas)."""
+    return TraceSpan(name, args or None) if TRACE_ENABLED else NULL_TRACE_SPAN
+
+def traced(name):
+    """Decorador que mide cada llamada a la función como un tramo con el nombre indicado."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not TRACE_ENABLED:
+                return function(*args, **kwargs)
+            with TraceSpan(name, None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def record_trace(name, started_ns, duration_ns, args=None):
+    """Guarda un tramo terminado para la exportación y para las estadísticas por etapa."""
+    thread_id = threading.get_ident()
+    with _trace_lock:
+        if thread_id not in trace_thread_names:
+            trace_thread_names[thread_id] = threading.current_thread().name
+        trace_events.append((name, started_ns, duration_ns, thread_id, args))
+        durations = trace_stats.get(name)
+        if durations is None:
+            durations = trace_stats[name] = deque(maxlen=TRACE_STATS_WINDOW)
+        durations.append(duration_ns)
+
+def set_tracing(enabled):
+    """Activa o desactiva el registro de tramos."""
+    global TRACE_ENABLED
+    TRACE_ENABLED = bool(enabled)
+
+def clear_traces():
+    """Borra los tramos y estadísticas acumulados."""
+    with _trace_lock:
+        trace_events.clear()
+        trace_stats.clear()
+
+def trace_percentiles():
+    """Retorna (etapa, cantidad, p50_ms, p95_ms, máx_ms) de las duraciones recientes de cada etapa."""
+    require_numpy()
+    with _trace_lock:
+        snapshot = {name: np.array(durations, dtype=np.float64) for name, durations in trace_stats.items()}
+    rows = []
+    for name in sorted(snapshot):
+        durations_ms = snapshot[name] / 1e6
+        p50, p95 = np.percentile(durations_ms, [50, 95])
+        rows.append((name, len(durations_ms), float(p50), float(p95), float(durations_ms.max())))
+    return rows
+
+def export_trace(path):
+    """Escribe los tramos en el formato de eventos de Chrome (chrome://tracing, Perfetto)."""
+    with _trace_lock:
+        events = list(trace_events)
+        thread_names = dict(trace_thread_names)
+    pid = os.getpid()
+    trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}}
+             for thread_id, thread_name in thread_names.items()]
+    for name, started_ns, duration_ns, thread_id, args in events:
+        event = {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": thread_id,
+                 "ts": started_ns / 1000, "dur": duration_ns / 1000}
+        if args:
+            event["args"] = args
+        trace.append(event)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+def show_trace_stats_window(master):
+    """Ventana con p50/p95 por etapa que se actualiza sola mientras está abierta."""
+    window = tk.Toplevel(master)
+    window.title("Rendimiento")
+    center_window(window, 560, 400)
+
+    enabled_var = tk.BooleanVar(value=TRACE_ENABLED)
+    controls = tk.Frame(window)
+    controls.pack(fill="x", padx=10, pady=5)
+    tk.Checkbutton(controls, text="Registrar tramos", variable=enabled_var,
+                   command=lambda: set_tracing(enabled_var.get())).pack(side="left")
+
+    def export():
+        path = filedialog.asksaveasfilename(parent=window, title="Exportar trazas", defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            count = export_trace(path)
+            messagebox.showinfo("Trazas exportadas", f"Se exportaron {count} tramos a:\n{path}", parent=window)
+
+    tk.Button(controls, text="Exportar trazas", command=export).pack(side="right")
+    tk.Button(controls, text="Limpiar", command=clear_traces).pack(side="right", padx=5)
+
+    columns = ("n", "p50", "p95", "max")
+    tree = ttk.Treeview(window, columns=columns)
+    tree.heading("#0", text="Etapa")
+    for column, title in zip(columns, ("Cantidad", "p50 (ms)", "p95 (ms)", "Máx (ms)")):
+        tree.heading(column, text=title)
+        tree.column(column, width=80, anchor="e")
+    tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+    def refresh():
+        if not window.winfo_exists():
+            return
+        tree.delete(*tree.get_children())
+        for name, count, p50, p95, longest in trace_percentiles():
+            tree.insert("", "end", text=name, values=(count, f"{p50:.2f}", f"{p95:.2f}", f"{longest:.2f}"))
+        window.after(TRACE_STATS_REFRESH_MS, refresh)
+
+    refresh()
+
 # --- Funciones Auxiliares ---
 
 def time_to_seconds(time_str):
@@ -53,11 +274,12 @@ def format_seconds_to_time(seconds):
     secs = int(seconds % 60)
     return f"{hours:02}:{minutes:02}:{secs:02}"
 
+@traced("sondeo.duracion")
 def get_media_duration(file_path):
     """Obtiene la duración de un archivo de video o audio usando ffprobe."""
     try:
         cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-               '-of', 'default=noprint_wrappers=1:nokey=1', file_path]
+               '-of', 'default=noprint_wrappers=1:nokey=1', local_media_input(file_path)]
         result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
         duration = float(result.stdout.strip())
         return duration # Retorna en segundos para cálculos más precisos
@@ -65,6 +287,28 @@ def get_media_duration(file_path):
         print(f"Error al obtener la duración del medio: {e}")
         return 0.0
 
+def media_cache_key(file_path):
+    """Genera una clave que identifica el contenido del archivo (ruta o URL, tamaño y fecha de modificación)."""
+    path, size, mtime_ns = source_identity(file_path)
+    identity = f"{path}|{size}|{mtime_ns}"
+    if is_url(file_path):
+        identity += f"|{get_remote_source(file_path).etag}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+def path_is_within(path, directory):
+    """Indica si la ruta está dentro de la carpeta (o es ella misma); "salida2" no cuenta como dentro de "salida"."""
+    directory = os.path.abspath(directory)
+    try:
+        return os.path.commonpath([os.path.abspath(path), directory]) == directory
+    except ValueError: # Distintas unidades en Windows
+        return False
+
+def get_cache_path(file_path, kind, extension):
+    """Retorna la ruta en la caché para un tipo de análisis (ej. 'escenas') del archivo dado."""
+    kind_dir = os.path.join(CACHE_DIR, kind)
+    os.makedirs(kind_dir, exist_ok=True)
+    return os.path.join(kind_dir, media_cache_key(file_path) + extension)
+
 def center_window(master, width, height):
     """Centra la ventana en la pantalla."""
     master.geometry(f"{width}x{height}")
@@ -74,67 +318,1113 @@ def center_window(master, width, height):
     y = (screen_height // 2) - (height // 2)
     master.geometry(f"{width}x{height}+{x}+{y}")
 
-# --- Visualización de Onda (Simulada) y Guía de Tiempos ---
+# --- Orígenes HTTP (Peticiones por Rango con Caché Local) ---
+
+RANGE_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+RANGE_BLOCK_SIZE = 256 * 1024 # Unidad de descarga y de caché de los archivos remotos
+RANGE_READAHEAD_BLOCKS = 8 # En lecturas abiertas (bytes=N-) se piden juntos hasta estos bloques faltantes
+RANGE_CACHE_MAX_BYTES = 20 * 1024 ** 3 # Al superarse se borran los archivos remotos usados hace más tiempo
+HTTP_TIMEOUT_SECONDS = 30
+
+remote_sources = {} # token -> RemoteSource
+_remote_sources_lock = threading.Lock()
+range_proxy_server = None
+
+def is_url(path):
+    """Indica si el origen es una URL HTTP(S) en lugar de un archivo local."""
+    return isinstance(path, str) and path.lower().startswith(("http://", "https://"))
+
+def source_exists(path):
+    """Como os.path.exists, pero acepta URLs (se validan al abrirlas)."""
+    return bool(path) and (is_url(path) or os.path.exists(path))
+
+def normalize_source_path(path):
+    """Ruta absoluta de un archivo local; las URLs se dejan tal cual."""
+    return path if is_url(path) else os.path.abspath(path)
+
+def source_identity(path):
+    """Retorna (ruta normalizada, tamaño, fecha de modificación en ns) de un archivo local o remoto."""
+    if is_url(path):
+        source = get_remote_source(path)
+        return path, source.size, source.mtime_ns
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+class RemoteSource:
+    """Archivo remoto con caché local por bloques: solo se descargan los rangos que alguien lee.
+
+    Los datos van a un archivo disperso del tamaño del original y un mapa de bloques (en un JSON junto a él)
+    indica cuáles ya se descargaron, así otras operaciones sobre la misma URL los reutilizan entre sesiones.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.token = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        self.data_path = os.path.join(RANGE_CACHE_DIR, self.token + ".datos")
+        self.meta_path = os.path.join(RANGE_CACHE_DIR, self.token + ".json")
+        self.lock = threading.Lock()
+        self._read_origin_headers()
+        self._load_blocks()
+
+    def _request(self, start, end):
+        import urllib.request
+        request = urllib.request.Request(self.url, headers={"Range": f"bytes={start}-{end}"})
+        return urllib.request.urlopen(request, timeout=HTTP_TIMEOUT_SECONDS)
+
+    def _read_origin_headers(self):
+        """Pide un solo byte: da el tamaño, la versión (ETag/Last-Modified) y confirma que hay rangos."""
+        import email.utils
+        with self._request(0, 0) as response:
+            content_range = response.headers.get("Content-Range")
+            if response.status != 206 or not content_range:
+                raise OSError(f"El servidor no admite peticiones por rango: {self.url}")
+            self.size = int(content_range.rsplit("/", 1)[1])
+            self.etag = response.headers.get("ETag") or ""
+            last_modified = response.headers.get("Last-Modified")
+        self.mtime_ns = int(email.utils.parsedate_to_datetime(last_modified).timestamp() * 1e9) if last_modified else 0
+
+    def _load_blocks(self):
+        block_count = max(1, math.ceil(self.size / RANGE_BLOCK_SIZE))
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if ((meta["url"], meta["size"], meta["etag"], meta["mtime_ns"]) == (self.url, self.size, self.etag, self.mtime_ns)
+                    and os.path.exists(self.data_path)):
+                self.blocks = bytearray.fromhex(meta["bloques"])
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+        # Primera vez o el archivo remoto cambió: se empieza una caché vacía
+        os.makedirs(RANGE_CACHE_DIR, exist_ok=True)
+        evict_range_cache()
+        with open(self.data_path, "wb") as f:
+            f.truncate(self.size) # Disperso: no ocupa disco hasta que se escriben los bloques
+        self.blocks = bytearray(block_count)
+        self._save_blocks()
+
+    def _save_blocks(self):
+        meta = {"url": self.url, "size": self.size, "etag": self.etag, "mtime_ns": self.mtime_ns,
+                "bytes_en_cache": sum(self.blocks) * RANGE_BLOCK_SIZE, "bloques": self.blocks.hex()}
+        temp_path = self.meta_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self.meta_path)
+
+    def ensure(self, first_block, last_block):
+        """Descarga los bloques faltantes del intervalo, un pedido por cada tramo contiguo.
+
+        Si el servidor corta una respuesta antes de tiempo se lanza OSError y esos bloques no se marcan como
+        descargados (los tramos completos anteriores sí se guardan).
+        """
+        with self.lock:
+            block = first_block
+            fetched = False
+            try:
+                while block <= last_block:
+                    if self.blocks[block]:
+                        block += 1
+                        continue
+                    run_end = block
+                    while run_end + 1 <= last_block and not self.blocks[run_end + 1]:
+                        run_end += 1
+                    start = block * RANGE_BLOCK_SIZE
+                    end = min(self.size, (run_end + 1) * RANGE_BLOCK_SIZE) - 1
+                    expected = end - start + 1
+                    with trace_span("http.rango", bytes=expected), self._request(start, end) as response, \
+                            open(self.data_path, "r+b") as f:
+                        if response.status != 206:
+                            raise OSError(f"El servidor ignoró el rango pedido ({response.status}): {self.url}")
+                        f.seek(start)
+                        received = 0
+                        while received < expected:
+                            data = response.read(min(RANGE_BLOCK_SIZE, expected - received))
+                            if not data:
+                                break
+                            f.write(data)
+                            received += len(data)
+                    if received != expected:
+                        raise OSError(f"El servidor cortó la respuesta ({received} de {expected} bytes): {self.url}")
+                    self.blocks[block:run_end + 1] = b"\x01" * (run_end + 1 - block)
+                    fetched = True
+                    block = run_end + 1
+            finally:
+                if fetched:
+                    self._save_blocks()
+
+    def read(self, offset, length, limit):
+        """Lee del archivo local los bytes pedidos, descargándolos antes si faltan.
+
+        limit es el último byte del rango que pidió el cliente: la lectura anticipada no lo sobrepasa.
+        """
+        first_block = offset // RANGE_BLOCK_SIZE
+        last_block = (offset + length - 1) // RANGE_BLOCK_SIZE
+        if not all(self.blocks[first_block:last_block + 1]):
+            readahead_block = min(first_block + RANGE_READAHEAD_BLOCKS - 1, limit // RANGE_BLOCK_SIZE)
+            self.ensure(first_block, max(last_block, readahead_block))
+        with open(self.data_path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+def evict_range_cache(max_bytes=RANGE_CACHE_MAX_BYTES):
+    """Borra los archivos remotos cacheados usados hace más tiempo hasta quedar bajo el límite."""
+    entries, total = [], 0
+    for name in os.listdir(RANGE_CACHE_DIR):
+        if not name.endswith(".json"):
+            continue
+        meta_path = os.path.join(RANGE_CACHE_DIR, name)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                cached_bytes = json.load(f).get("bytes_en_cache", 0)
+            entries.append((os.path.getmtime(meta_path), name[:-len(".json")], cached_bytes))
+        except (OSError, ValueError):
+            continue
+        total += cached_bytes
+    for _, token, cached_bytes in sorted(entries):
+        if total <= max_bytes:
+            break
+        if token in remote_sources:
+            continue # En uso en esta sesión
+        for extension in (".json", ".datos"):
+            try:
+                os.remove(os.path.join(RANGE_CACHE_DIR, token + extension))
+            except OSError:
+                pass
+        total -= cached_bytes
+
+def get_remote_source(url):
+    """Retorna (creándolo una vez por sesión) el RemoteSource de la URL."""
+    token = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    with _remote_sources_lock:
+        source = remote_sources.get(token)
+        if source is None:
+            source = remote_sources[token] = RemoteSource(url)
+    return source
+
+def parse_byte_range(range_header, size):
+    """Interpreta el primer intervalo de un encabezado Range; retorna (inicio, fin) o None si no pide un rango.
+
+    Lanza ValueError si el intervalo está mal formado (ej. "bytes=-" o "bytes=5-2"). Un inicio >= size
+    indica un rango que no se puede satisfacer (incluye el sufijo vacío "bytes=-0").
+    """
+    if not range_header.startswith("bytes="):
+        return None
+    first, _, last = range_header[len("bytes="):].split(",")[0].strip().partition("-")
+    if not first and not last:
+        raise ValueError(f"Rango mal formado: {range_header}")
+    if not first:
+        return max(0, size - int(last)), size - 1 # Sufijo: los últimos N bytes
+    start = int(first)
+    if last and int(last) < start:
+        raise ValueError(f"Rango mal formado: {range_header}")
+    return start, min(int(last), size - 1) if last else size - 1
+
+def _create_range_proxy_handler():
+    """Construye la clase del manejador (http.server se importa recién cuando se abre una URL)."""
+    from http.server import BaseHTTPRequestHandler
+
+    class RangeProxyHandler(BaseHTTPRequestHandler):
+        """Sirve los RemoteSource con soporte de rangos, leyendo de la caché local y completándola si falta."""
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # Con un búfer de envío chico el proxy no se adelanta mucho a lo que FFmpeg realmente lee
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, RANGE_BLOCK_SIZE)
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+        def do_GET(self):
+            self._respond(send_body=True)
+
+        def _respond(self, send_body):
+            source = remote_sources.get(self.path.split("/")[1] if self.path.count("/") >= 1 else "")
+            if source is None:
+                self.send_error(404)
+                return
+            start, end, status = 0, source.size - 1, 200
+            try:
+                byte_range = parse_byte_range(self.headers.get("Range", ""), source.size)
+            except ValueError:
+                self.send_error(400, "Rango mal formado")
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                if start >= source.size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{source.size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+            self.send_response(status)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(end - start + 1))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{source.size}")
+            self.end_headers()
+            if not send_body:
+                return
+            offset = start
+            try:
+                while offset <= end:
+                    length = min(RANGE_BLOCK_SIZE - offset % RANGE_BLOCK_SIZE, end - offset + 1)
+                    self.wfile.write(source.read(offset, length, end))
+                    offset += length
+            except (BrokenPipeError, ConnectionResetError):
+                pass # FFmpeg cierra la conexión cuando busca en otra posición
+            except OSError as e:
+                print(f"Error al leer '{source.url}': {e}")
+                self.close_connection = True
+
+    return RangeProxyHandler
+
+def local_media_input(path):
+    """Entrada para FFmpeg/PyAV/OpenCV: el mismo archivo local o, si es una URL, su dirección en el proxy local.
+
+    El proxy en 127.0.0.1 atiende las búsquedas de FFmpeg (peticiones por rango) desde la caché por bloques,
+    así solo se descargan del servidor de origen las partes que realmente se leen.
+    """
+    global range_proxy_server
+    if not is_url(path):
+        return path
+    source = get_remote_source(path)
+    with _remote_sources_lock:
+        if range_proxy_server is None:
+            from http.server import ThreadingHTTPServer
+            range_proxy_server = ThreadingHTTPServer(("127.0.0.1", 0), _create_range_proxy_handler())
+            range_proxy_server.daemon_threads = True
+            threading.Thread(target=range_proxy_server.serve_forever, daemon=True).start()
+    from urllib.parse import quote, urlsplit
+    name = os.path.basename(urlsplit(path).path) or "medio"
+    return f"http://127.0.0.1:{range_proxy_server.server_port}/{source.token}/{quote(name)}"
+
+# --- Importaciones Diferidas y Arranque ---
+
+startup_marks = [("modulos", time.perf_counter() - STARTUP_STARTED)] # (etapa, segundos desde el inicio)
+ffmpeg_status = {} # "ffmpeg"/"ffprobe" -> True si responden (lo completa check_ffmpeg_available)
+
+def mark_startup(stage):
+    """Registra cuánto tardó el arranque en llegar a una etapa."""
+    startup_marks.append((stage, time.perf_counter() - STARTUP_STARTED))
+
+def require_numpy():
+    """Importa NumPy la primera vez que se necesita (análisis de audio, picos y espectrograma)."""
+    global np
+    if np is None:
+        import numpy as np
+    return np
+
+def require_cv2():
+    """Importa OpenCV la primera vez que se necesita (solo lo usa la previsualización)."""
+    global cv2
+    if cv2 is None:
+        import cv2
+    return cv2
+
+def require_pil():
+    """Importa Pillow la primera vez que se necesita (espectrograma y previsualización)."""
+    global Image, ImageTk
+    if Image is None:
+        from PIL import Image, ImageTk
+    return Image
+
+def enable_drag_and_drop(master, widgets):
+    """Carga tkdnd en la ventana ya visible y registra los widgets que aceptan archivos soltados.
+
+    tkinterdnd2 solo ofrece como API pública la ventana TkinterDnD.Tk, que carga tkdnd al crearse y demoraría
+    la primera ventana. Se llama a TkinterDnD._require (lo mismo que hace TkinterDnD.Tk.__init__, presente en
+    tkinterdnd2 0.3 a 0.6); si una versión la quita, la aplicación sigue sin arrastrar y soltar.
+    """
+    try:
+        from tkinterdnd2 import TkinterDnD, DND_FILES
+        TkinterDnD._require(master)
+    except (ImportError, AttributeError, RuntimeError, tk.TclError) as e:
+        print(f"Arrastrar y soltar no disponible: {e}")
+        return False
+    for widget in widgets:
+        widget.drop_target_register(DND_FILES)
+        widget.dnd_bind('<<Drop>>', on_files_dropped)
+    return True
+
+def check_ffmpeg_available():
+    """Verifica en segundo plano que ffmpeg y ffprobe respondan, sin demorar la apertura de la ventana."""
+    for tool in ("ffmpeg", "ffprobe"):
+        try:
+            result = subprocess.run([tool, "-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                    creationflags=NO_WINDOW_FLAGS, timeout=10)
+            ffmpeg_status[tool] = result.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            ffmpeg_status[tool] = False
+    mark_startup("ffmpeg_verificado")
+    return all(ffmpeg_status.values())
+
+def format_startup_report():
+    """Informe de tiempos de arranque, una etapa por línea."""
+    return "\n".join(f"{stage:<22}{seconds * 1000:8.1f} ms" for stage, seconds in startup_marks)
+
+def save_startup_report():
+    """Agrega los tiempos de este arranque al historial (una línea JSON por arranque) para detectar regresiones."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    record = {"fecha": time.time(), "etapas": {stage: round(seconds, 4) for stage, seconds in startup_marks}}
+    with open(os.path.join(CACHE_DIR, "arranque.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+# --- Bus de Eventos de la Interfaz ---
+
+UI_TICK_MS = 50 # Cada cuánto el hilo de Tk aplica los eventos pendientes
+
+# Eventos pendientes: clave -> (función, argumentos). Con la misma clave solo se conserva el último
+ui_events = OrderedDict()
+_ui_events_lock = threading.Lock()
+_ui_event_sequence = itertools.count()
+
+def post_ui_event(callback, *args, key=None):
+    """Pide que callback(*args) se ejecute en el hilo de Tk; se puede llamar desde cualquier hilo.
+
+    Los eventos con la misma clave (ej. el progreso de un trabajo) se combinan y solo se aplica el último,
+    así el costo de la interfaz no depende de cuán seguido informen los trabajadores.
+    """
+    with _ui_events_lock:
+        if key is None:
+            key = ("unico", next(_ui_event_sequence))
+        else:
+            ui_events.pop(key, None) # Se mueve al final para respetar el orden de llegada
+        ui_events[key] = (callback, args, time.perf_counter_ns() if TRACE_ENABLED else None)
+
+def drain_ui_events(master):
+    """Aplica los eventos pendientes en el hilo de Tk y se vuelve a programar."""
+    with _ui_events_lock:
+        events = list(ui_events.values())
+        ui_events.clear()
+    for callback, args, posted_ns in events:
+        if posted_ns is not None and TRACE_ENABLED:
+            record_trace("ui.espera", posted_ns, time.perf_counter_ns() - posted_ns) # Tiempo hasta el hilo de Tk
+        try:
+            with trace_span("ui.evento"):
+                callback(*args)
+        except Exception as e:
+            print(f"Error al actualizar la interfaz: {e}")
+    master.after(UI_TICK_MS, drain_ui_events, master)
 
-def draw_time_ruler(canvas, duration):
-    """Dibuja la regla de tiempo en el canvas superior."""
-    canvas.delete("all")
+# --- Motores de Medios (FFmpeg en subproceso / PyAV en proceso) ---
 
-    width = canvas.winfo_width()
-    height = canvas.winfo_height()
-    
-    if duration <= 0:
-        return
-
-    # Espacio mínimo entre marcas de tiempo (en píxeles)
-    min_spacing = 50
-
-    # Número de marcas posibles según el ancho disponible
-    max_marks = width // min_spacing
-    seconds_between_marks = max(1, int(duration // max_marks))
-
-    # Redondear a múltiplos de 5, 10, 15, 30, 60 para mayor claridad
-    def get_nice_step(s):
-        if s <= 5:
-            return 5
-        elif s <= 10:
-            return 10
-        elif s <= 15:
-            return 15
-        elif s <= 30:
-            return 30
-        else:
-            return 60
+DEFAULT_MEDIA_BACKEND = "ffmpeg" # Se puede cambiar con --motor; cada trabajo de corte puede elegir el suyo
 
-    step = get_nice_step(seconds_between_marks)
+class SubprocessBackend:
+    """Ejecuta ffprobe/ffmpeg como procesos aparte y lee su salida (funciona con cualquier formato)."""
 
-    # Dibujar marcas
-    for t in range(0, int(duration) + 1, step):
-        x = (t / duration) * width
-        canvas.create_line(x, 0, x, height, fill="white")
+    name = "ffmpeg"
 
-        # Formatear el tiempo (hh:mm:ss)
-        h = t // 3600
-        m = (t % 3600) // 60
-        s = t % 60
-        if duration >= 3600:
-            timestamp = f"{h:02}:{m:02}:{s:02}"
-        else:
-            timestamp = f"{m:02}:{s:02}"
+    def available(self):
+        return True
 
-        canvas.create_text(x + 2, height / 2, text=timestamp, anchor="nw", fill="white", font=("Inter", 8, "bold"))
+    def probe(self, file_path):
+        cmd = ['ffprobe', '-v', 'error', '-show_entries',
+               'format=duration,start_time,format_name:stream=codec_type,codec_name,channels,width,height',
+               '-of', 'json', local_media_input(file_path)]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+                                creationflags=NO_WINDOW_FLAGS)
+        data = json.loads(result.stdout or "{}")
+        media_format = data.get("format", {})
+        video = next((st for st in data.get("streams", []) if st.get("codec_type") == "video"), {})
+        audio = next((st for st in data.get("streams", []) if st.get("codec_type") == "audio"), {})
+        try:
+            duration = float(media_format.get("duration", 0))
+        except ValueError:
+            duration = 0.0
+        try:
+            start_time = float(media_format.get("start_time", 0))
+        except ValueError:
+            start_time = 0.0
+        return {
+            "duration": duration,
+            "start_time": start_time, # No se guarda en el catálogo; solo lo usa el modo en vivo
+            "channels": int(audio.get("channels", 0) or 0),
+            "format_name": media_format.get("format_name"),
+            "video_codec": video.get("codec_name"),
+            "audio_codec": audio.get("codec_name"),
+            "width": video.get("width"),
+            "height": video.get("height"),
+        }
+
+    def supports_cut(self, output_extension):
+        return True
+
+    def cut(self, input_file, start_sec, end_sec, output_file, progress_callback, profile=None):
+        output_extension = os.path.splitext(output_file)[1].lower()
+        cmd = ['ffmpeg', '-ss', str(start_sec), '-i', local_media_input(input_file), '-t', str(end_sec - start_sec)]
+        cmd.extend(get_output_codec_args(output_extension, profile))
+        cmd.append(output_file)
+        run_ffmpeg_with_progress(cmd, end_sec - start_sec, progress_callback)
+
+    def pcm_chunks(self, file_path, sample_rate, channels, start_sec, duration_sec, chunk_seconds):
+        require_numpy()
+        cmd = ['ffmpeg', '-v', 'error']
+        if start_sec:
+            cmd.extend(['-ss', str(start_sec)]) # Búsqueda en la entrada (rápida)
+        cmd.extend(['-i', local_media_input(file_path)])
+        if duration_sec is not None:
+            cmd.extend(['-t', str(duration_sec)])
+        cmd.append('-vn')
+        if channels == 1:
+            cmd.extend(['-ac', '1']) # Con -ac > 1 FFmpeg remezclaría a su disposición por defecto
+        cmd.extend(['-ar', str(sample_rate), '-f', 's16le', '-'])
+
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, creationflags=NO_WINDOW_FLAGS)
+        frame_bytes = 2 * channels
+        chunk_bytes = max(1, int(sample_rate * chunk_seconds)) * frame_bytes
+        try:
+            while True:
+                data = process.stdout.read(chunk_bytes)
+                if not data:
+                    break
+                usable = len(data) - (len(data) % frame_bytes)
+                samples = np.frombuffer(data[:usable], dtype='<i2').astype(np.float32) / 32768.0
+                if channels > 1:
+                    samples = samples.reshape(-1, channels)
+                yield samples
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+class PyAVBackend:
+    """Usa las bibliotecas de FFmpeg dentro del proceso vía PyAV (sin fork/exec por cada operación).
+
+    Cubre el sondeo, la extracción de PCM y los cortes con copia de flujos; los cortes que recodifican
+    siguen usando el motor de subproceso.
+    """
+
+    name = "pyav"
+    # Nombres de decodificador que PyAV reporta -> nombre de códec que usa ffprobe (y el catálogo)
+    CODEC_NAMES = {"mp3float": "mp3", "aac_fixed": "aac"}
+
+    def __init__(self):
+        self._av = None
+
+    def _require(self):
+        if self._av is None:
+            try:
+                import av
+            except ImportError:
+                raise RuntimeError("PyAV no está instalado (pip install av)")
+            self._av = av
+        return self._av
+
+    def available(self):
+        try:
+            self._require()
+            return True
+        except RuntimeError:
+            return False
+
+    def probe(self, file_path):
+        av = self._require()
+        with av.open(local_media_input(file_path)) as container:
+            video = container.streams.video[0] if container.streams.video else None
+            audio = container.streams.audio[0] if container.streams.audio else None
+            return {
+                "duration": container.duration / av.time_base if container.duration else 0.0,
+                "start_time": container.start_time / av.time_base if container.start_time else 0.0,
+                "channels": audio.codec_context.layout.nb_channels if audio else 0,
+                "format_name": container.format.name,
+                "video_codec": self.CODEC_NAMES.get(video.codec_context.name, video.codec_context.name) if video else None,
+                "audio_codec": self.CODEC_NAMES.get(audio.codec_context.name, audio.codec_context.name) if audio else None,
+                "width": video.codec_context.width if video else None,
+                "height": video.codec_context.height if video else None,
+            }
+
+    def supports_cut(self, output_extension):
+        # Solo la copia de flujos (.mp4, desde la línea de comandos); los formatos de la interfaz recodifican
+        return get_output_codec_args(output_extension) == ['-c:v', 'copy', '-c:a', 'copy']
+
+    def cut(self, input_file, start_sec, end_sec, output_file, progress_callback, profile=None):
+        """Corte con copia de flujos (remux): como ffmpeg -ss antes de -i, empieza en el fotograma clave previo."""
+        av = self._require()
+        job = getattr(_worker_context, "job", None)
+        span = max(end_sec - start_sec, 1e-6)
+        with av.open(local_media_input(input_file)) as source, av.open(output_file, "w") as target:
+            # Igual que ffmpeg -ss, los tiempos se cuentan desde el inicio del contenedor
+            origin = source.start_time / av.time_base if source.start_time else 0.0
+            start_sec, end_sec = start_sec + origin, end_sec + origin
+            streams = [st for st in source.streams if st.type in ("video", "audio")]
+            outputs = {st.index: target.add_stream_from_template(st) for st in streams}
+            source.seek(int(start_sec * av.time_base), backward=True, any_frame=False)
+            packets = (packet for packet in source.demux(*streams) if packet.dts is not None)
+            # Como la copia de flujos de ffmpeg, todos los flujos se desplazan lo mismo (el menor primer dts) para
+            # que audio y video sigan sincronizados; se leen por adelantado los paquetes hasta ver cada flujo
+            pending, first_dts = [], {}
+            for packet in packets:
+                pending.append(packet)
+                first_dts.setdefault(packet.stream.index, packet.dts * packet.time_base)
+                if len(first_dts) == len(streams) or packet.dts * packet.time_base >= end_sec:
+                    break
+            origin_ts = min(first_dts.values(), default=0)
+            offsets = {st.index: int(round(origin_ts / st.time_base)) for st in streams}
+            finished = set()
+            for packet in itertools.chain(pending, packets):
+                if job is not None and (job.get("cancelled") or job.get("preempted")):
+                    raise JobCancelled("Trabajo cancelado")
+                if packet.stream.index in finished:
+                    continue
+                seconds = float(packet.pts * packet.time_base) if packet.pts is not None else float(packet.dts * packet.time_base)
+                if seconds >= end_sec:
+                    finished.add(packet.stream.index)
+                    if len(finished) == len(streams):
+                        break
+                    continue
+                offset = offsets[packet.stream.index]
+                packet.dts -= offset
+                if packet.pts is not None:
+                    packet.pts -= offset
+                packet.stream = outputs[packet.stream.index]
+                target.mux(packet)
+                progress_callback(min(100, max(0, (seconds - start_sec) / span * 100)))
+        progress_callback(100)
+
+    def pcm_chunks(self, file_path, sample_rate, channels, start_sec, duration_sec, chunk_seconds):
+        require_numpy()
+        av = self._require()
+        chunk_samples = max(1, int(sample_rate * chunk_seconds))
+        with av.open(local_media_input(file_path)) as container:
+            if not container.streams.audio:
+                return
+            stream = container.streams.audio[0]
+            layout = "mono" if channels == 1 else stream.codec_context.layout.name
+            resampler = av.AudioResampler(format="s16", layout=layout, rate=sample_rate)
+            # Igual que ffmpeg -ss, los tiempos se cuentan desde el inicio del contenedor
+            origin = container.start_time / av.time_base if container.start_time else 0.0
+            if start_sec:
+                container.seek(int((start_sec + origin) * av.time_base), backward=True, any_frame=False)
+            start_sec = (start_sec or 0.0) + origin
+            remaining = None if duration_sec is None else int(round(duration_sec * sample_rate))
+            pending, pending_samples = [], 0
+            skip = None # Muestras previas a start_sec que trae la búsqueda al fotograma anterior
+
+            def frames():
+                for frame in container.decode(stream):
+                    yield from resampler.resample(frame)
+                yield from resampler.resample(None)
+
+            for frame in frames():
+                samples = frame.to_ndarray().reshape(-1, channels)
+                if skip is None:
+                    frame_start = float(frame.time) if frame.time is not None else start_sec
+                    skip = max(0, int(round((start_sec - frame_start) * sample_rate)))
+                if skip:
+                    dropped = min(skip, len(samples))
+                    samples, skip = samples[dropped:], skip - dropped
+                if remaining is not None:
+                    samples = samples[:remaining]
+                    remaining -= len(samples)
+                pending.append(samples)
+                pending_samples += len(samples)
+                while pending_samples >= chunk_samples:
+                    block = np.concatenate(pending)
+                    pending, pending_samples = [block[chunk_samples:]], len(block) - chunk_samples
+                    yield self._to_float(block[:chunk_samples], channels)
+                if remaining == 0:
+                    break
+            if pending_samples:
+                yield self._to_float(np.concatenate(pending), channels)
+
+    @staticmethod
+    def _to_float(block, channels):
+        require_numpy()
+        samples = block.astype(np.float32) / 32768.0
+        return samples.reshape(-1) if channels == 1 else samples
+
+MEDIA_BACKENDS = {backend.name: backend for backend in (SubprocessBackend(), PyAVBackend())}
+
+def get_media_backend(name=None):
+    """Retorna el motor de medios por nombre (o el predeterminado)."""
+    name = name or DEFAULT_MEDIA_BACKEND
+    if name not in MEDIA_BACKENDS:
+        raise ValueError(f"Motor de medios desconocido: {name}")
+    return MEDIA_BACKENDS[name]
+
+# --- Catálogo de Medios (SQLite) ---
+
+CATALOG_PATH = os.path.join(CACHE_DIR, "catalogo.sqlite3")
+CATALOG_ARTIFACT_COLUMNS = ("peaks_path", "scenes_path", "keyframes_path", "thumbnail_path", "spectrogram_dir")
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    cache_key TEXT NOT NULL,
+    duration REAL,
+    channels INTEGER,
+    format_name TEXT,
+    video_codec TEXT,
+    audio_codec TEXT,
+    width INTEGER,
+    height INTEGER,
+    probed_at REAL,
+    peaks_path TEXT,
+    scenes_path TEXT,
+    keyframes_path TEXT,
+    thumbnail_path TEXT,
+    spectrogram_dir TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_media_duration ON media(duration);
+CREATE INDEX IF NOT EXISTS idx_media_video_codec ON media(video_codec, duration);
+CREATE INDEX IF NOT EXISTS idx_media_audio_codec ON media(audio_codec, duration);
+CREATE INDEX IF NOT EXISTS idx_media_mtime ON media(mtime_ns);
+CREATE INDEX IF NOT EXISTS idx_media_probed_at ON media(probed_at);
+CREATE TABLE IF NOT EXISTS cuts (
+    id INTEGER PRIMARY KEY,
+    media_id INTEGER NOT NULL REFERENCES media(id) ON DELETE CASCADE,
+    start_sec REAL NOT NULL,
+    end_sec REAL NOT NULL,
+    output_path TEXT NOT NULL,
+    output_format TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cuts_media ON cuts(media_id, created_at);
+CREATE TABLE IF NOT EXISTS output_cache (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_output_cache_last_used ON output_cache(last_used);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    state TEXT NOT NULL,
+    error TEXT,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, created_at);
+"""
+
+_catalog_schema_ready = False
+
+def _migrate_catalog(conn):
+    """Agrega las columnas nuevas a un catálogo creado por una versión anterior."""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "owner" not in columns:
+        try:
+            conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        except sqlite3.OperationalError:
+            pass # Otro proceso la agregó al mismo tiempo
+
+@contextmanager
+def catalog_session():
+    """Abre una conexión al catálogo (una por uso, así es seguro desde cualquier hilo) y confirma al salir."""
+    global _catalog_schema_ready
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CATALOG_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        if not _catalog_schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL") # Lectores y escritores concurrentes sin bloquearse
+            conn.executescript(CATALOG_SCHEMA)
+            _migrate_catalog(conn)
+            _catalog_schema_ready = True
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+@traced("sondeo.probe")
+def probe_media(file_path, backend=None):
+    """Obtiene la duración, el contenedor y los códecs del archivo con el motor de medios indicado."""
+    return get_media_backend(backend).probe(file_path)
+
+def catalog_get_media(file_path):
+    """Retorna la fila del catálogo si el archivo no cambió desde que se registró (o None)."""
+    try:
+        path, size, mtime_ns = source_identity(file_path)
+    except OSError:
+        return None
+    with catalog_session() as conn:
+        row = conn.execute("SELECT * FROM media WHERE path = ?", (path,)).fetchone()
+    if row is None or row["size"] != size or row["mtime_ns"] != mtime_ns:
+        return None
+    return dict(row)
+
+def catalog_record_probe(file_path, info):
+    """Guarda los metadatos del archivo; si el archivo cambió se olvidan sus artefactos anteriores."""
+    path, size, mtime_ns = source_identity(file_path)
+    with catalog_session() as conn:
+        conn.execute("""
+            INSERT INTO media (path, size, mtime_ns, cache_key, duration, channels, format_name,
+                               video_codec, audio_codec, width, height, probed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                size = excluded.size, mtime_ns = excluded.mtime_ns, cache_key = excluded.cache_key,
+                duration = excluded.duration, channels = excluded.channels, format_name = excluded.format_name,
+                video_codec = excluded.video_codec, audio_codec = excluded.audio_codec,
+                width = excluded.width, height = excluded.height, probed_at = excluded.probed_at,
+                peaks_path = NULL, scenes_path = NULL, keyframes_path = NULL,
+                thumbnail_path = NULL, spectrogram_dir = NULL
+        """, (path, size, mtime_ns, media_cache_key(file_path),
+              info["duration"], info["channels"], info["format_name"], info["video_codec"],
+              info["audio_codec"], info["width"], info["height"], time.time()))
+
+def catalog_record_artifact(file_path, column, artifact_path):
+    """Registra dónde quedó en la caché un artefacto de análisis (picos, escenas, miniatura...)."""
+    if column not in CATALOG_ARTIFACT_COLUMNS:
+        raise ValueError(f"Artefacto desconocido: {column}")
+    with catalog_session() as conn:
+        conn.execute(f"UPDATE media SET {column} = ? WHERE path = ?", (artifact_path, normalize_source_path(file_path)))
+
+def catalog_record_cut(file_path, start_sec, end_sec, output_path, output_format):
+    """Agrega un corte al historial del archivo de origen."""
+    with catalog_session() as conn:
+        row = conn.execute("SELECT id FROM media WHERE path = ?", (normalize_source_path(file_path),)).fetchone()
+        if row is None:
+            return
+        conn.execute("INSERT INTO cuts (media_id, start_sec, end_sec, output_path, output_format, created_at) "
+                     "VALUES (?, ?, ?, ?, ?, ?)",
+                     (row["id"], start_sec, end_sec, os.path.abspath(output_path), output_format, time.time()))
+
+def catalog_query(min_duration=None, max_duration=None, codec=None, modified_after=None, modified_before=None, limit=500):
+    """Filtra la biblioteca por duración, códec (de audio o video) y fecha de modificación usando los índices."""
+    clauses, params = [], []
+    if min_duration is not None:
+        clauses.append("duration >= ?")
+        params.append(min_duration)
+    if max_duration is not None:
+        clauses.append("duration <= ?")
+        params.append(max_duration)
+    if codec:
+        clauses.append("(video_codec = ? OR audio_codec = ?)")
+        params.extend([codec, codec])
+    if modified_after is not None:
+        clauses.append("mtime_ns >= ?")
+        params.append(int(modified_after * 1e9))
+    if modified_before is not None:
+        clauses.append("mtime_ns <= ?")
+        params.append(int(modified_before * 1e9))
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    with catalog_session() as conn:
+        rows = conn.execute(f"SELECT * FROM media {where} ORDER BY mtime_ns DESC LIMIT ?", params + [limit]).fetchall()
+    return [dict(row) for row in rows]
+
+def get_media_info(file_path):
+    """Retorna los metadatos del archivo consultando primero el catálogo; solo ejecuta ffprobe si no están.
+
+    Un sondeo fallido (sin duración) no se guarda: el archivo se vuelve a sondear la próxima vez.
+    """
+    cached = catalog_get_media(file_path)
+    if cached is not None:
+        return cached
+    info = probe_media(file_path)
+    if not info["duration"] or info["duration"] <= 0:
+        return info
+    try:
+        catalog_record_probe(file_path, info)
+    except (OSError, sqlite3.Error) as e:
+        print(f"No se pudo actualizar el catálogo: {e}")
+    return info
 
+# --- Visualización de Onda (Simulada) y Guía de Tiempos ---
 
+MIN_VIEW_SPAN_SECONDS = 1.0 # Zoom máximo: un segundo a lo ancho del canvas
+
+def get_view_window():
+    """Retorna (inicio, duración) en segundos de la ventana de tiempo visible."""
+    duration = waveform_current_file_duration
+    span = view_span_seconds if 0 < view_span_seconds < duration else duration
+    start = min(max(0.0, view_start_seconds), max(0.0, duration - span))
+    return start, span
+
+def seconds_to_x(seconds, width):
+    """Convierte un tiempo del archivo a la coordenada x de un canvas de la línea de tiempo."""
+    start, span = get_view_window()
+    if span <= 0:
+        return 0
+    return (seconds - start) / span * width
+
+def x_to_seconds(x, width):
+    """Convierte una coordenada x del canvas al tiempo correspondiente del archivo."""
+    start, span = get_view_window()
+    if width <= 0:
+        return start
+    return min(max(0.0, start + (x / width) * span), waveform_current_file_duration)
+
+def get_selected_range():
+    """Retorna (inicio, fin) en segundos según los campos de tiempo, o el archivo completo si no son válidos."""
+    try:
+        start_sec = time_to_seconds(entry_start_time.get())
+        end_sec = time_to_seconds(entry_end_time.get())
+    except (ValueError, AttributeError):
+        return 0, waveform_current_file_duration
+    if end_sec <= start_sec:
+        return 0, waveform_current_file_duration
+    return start_sec, end_sec
 
-def draw_simulated_waveform(canvas, duration_seconds):
-    """Dibuja una forma de onda simulada en el canvas."""
+def get_selected_ranges():
+    """Retorna la selección principal más los rangos adicionales, ordenados y sin solapamientos."""
+    ranges = list(extra_selection_ranges)
+    try:
+        start_sec = time_to_seconds(entry_start_time.get())
+        end_sec = time_to_seconds(entry_end_time.get())
+        if end_sec > start_sec:
+            ranges.append((start_sec, end_sec))
+    except (ValueError, AttributeError):
+        pass
+    merged = []
+    for start_sec, end_sec in sorted(ranges):
+        if merged and start_sec <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end_sec))
+        else:
+            merged.append((start_sec, end_sec))
+    return merged
+
+# --- Planificador de Redibujado ---
+
+RENDER_FRAME_MS = 16 # Como máximo un redibujado por cuadro de pantalla (~60 Hz)
+TIMELINE_LAYERS = ("onda", "regla", "espectrograma")
+
+dirty_layers = set() # Capas pendientes: "onda", "regla", "espectrograma" y "seleccion" (solo el arrastre)
+_redraw_scheduled = False
+canvas_sizes = {} # canvas -> (ancho, alto) según su último <Configure>, para no consultar winfo en cada evento
+pending_selection_pixels = None # (x1, x2) del arrastre en curso, se dibuja en el próximo cuadro
+
+def get_canvas_size(canvas):
+    """Tamaño del canvas guardado en su último <Configure> (o consultado si todavía no se recibió)."""
+    size = canvas_sizes.get(canvas)
+    if size is None:
+        size = (canvas.winfo_width(), canvas.winfo_height())
+    return size
+
+def on_timeline_configure(event, layer):
+    """Guarda el nuevo tamaño y marca la capa; las ráfagas de cambios de tamaño se dibujan una sola vez."""
+    canvas_sizes[event.widget] = (event.width, event.height)
+    request_redraw(layer)
+
+def request_redraw(*layers):
+    """Marca capas como sucias y programa un único redibujado para el próximo cuadro (solo hilo de Tk)."""
+    global _redraw_scheduled
+    dirty_layers.update(layers or TIMELINE_LAYERS)
+    if not _redraw_scheduled and waveform_canvas is not None:
+        _redraw_scheduled = True
+        waveform_canvas.after(RENDER_FRAME_MS, flush_redraw)
+
+def flush_redraw():
+    """Dibuja solo las capas que cambiaron desde el último cuadro."""
+    global _redraw_scheduled
+    _redraw_scheduled = False
+    layers = set(dirty_layers)
+    dirty_layers.clear()
+    if "onda" in layers:
+        with trace_span("ui.dibujo.onda"):
+            draw_waveform(waveform_canvas, waveform_current_file_duration) # Incluye la capa de selección
+    if "seleccion" in layers or ("onda" in layers and waveform_drag_start_x is not None):
+        draw_selection_overlay() # Durante un arrastre la selección en curso prevalece sobre la de los campos
+    if "regla" in layers:
+        with trace_span("ui.dibujo.regla"):
+            draw_time_ruler(time_ruler_canvas, waveform_current_file_duration)
+    if "espectrograma" in layers:
+        with trace_span("ui.dibujo.espectrograma"):
+            draw_spectrogram(spectrogram_canvas)
+
+def redraw_timeline():
+    """Vuelve a dibujar la onda, la regla de tiempo y el espectrograma para la ventana visible."""
+    request_redraw(*TIMELINE_LAYERS)
+
+def zoom_view(factor, anchor_x, width):
+    """Acerca (factor < 1) o aleja (factor > 1) la vista manteniendo fijo el tiempo bajo el cursor."""
+    global view_start_seconds, view_span_seconds
+    duration = waveform_current_file_duration
+    if duration <= 0 or width <= 1:
+        return
+    start, span = get_view_window()
+    anchor_sec = start + (anchor_x / width) * span
+    new_span = min(duration, max(MIN_VIEW_SPAN_SECONDS, span * factor))
+    view_span_seconds = new_span
+    view_start_seconds = anchor_sec - (anchor_x / width) * new_span
+    view_start_seconds, view_span_seconds = get_view_window()
+    redraw_timeline()
+
+def pan_view(fraction):
+    """Desplaza la vista una fracción de su ancho (negativo hacia la izquierda)."""
+    global view_start_seconds
+    if waveform_current_file_duration <= 0:
+        return
+    start, span = get_view_window()
+    view_start_seconds = start + span * fraction
+    view_start_seconds, _ = get_view_window()
+    redraw_timeline()
+
+def on_timeline_mousewheel(event):
+    """Ctrl + rueda hace zoom alrededor del cursor; la rueda sola desplaza la vista en el tiempo."""
+    direction = 1 if (getattr(event, "num", None) == 4 or event.delta > 0) else -1
+    if event.state & 0x0004: # Tecla Control presionada
+        zoom_view(0.5 if direction > 0 else 2.0, event.x, get_canvas_size(event.widget)[0])
+    else:
+        pan_view(-0.1 * direction)
+
+# Pasos de la regla (segundos entre marcas con etiqueta) y en cuántas partes se subdivide cada uno
+RULER_STEPS = [(0.1, 5), (0.2, 4), (0.5, 5), (1, 5), (2, 4), (5, 5), (10, 5), (15, 3), (30, 3), (60, 6),
+               (120, 4), (300, 5), (600, 5), (900, 3), (1800, 3), (3600, 4), (7200, 4), (10800, 3), (21600, 6)]
+RULER_TILE_MARKS = 20 # Marcas con etiqueta por mosaico de la caché
+RULER_CHAR_PIXELS = 7 # Ancho aproximado de un carácter de las etiquetas (fuente Inter 8 negrita)
+
+ruler_tile_cache = OrderedDict() # (paso, formato, índice) -> [(segundos, etiqueta o None)], LRU
+RULER_TILE_CACHE_SIZE = 64
+
+def format_ruler_label(seconds, long_format, decimals):
+    """Etiqueta de la regla: hh:mm:ss o mm:ss, con décimas cuando el paso es menor a un segundo."""
+    tenths = int(round(seconds * 10))
+    whole, tenth = divmod(tenths, 10)
+    h, m, sec = whole // 3600, (whole % 3600) // 60, whole % 60
+    label = f"{h:02}:{m:02}:{sec:02}" if long_format else f"{m + h * 60:02}:{sec:02}"
+    return f"{label}.{tenth}" if decimals else label
+
+def choose_ruler_step(view_span, width, long_format):
+    """Elige el paso más fino cuyas etiquetas no se superponen al ancho actual."""
+    pixels_per_second = width / view_span
+    for step, divisions in RULER_STEPS:
+        label_chars = (8 if long_format else 5) + (2 if step < 1 else 0)
+        if step * pixels_per_second >= label_chars * RULER_CHAR_PIXELS + 12:
+            return step, divisions
+    return RULER_STEPS[-1]
+
+def get_ruler_tile(step, divisions, long_format, index):
+    """Marcas y etiquetas de un tramo de la regla; se calculan una vez por paso y se reutilizan al desplazarse."""
+    key = (step, long_format, index)
+    tile = ruler_tile_cache.get(key)
+    if tile is not None:
+        ruler_tile_cache.move_to_end(key)
+        return tile
+    decimals = step < 1
+    tile = []
+    first_minor = index * RULER_TILE_MARKS * divisions
+    for k in range(first_minor, first_minor + RULER_TILE_MARKS * divisions):
+        seconds = k * step / divisions
+        label = format_ruler_label(seconds, long_format, decimals) if k % divisions == 0 else None
+        tile.append((seconds, label))
+    ruler_tile_cache[key] = tile
+    if len(ruler_tile_cache) > RULER_TILE_CACHE_SIZE:
+        ruler_tile_cache.popitem(last=False)
+    return tile
+
+def draw_time_ruler(canvas, duration):
+    """Dibuja la regla de tiempo en el canvas superior (solo la ventana visible, con el paso según el zoom)."""
+    canvas.delete("all")
+
+    width, height = get_canvas_size(canvas)
+    
+    if duration <= 0 or width <= 1:
+        return
+
+    view_start, view_span = get_view_window()
+    view_end = view_start + view_span
+    long_format = duration >= 3600
+    step, divisions = choose_ruler_step(view_span, width, long_format)
+
+    # Solo se recorren los mosaicos que tocan la ventana visible: el costo no depende de la duración del archivo
+    tile_seconds = step * RULER_TILE_MARKS
+    first_tile = int(view_start // tile_seconds)
+    last_tile = int(view_end // tile_seconds)
+    for index in range(first_tile, last_tile + 1):
+        for seconds, label in get_ruler_tile(step, divisions, long_format, index):
+            if seconds < view_start or seconds > view_end:
+                continue
+            x = seconds_to_x(seconds, width)
+            if label is None:
+                canvas.create_line(x, height * 0.75, x, height, fill="#AAAAAA")
+                continue
+            canvas.create_line(x, 0, x, height, fill="white")
+            canvas.create_text(x + 2, height / 2, text=label, anchor="nw", fill="white", font=("Inter", 8, "bold"))
+
+    draw_jingle_markers(canvas, duration)
+
+
+def draw_waveform(canvas, duration_seconds):
+    """Dibuja la forma de onda real (un carril por canal) o una simulada mientras se calculan los picos."""
     canvas.delete("waveform_lines") # Limpia las líneas de la forma de onda anterior
-    width = canvas.winfo_width()
-    height = canvas.winfo_height()
+    width, height = get_canvas_size(canvas)
     
     if width == 1 or height == 1 or duration_seconds == 0: # Canvas podría no estar completamente renderizado o duración cero
         return
 
+    if waveform_peaks is not None and waveform_peaks["path"] == entry_file_path.get():
+        draw_channel_lanes(canvas, width, height)
+    else:
+        draw_simulated_waveform(canvas, width, height)
+
+    # Inicializa o actualiza las líneas de selección y el rectángulo
+    global waveform_start_line, waveform_end_line, waveform_selection_rect
+    if waveform_start_line is None:
+        waveform_start_line = canvas.create_line(0, 0, 0, height, fill="red", width=2, tags="selection_elements")
+        waveform_end_line = canvas.create_line(width, 0, width, height, fill="blue", width=2, tags="selection_elements")
+        # Tk no admite colores con transparencia: el punteado simula un relleno semitransparente
+        waveform_selection_rect = canvas.create_rectangle(0, 0, width, height, outline="", fill="#FFFFFF", stipple="gray25", tags="selection_elements")
+    else:
+        # Asegura que las líneas y el rectángulo de selección existan y se actualicen
+        canvas.coords(waveform_start_line, 0, 0, 0, height)
+        canvas.coords(waveform_end_line, width, 0, width, height)
+        canvas.coords(waveform_selection_rect, 0, 0, width, height)
+        canvas.tag_raise("selection_elements") # Asegura que las líneas de selección estén encima
+
+    update_waveform_selection_lines(*get_selected_range())
+    draw_extra_selections(canvas)
+    draw_scene_markers(canvas, duration_seconds)
+    draw_jingle_markers(canvas, duration_seconds)
+
+def draw_channel_lanes(canvas, width, height):
+    """Dibuja un carril por canal con los picos (mín/máx) y el nivel RMS de la ventana visible."""
+    require_numpy()
+    channels = waveform_peaks["channels"]
+    if channels == 0:
+        canvas.create_text(width / 2, height / 2, text="Sin pista de audio", fill="gray", tags="waveform_lines")
+        return
+
+    view_start, view_span = get_view_window()
+    total_bins = len(waveform_peaks["maxs"])
+    first_bin = min(int(view_start * PEAKS_PER_SECOND), total_bins)
+    last_bin = min(int(math.ceil((view_start + view_span) * PEAKS_PER_SECOND)), total_bins)
+    if last_bin <= first_bin:
+        return
+
+    # Agrupa los bins que caen en cada columna de píxeles (varios por píxel al alejar, uno repetido al acercar)
+    visible_width = max(1, int(seconds_to_x(last_bin / PEAKS_PER_SECOND, width)))
+    edges = np.linspace(first_bin, last_bin, visible_width + 1).astype(np.int64)[:-1]
+    edges = np.minimum(edges, last_bin - 1)
+    xs = np.arange(visible_width, dtype=np.float64)
+    maxs = np.maximum.reduceat(waveform_peaks["maxs"], edges, axis=0)
+    mins = np.minimum.reduceat(waveform_peaks["mins"], edges, axis=0)
+    rms = np.maximum.reduceat(waveform_peaks["rms"], edges, axis=0)
+
+    lane_height = height / channels
+    for channel in range(channels):
+        center_y = lane_height * channel + lane_height / 2
+        scale = lane_height * 0.45
+        for upper, lower, color in ((maxs[:, channel], mins[:, channel], "#4CAF50"),
+                                    (rms[:, channel], -rms[:, channel], "#A5D6A7")):
+            top = np.column_stack((xs, center_y - upper * scale))
+            bottom = np.column_stack((xs[::-1], center_y - lower[::-1] * scale))
+            points = np.concatenate((top, bottom)).ravel().tolist()
+            canvas.create_polygon(points, fill=color, outline=color, tags="waveform_lines")
+
+        canvas.create_line(0, center_y, width, center_y, fill="#66BB6A", width=1, tags="waveform_lines")
+        if channel > 0:
+            canvas.create_line(0, lane_height * channel, width, lane_height * channel, fill="#555555", tags="waveform_lines")
+        if channels > 1:
+            canvas.create_text(4, lane_height * channel + 2, text=f"C{channel + 1}", anchor="nw", fill="white",
+                               font=("Inter", 7, "bold"), tags="waveform_lines")
+
+def draw_simulated_waveform(canvas, width, height):
+    """Dibuja una forma de onda simulada en el canvas."""
     # Dibuja un patrón de forma de onda simple y genérico
     line_color = "#4CAF50" # Color verdoso
     num_peaks = 100 # Más picos para una apariencia más densa
@@ -161,57 +1451,79 @@ def draw_simulated_waveform(canvas, duration_seconds):
     # Dibuja una línea horizontal para el centro
     canvas.create_line(0, base_y, width, base_y, fill="#66BB6A", width=1, tags="waveform_lines")
 
-    # Inicializa o actualiza las líneas de selección y el rectángulo
-    global waveform_start_line, waveform_end_line, waveform_selection_rect
-    if waveform_start_line is None:
-        waveform_start_line = canvas.create_line(0, 0, 0, height, fill="red", width=2, tags="selection_elements")
-        waveform_end_line = canvas.create_line(width, 0, width, height, fill="blue", width=2, tags="selection_elements")
-        waveform_selection_rect = canvas.create_rectangle(0, 0, width, height, outline="", fill="#FFFFFF33", tags="selection_elements") # Semi-transparente
-    else:
-        # Asegura que las líneas y el rectángulo de selección existan y se actualicen
-        canvas.coords(waveform_start_line, 0, 0, 0, height)
-        canvas.coords(waveform_end_line, width, 0, width, height)
-        canvas.coords(waveform_selection_rect, 0, 0, width, height)
-        canvas.tag_raise("selection_elements") # Asegura que las líneas de selección estén encima
 
-    update_waveform_selection_lines(0, duration_seconds)
+def draw_extra_selections(canvas):
+    """Dibuja los rangos adicionales de la selección múltiple."""
+    canvas.delete("extra_selections")
+    width, height = get_canvas_size(canvas)
+    for start_sec, end_sec in extra_selection_ranges:
+        x1, x2 = seconds_to_x(start_sec, width), seconds_to_x(end_sec, width)
+        if x2 < 0 or x1 > width:
+            continue
+        canvas.create_rectangle(x1, 0, x2, height, outline="#FFC107", fill="#FFC107", stipple="gray25",
+                                tags="extra_selections")
 
+def clear_extra_selections():
+    """Quita los rangos adicionales y deja solo la selección principal."""
+    extra_selection_ranges.clear()
+    if waveform_canvas is not None:
+        waveform_canvas.delete("extra_selections")
 
 def on_waveform_press(event):
     """Maneja el evento de presionar el botón del mouse en la forma de onda."""
-    global waveform_drag_start_x
-    waveform_drag_start_x = event.x
-    # Reinicia la selección al presionar de nuevo
-    canvas_width = waveform_canvas.winfo_width()
-    waveform_canvas.coords(waveform_selection_rect, event.x, 0, event.x, waveform_canvas.winfo_height())
-    waveform_canvas.coords(waveform_start_line, event.x, 0, event.x, waveform_canvas.winfo_height())
-    waveform_canvas.coords(waveform_end_line, event.x, 0, event.x, waveform_canvas.winfo_height())
-
+    global waveform_drag_start_x, waveform_drag_adds_range
+    waveform_drag_start_x = snap_x_to_targets(event.x)
+    waveform_drag_adds_range = bool(event.state & 0x0001) # Mayús: agrega un rango sin perder la selección
+    if waveform_drag_adds_range:
+        waveform_canvas.create_rectangle(waveform_drag_start_x, 0, waveform_drag_start_x, get_canvas_size(waveform_canvas)[1],
+                                         outline="#FFC107", tags="extra_selection_preview")
+    # Reinicia la selección (o la vista previa del rango nuevo) al presionar de nuevo
+    set_pending_selection(waveform_drag_start_x, waveform_drag_start_x)
 
 def on_waveform_drag(event):
     """Maneja el evento de arrastrar el mouse en la forma de onda."""
     if waveform_drag_start_x is not None:
-        x1 = min(waveform_drag_start_x, event.x)
-        x2 = max(waveform_drag_start_x, event.x)
-        waveform_canvas.coords(waveform_selection_rect, x1, 0, x2, waveform_canvas.winfo_height())
-        waveform_canvas.coords(waveform_start_line, x1, 0, x1, waveform_canvas.winfo_height())
-        waveform_canvas.coords(waveform_end_line, x2, 0, x2, waveform_canvas.winfo_height())
+        current_x = snap_x_to_targets(event.x)
+        set_pending_selection(min(waveform_drag_start_x, current_x), max(waveform_drag_start_x, current_x))
+
+def set_pending_selection(x1, x2):
+    """Guarda la selección del arrastre; se dibuja en el próximo cuadro junto con los demás movimientos."""
+    global pending_selection_pixels
+    pending_selection_pixels = (x1, x2)
+    request_redraw("seleccion")
+
+def draw_selection_overlay():
+    """Aplica la selección del arrastre en curso sin tocar la onda ni la regla."""
+    if pending_selection_pixels is None or waveform_start_line is None:
+        return
+    x1, x2 = pending_selection_pixels
+    height = get_canvas_size(waveform_canvas)[1]
+    if waveform_drag_adds_range:
+        waveform_canvas.coords("extra_selection_preview", x1, 0, x2, height)
+        return
+    waveform_canvas.coords(waveform_selection_rect, x1, 0, x2, height)
+    waveform_canvas.coords(waveform_start_line, x1, 0, x1, height)
+    waveform_canvas.coords(waveform_end_line, x2, 0, x2, height)
 
 def on_waveform_release(event):
     """Maneja el evento de soltar el botón del mouse en la forma de onda."""
-    global waveform_drag_start_x
+    global waveform_drag_start_x, pending_selection_pixels
+    pending_selection_pixels = None # La posición final se aplica aquí mismo
     if waveform_drag_start_x is not None:
-        x1_pixel = min(waveform_drag_start_x, event.x)
-        x2_pixel = max(waveform_drag_start_x, event.x)
-        
-        canvas_width = waveform_canvas.winfo_width()
+        current_x = snap_x_to_targets(event.x)
+        x1_pixel = min(waveform_drag_start_x, current_x)
+        x2_pixel = max(waveform_drag_start_x, current_x)
         
-        if waveform_current_file_duration > 0 and canvas_width > 0:
-            start_ratio = x1_pixel / canvas_width
-            end_ratio = x2_pixel / canvas_width
-            
-            start_sec = start_ratio * waveform_current_file_duration
-            end_sec = end_ratio * waveform_current_file_duration
+        canvas_width = get_canvas_size(waveform_canvas)[0]
+
+        if waveform_drag_adds_range:
+            waveform_canvas.delete("extra_selection_preview")
+            if waveform_current_file_duration > 0 and canvas_width > 0 and x2_pixel > x1_pixel:
+                extra_selection_ranges.append((x_to_seconds(x1_pixel, canvas_width), x_to_seconds(x2_pixel, canvas_width)))
+                draw_extra_selections(waveform_canvas)
+        elif waveform_current_file_duration > 0 and canvas_width > 0:
+            start_sec = x_to_seconds(x1_pixel, canvas_width)
+            end_sec = x_to_seconds(x2_pixel, canvas_width)
             
             entry_start_time.delete(0, tk.END)
             entry_start_time.insert(0, format_seconds_to_time(start_sec))
@@ -226,11 +1538,10 @@ def on_waveform_release(event):
 def update_waveform_selection_lines(start_sec, end_sec):
     """Actualiza la posición de las líneas de selección en el canvas y las etiquetas de tiempo."""
     if waveform_canvas and waveform_current_file_duration > 0:
-        canvas_width = waveform_canvas.winfo_width()
-        canvas_height = waveform_canvas.winfo_height()
+        canvas_width, canvas_height = get_canvas_size(waveform_canvas)
 
-        start_x = (start_sec / waveform_current_file_duration) * canvas_width
-        end_x = (end_sec / waveform_current_file_duration) * canvas_width
+        start_x = seconds_to_x(start_sec, canvas_width)
+        end_x = seconds_to_x(end_sec, canvas_width)
 
         waveform_canvas.coords(waveform_start_line, start_x, 0, start_x, canvas_height)
         waveform_canvas.coords(waveform_end_line, end_x, 0, end_x, canvas_height)
@@ -251,20 +1562,50 @@ def select_file(entry_file_path_widget, label_duration_widget):
     if file_path:
         select_file_from_path(file_path, entry_file_path_widget, label_duration_widget)
 
+def select_url(entry_file_path_widget, label_duration_widget):
+    """Pide la URL de un archivo en un servidor HTTP y lo abre sin descargarlo completo."""
+    from tkinter import simpledialog
+    url = simpledialog.askstring("Abrir URL", "URL del archivo (http:// o https://):")
+    if not url:
+        return
+    url = url.strip()
+    if not is_url(url):
+        messagebox.showerror("Error", "La dirección debe empezar con http:// o https://")
+        return
+    try:
+        select_file_from_path(url, entry_file_path_widget, label_duration_widget)
+    except OSError as e:
+        messagebox.showerror("Error", f"No se pudo abrir la URL: {e}")
+
 def select_file_from_path(file_path, entry_file_path_widget, label_duration_widget):
     """Actualiza la interfaz con la ruta del archivo y su duración."""
     entry_file_path_widget.delete(0, tk.END)
     entry_file_path_widget.insert(0, file_path)
 
-    duration_seconds = get_media_duration(file_path)
+    live = live_mode_var is not None and live_mode_var.get() and not is_url(file_path)
+    media_info = None
+    if live:
+        # Un archivo en grabación cambia a cada momento: se sondea una vez (el modo en vivo reutiliza el resultado)
+        media_info = probe_media(file_path)
+        duration_seconds = media_info["duration"]
+    elif file_path in ingested_media:
+        # Si el archivo ya se analizó en la ingesta no se vuelve a ejecutar ffprobe en el hilo de Tk
+        duration_seconds = ingested_media[file_path]["duration"]
+    else:
+        duration_seconds = get_media_info(file_path)["duration"]
     label_duration_widget.config(text=f"Duración del medio: {format_seconds_to_time(duration_seconds)}")
     
-    global waveform_current_file_duration
+    global waveform_current_file_duration, jingle_matches, scene_boundaries, waveform_peaks
+    global view_start_seconds, view_span_seconds
     waveform_current_file_duration = duration_seconds
+    waveform_peaks = None # Se muestra la onda simulada hasta que estén listos los picos reales
+    view_start_seconds, view_span_seconds = 0.0, 0.0 # Vuelve a mostrar el archivo completo
+    jingle_matches = [] # Las coincidencias y escenas del archivo anterior ya no aplican
+    scene_boundaries = []
+    extra_selection_ranges.clear()
     
     # Dibuja la forma de onda simulada y la guía de tiempos para el nuevo archivo
-    draw_simulated_waveform(waveform_canvas, waveform_current_file_duration)
-    draw_time_ruler(time_ruler_canvas, waveform_current_file_duration)
+    redraw_timeline()
     
     # Reinicia los tiempos de inicio/fin
     entry_start_time.delete(0, tk.END)
@@ -273,13 +1614,282 @@ def select_file_from_path(file_path, entry_file_path_widget, label_duration_widg
     entry_end_time.insert(0, format_seconds_to_time(duration_seconds))
     
     update_waveform_selection_lines(0, waveform_current_file_duration)
+    if live:
+        start_live_tracking(file_path, media_info)
+    else:
+        stop_live_tracking()
+    start_peak_extraction_thread(file_path, duration_seconds)
+
+# --- Ingesta de Varios Archivos (Arrastrar y Soltar) ---
+
+MEDIA_EXTENSIONS = ('.mp4', '.wmv', '.avi', '.mov', '.mkv', '.mp3', '.aac', '.wav', '.flac')
+INGEST_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1)) # Procesos de ffprobe/ffmpeg simultáneos como máximo
+
+ingest_executor = ThreadPoolExecutor(max_workers=INGEST_MAX_WORKERS)
+ingest_progress = {"total": 0, "done": 0}
+
+def parse_drop_data(widget, data):
+    """Separa las rutas de un evento <<Drop>>; Tk las entrega como lista con llaves si tienen espacios."""
+    return [path for path in widget.tk.splitlist(data) if path]
+
+def expand_media_paths(paths):
+    """Reemplaza las carpetas soltadas por los archivos de medios que contienen (recursivamente)."""
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(MEDIA_EXTENSIONS):
+                        expanded.append(os.path.join(root, name))
+        else:
+            expanded.append(path)
+    return expanded
+
+def ingest_media_file(file_path):
+    """Obtiene duración, canales y picos de un archivo (se ejecuta en el pool, fuera del hilo de Tk).
+
+    Lo que ya figura en el catálogo (metadatos, picos) no se vuelve a calcular.
+    """
+    info = get_media_info(file_path)
+    duration, channels = info["duration"], info["channels"]
+    peaks_path = info.get("peaks_path")
+    if channels > 0 and not (peaks_path and os.path.exists(peaks_path)):
+        extract_channel_peaks(file_path, channels, duration=duration)
+    return {"duration": duration, "channels": channels}
+
+def on_files_dropped(event):
+    """Agrega a la lista todos los archivos soltados y carga el primero cuando esté analizado."""
+    paths = expand_media_paths(parse_drop_data(event.widget, event.data))
+    if paths:
+        ingest_media_files(paths, load_first=True)
+    return event.action
+
+def ingest_media_files(paths, load_first=False):
+    """Encola el análisis de varios archivos en el pool limitado y los muestra en la lista de archivos."""
+    for index, file_path in enumerate(paths):
+        if file_list_tree.exists(file_path):
+            file_list_tree.set(file_path, "estado", "En cola")
+        else:
+            file_list_tree.insert("", "end", iid=file_path, values=(os.path.basename(file_path), "--:--:--", "En cola"))
+
+        load_now = load_first and index == 0
+        future = ingest_executor.submit(ingest_media_file, file_path)
+        future.add_done_callback(lambda f, path=file_path, load=load_now:
+                                 post_ui_event(on_media_ingested, path, f, load))
+
+    ingest_progress["total"] += len(paths)
+    update_ingest_status()
+
+def on_media_ingested(file_path, future, load_now):
+    """Actualiza la fila del archivo analizado (en el hilo de Tk)."""
+    ingest_progress["done"] += 1
+    update_ingest_status()
+    try:
+        info = future.result()
+    except Exception as e:
+        print(f"Error al analizar {file_path}: {e}")
+        file_list_tree.set(file_path, "estado", "Error")
+        return
+
+    ingested_media[file_path] = info
+    file_list_tree.set(file_path, "duracion", format_seconds_to_time(info["duration"]))
+    file_list_tree.set(file_path, "estado", "Listo" if info["duration"] > 0 else "Sin duración")
+    if load_now:
+        select_file_from_path(file_path, entry_file_path, label_duration)
+
+def update_ingest_status():
+    """Muestra el avance de la ingesta en la etiqueta de estado."""
+    done, total = ingest_progress["done"], ingest_progress["total"]
+    if done >= total:
+        ingest_progress["done"] = ingest_progress["total"] = 0
+        status_label.config(text=f"{total} archivo(s) analizados", fg="green")
+    else:
+        status_label.config(text=f"Analizando archivos: {done}/{total}", fg="orange")
+
+def on_file_list_activate(event):
+    """Carga en el editor el archivo elegido en la lista (doble clic o Enter)."""
+    selection = file_list_tree.selection()
+    if selection:
+        select_file_from_path(selection[0], entry_file_path, label_duration)
+
+
+# --- Modo en Vivo (Archivo en Grabación) ---
+
+LIVE_POLL_MS = 2000 # Cada cuánto se revisa si el archivo creció
+LIVE_TAIL_SECONDS = 10 # Margen hacia atrás desde el último borde conocido al leer la cola del archivo
+LIVE_TAIL_PUBLISH_SECONDS = 300 # "Últimos 5 minutos"
+
+def is_live_file(file_path):
+    """Indica si el archivo es el que se está siguiendo en modo en vivo."""
+    return live_state is not None and live_state["path"] == file_path
+
+def probe_live_edge(file_path, known_duration, start_time=0.0):
+    """Obtiene el último instante disponible de un archivo en crecimiento leyendo solo su cola.
+
+    ffprobe busca cerca del último borde conocido (-read_intervals) y recorre los paquetes hasta el
+    final, así que el costo depende de lo que creció y no del largo total.
+    """
+    seek = max(0.0, start_time + known_duration - LIVE_TAIL_SECONDS)
+    cmd = ['ffprobe', '-v', 'error', '-read_intervals', f"{seek}%", '-show_entries', 'packet=pts_time,duration_time',
+           '-of', 'csv=p=0', file_path]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+                            creationflags=NO_WINDOW_FLAGS)
+    edge = known_duration
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(',')
+        try:
+            packet_end = float(parts[0]) + (float(parts[1]) if len(parts) > 1 and parts[1] not in ('', 'N/A') else 0.0)
+        except ValueError:
+            continue
+        edge = max(edge, packet_end - start_time)
+    return edge
+
+def start_live_tracking(file_path, info=None):
+    """Empieza a seguir el crecimiento del archivo actual.
+
+    info es el sondeo que ya se hizo al cargar el archivo (con su start_time); sin él se sondea aquí.
+    """
+    global live_state
+    stat = os.stat(file_path)
+    if info is None or "start_time" not in info:
+        info = probe_media(file_path)
+    live_state = {"path": file_path, "key": "vivo-" + hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest(),
+                  "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "start_time": info["start_time"],
+                  "duration": waveform_current_file_duration, "busy": False}
+    status_label.config(text="Modo en vivo: siguiendo el crecimiento del archivo", fg="orange")
+    waveform_canvas.after(LIVE_POLL_MS, poll_live_file)
+
+def stop_live_tracking():
+    """Deja de seguir el archivo en vivo."""
+    global live_state
+    live_state = None
+
+def on_live_mode_toggle():
+    """Activa o desactiva el modo en vivo para el archivo cargado."""
+    file_path = entry_file_path.get()
+    if live_mode_var.get() and os.path.isfile(file_path):
+        start_live_tracking(file_path)
+    else:
+        stop_live_tracking()
+
+def poll_live_file():
+    """Revisa (en el hilo de Tk) si el archivo creció y, si es así, actualiza en segundo plano."""
+    state = live_state
+    if state is None:
+        return
+    waveform_canvas.after(LIVE_POLL_MS, poll_live_file)
+    if state["busy"]:
+        return
+    try:
+        stat = os.stat(state["path"])
+    except OSError:
+        return
+    if (stat.st_size, stat.st_mtime_ns) == (state["size"], state["mtime_ns"]):
+        return
 
+    state.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, busy=True)
+    peaks = waveform_peaks if waveform_peaks is not None and waveform_peaks["path"] == state["path"] else None
+    threading.Thread(target=_update_live_file, args=(state, peaks), daemon=True).start()
+
+def _update_live_file(state, peaks):
+    """Calcula el nuevo borde y extiende los picos solo con la parte nueva (fuera del hilo de Tk)."""
+    try:
+        edge = probe_live_edge(state["path"], state["duration"], state["start_time"])
+        if peaks is not None and peaks.get("channels"):
+            peaks = extend_channel_peaks(peaks)
+    except Exception as e:
+        print(f"Error al actualizar el archivo en vivo: {e}")
+        return
+    finally:
+        state["busy"] = False
+    if edge > state["duration"]:
+        post_ui_event(apply_live_growth, state, edge, peaks, key="crecimiento_en_vivo")
+
+def apply_live_growth(state, edge, peaks):
+    """Aplica en la interfaz la nueva duración del archivo en vivo."""
+    global waveform_current_file_duration, waveform_peaks
+    if live_state is not state:
+        return
+    previous_edge = state["duration"]
+    state["duration"] = edge
+    waveform_current_file_duration = edge
+    if peaks is not None:
+        waveform_peaks = peaks
+    ingested_media.pop(state["path"], None) # La duración guardada en la ingesta ya no es válida
+
+    # Los mosaicos del espectrograma que tocaban el antiguo final se recalculan
+    with _spectrogram_lock:
+        for key in [key for key in spectrogram_tile_cache if key[0] == state["key"]]:
+            tile_seconds = SPECTROGRAM_TILE_COLUMNS * SPECTROGRAM_BASE_COLUMN_SECONDS * (2 ** key[1])
+            if (key[2] + 1) * tile_seconds > previous_edge:
+                spectrogram_tile_cache.pop(key, None)
+
+    label_duration.config(text=f"Duración del medio: {format_seconds_to_time(edge)} (en vivo)")
+    redraw_timeline()
+
+def select_live_tail(seconds=LIVE_TAIL_PUBLISH_SECONDS):
+    """Selecciona los últimos minutos hasta el borde en vivo para publicarlos."""
+    if waveform_current_file_duration <= 0:
+        return
+    end_sec = waveform_current_file_duration
+    start_sec = max(0.0, end_sec - seconds)
+    entry_start_time.delete(0, tk.END)
+    entry_start_time.insert(0, format_seconds_to_time(start_sec))
+    entry_end_time.delete(0, tk.END)
+    entry_end_time.insert(0, format_seconds_to_time(end_sec))
+    update_waveform_selection_lines(start_sec, end_sec)
 
 # --- Lógica de Corte de Video ---
 
+def create_progress_window(title, message, on_cancel=None):
+    """Crea la ventana de progreso de un proceso de FFmpeg y retorna (ventana, función de actualización).
+
+    Con on_cancel se agrega un botón "Cancelar" que lo llama.
+    """
+    window_height = 150 if on_cancel else 120
+    progress_window = tk.Toplevel()
+    progress_window.title(title)
+    progress_window.geometry(f"300x{window_height}")
+    progress_window.resizable(False, False)
+    center_window(progress_window, 300, window_height)
+
+    progress_label = tk.Label(progress_window, text=message, wraplength=250)
+    progress_label.pack(pady=10)
+
+    progress_var = tk.DoubleVar()
+    progress_bar = ttk.Progressbar(progress_window, variable=progress_var, maximum=100)
+    progress_bar.pack(padx=20, pady=5, fill='x')
+
+    percentage_label = tk.Label(progress_window, text="0%")
+    percentage_label.pack()
+
+    if on_cancel:
+        tk.Button(progress_window, text="Cancelar", command=on_cancel).pack(pady=5)
+
+    def apply_progress(percentage):
+        if progress_window.winfo_exists():
+            progress_var.set(percentage)
+            percentage_label.config(text=f"{percentage:.1f}%")
+
+    def update_progress(percentage):
+        # Se llama desde el hilo trabajador: solo se aplica el último valor en cada ciclo de la interfaz
+        post_ui_event(apply_progress, percentage, key=("progreso", id(progress_window)))
+
+    return progress_window, update_progress
+
+def show_task_error(status_text, message):
+    """Muestra el error de una tarea en segundo plano (se ejecuta en el hilo de Tk vía post_ui_event)."""
+    status_label.config(text=status_text, fg="red")
+    messagebox.showerror("Error", message)
+
+def get_selected_encoding_profile():
+    """Perfil elegido en la interfaz (None en "automático": el del autoajuste o "equilibrado")."""
+    profile = encoding_profile_combobox.get()
+    return profile if profile in ENCODING_PROFILE_NAMES else None
+
 def start_cut_video_thread():
-    """Inicia el proceso de corte de video en un hilo separado."""
-    threading.Thread(target=cut_video, daemon=True).start()
+    """Inicia el corte: la validación es inmediata y FFmpeg corre en la cola de trabajos, fuera del hilo de Tk."""
+    cut_video()
 
 def cut_video():
     """Corta el video o audio utilizando FFmpeg."""
@@ -319,114 +1929,1540 @@ def cut_video():
         
     output_path = os.path.join(output_dir, f"{output_name}{output_extension}")
 
-    if os.path.exists(output_path):
+    if os.path.exists(output_path) or journal_has_active_output(output_path):
         messagebox.showerror("Error", f"El archivo '{output_name}{output_extension}' ya existe en la carpeta '{output_dir}'. Elija otro nombre.")
         return
 
-    progress_window = tk.Toplevel()
-    progress_window.title("Cortando...")
-    progress_window.geometry("300x120")
-    progress_window.resizable(False, False)
-    center_window(progress_window, 300, 120)
-
-    progress_label = tk.Label(progress_window, text="Iniciando corte...", wraplength=250)
-    progress_label.pack(pady=10)
+    render_server = render_server_entry.get().strip()
+    if render_server and output_extension not in RENDER_FORMATS:
+        messagebox.showerror("Error", f"El servidor de render no entrega '{output_extension}'. Use {', '.join(RENDER_FORMATS)}.")
+        return
 
-    progress_var = tk.DoubleVar()
-    progress_bar = ttk.Progressbar(progress_window, variable=progress_var, maximum=100)
-    progress_bar.pack(padx=20, pady=5, fill='x')
+    job = None
 
-    percentage_label = tk.Label(progress_window, text="0%")
-    percentage_label.pack()
+    def cancel_cut():
+        if job is not None and render_server:
+            cancel_remote_job(job)
+        elif job is not None:
+            cancel_job(job["id"])
 
+    progress_window, update_progress = create_progress_window("Cortando...", "Iniciando corte...",
+                                                              on_cancel=cancel_cut)
     status_label.config(text="Procesando...", fg="orange")
 
-    def update_progress(percentage):
-        progress_var.set(percentage)
-        percentage_label.config(text=f"{percentage:.1f}%")
-        progress_window.update_idletasks()
-
-    def run_cutting_process():
-        try:
-            process_video(file_path, start_seconds, end_seconds, output_path, update_progress)
+    def on_cut_done(job, error):
+        if error is None:
             progress_window.destroy()
             status_label.config(text=f"Archivo '{output_name}{output_extension}' cortado con éxito", fg="green")
             messagebox.showinfo("Éxito", f"Archivo cortado con éxito: {output_path}")
-        except Exception as e:
+        elif isinstance(error, JobCancelled):
+            progress_window.destroy()
+            status_label.config(text="Corte cancelado", fg="red")
+        else:
             progress_window.destroy()
             status_label.config(text="Error al cortar el archivo", fg="red")
-            messagebox.showerror("Error", f"No se pudo cortar el archivo: {e}\nAsegúrese de que FFmpeg esté instalado y en su PATH.")
+            messagebox.showerror("Error", f"No se pudo cortar el archivo: {error}\nAsegúrese de que FFmpeg esté instalado y en su PATH.")
+
+    if render_server:
+        # El servidor corta con sus archivos: el origen debe ser una URL o una ruta que él también pueda leer
+        job = submit_remote_cut_job(render_server, file_path, start_seconds, end_seconds, output_path, update_progress,
+                                    lambda job, error: post_ui_event(on_cut_done, job, error),
+                                    priority=job_priority_combobox.get(), backend=media_backend_combobox.get(),
+                                    profile=get_selected_encoding_profile())
+        return
 
-    threading.Thread(target=run_cutting_process, daemon=True).start()
+    # El trabajo queda en el diario: si la aplicación se cierra a mitad del corte se reanuda al volver a abrirla
+    job = submit_cut_job(file_path, start_seconds, end_seconds, output_path, update_progress,
+                         lambda job, error: post_ui_event(on_cut_done, job, error),
+                         priority=job_priority_combobox.get(), backend=media_backend_combobox.get(),
+                         profile=get_selected_encoding_profile())
+
+
+# --- Perfiles de Codificación ---
+
+ENCODING_PROFILE_NAMES = ("rapido", "equilibrado", "calidad")
+DEFAULT_ENCODING_PROFILE = None # None: el elegido por --autoajustar para cada formato o, si no hay, "equilibrado"
+ENCODING_PROFILES_PATH = os.path.join(CACHE_DIR, "perfiles.json")
+
+# Argumentos de recodificación por formato y perfil ("equilibrado" son los que se usaban siempre).
+# En .mp4 solo se aplican al unir rangos que no se pueden copiar; el corte simple copia los flujos.
+ENCODING_PROFILES = {
+    '.mp3': {
+        "rapido": ['-vn', '-c:a', 'libmp3lame', '-b:a', '128k', '-compression_level', '9'],
+        "equilibrado": ['-vn', '-c:a', 'libmp3lame', '-b:a', '192k'],
+        "calidad": ['-vn', '-c:a', 'libmp3lame', '-q:a', '0', '-compression_level', '0'], # VBR V0
+    },
+    '.aac': {
+        "rapido": ['-vn', '-c:a', 'aac', '-b:a', '96k', '-aac_coder', 'fast'],
+        "equilibrado": ['-vn', '-c:a', 'aac', '-b:a', '128k'],
+        "calidad": ['-vn', '-c:a', 'aac', '-b:a', '256k', '-aac_coder', 'twoloop'],
+    },
+    '.wmv': {
+        "rapido": ['-c:v', 'wmv2', '-b:v', '1000k', '-c:a', 'wmav2', '-b:a', '128k'],
+        "equilibrado": ['-c:v', 'wmv2', '-b:v', '1500k', '-c:a', 'wmav2', '-b:a', '192k'],
+        "calidad": ['-c:v', 'wmv2', '-b:v', '4000k', '-mbd', 'rd', '-trellis', '1', '-c:a', 'wmav2', '-b:a', '256k'],
+    },
+    '.mp4': {
+        "rapido": ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '23', '-c:a', 'aac', '-b:a', '128k'],
+        "equilibrado": ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '20', '-c:a', 'aac', '-b:a', '192k'],
+        "calidad": ['-c:v', 'libx264', '-preset', 'slow', '-crf', '17', '-c:a', 'aac', '-b:a', '256k'],
+    },
+}
+
+# Formatos con codificador multihilo. Los de audio (mp3, aac) son de un solo hilo; en los de video los
+# núcleos se reparten entre los trabajadores de la cola para no saturar la CPU con varios cortes a la vez.
+ENCODING_THREADED_FORMATS = ('.wmv', '.mp4')
+
+tuned_encoding_profiles = None # ext -> perfil elegido por --autoajustar (se lee de ENCODING_PROFILES_PATH)
+
+def load_tuned_encoding_profiles():
+    """Lee (una vez) los perfiles elegidos por el último autoajuste."""
+    global tuned_encoding_profiles
+    if tuned_encoding_profiles is None:
+        try:
+            with open(ENCODING_PROFILES_PATH, encoding="utf-8") as f:
+                tuned_encoding_profiles = json.load(f).get("perfiles", {})
+        except (OSError, ValueError):
+            tuned_encoding_profiles = {}
+    return tuned_encoding_profiles
+
+def resolve_encoding_profile(output_extension, profile=None):
+    """Perfil a usar: el indicado, el de --perfil, el del autoajuste para el formato o "equilibrado"."""
+    profile = profile or DEFAULT_ENCODING_PROFILE or load_tuned_encoding_profiles().get(output_extension)
+    if profile not in ENCODING_PROFILE_NAMES:
+        profile = "equilibrado"
+    return profile
+
+def get_reencode_codec_args(output_extension, profile=None):
+    """Argumentos de códec para la salida cuando no se pueden copiar los flujos."""
+    profiles = ENCODING_PROFILES.get(output_extension)
+    if profiles is None:
+        raise ValueError(f"Formato no soportado: {output_extension}")
+    codec_args = list(profiles[resolve_encoding_profile(output_extension, profile)])
+    if output_extension in ENCODING_THREADED_FORMATS:
+        codec_args += ['-threads', str(max(1, (os.cpu_count() or 1) // CUT_WORKERS))]
+    return codec_args
 
+def get_output_codec_args(output_extension, profile=None):
+    """Retorna los argumentos de códec de FFmpeg para el formato de salida."""
+    if output_extension == '.mp4':
+        # Copiar si es posible para evitar recodificación
+        return ['-c:v', 'copy', '-c:a', 'copy']
+    return get_reencode_codec_args(output_extension, profile)
+
+def run_ffmpeg_with_progress(cmd, total_duration, progress_callback):
+    """Ejecuta FFmpeg informando el avance (0-100) a partir de las líneas 'time=' de su salida de error.
+
+    Si se ejecuta dentro de un trabajo de la cola, el proceso queda asociado al trabajo para poder cancelarlo.
+    """
+    last_lines = []
+    job = getattr(_worker_context, "job", None)
+    try:
+        with trace_span("ffmpeg.arranque"):
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                bufsize=1,
+                creationflags=NO_WINDOW_FLAGS | NEW_PROCESS_GROUP_FLAGS, # Evita que aparezca una ventana de consola en Windows
+                start_new_session=(os.name == "posix") # Grupo de procesos propio para poder terminarlo completo
+            )
+        with trace_span("ffmpeg.proceso"): # Codificación completa, hasta que termina el proceso
+            if job is not None:
+                job["process"] = process
+                if job.get("cancelled") or job.get("preempted"):
+                    kill_process_group(process) # Se canceló mientras se iniciaba
+
+            for line in process.stderr:
+                last_lines = (last_lines + [line.strip()])[-10:] # Para el mensaje de error
+                if 'time=' in line:
+                    try:
+                        time_str = line.split('time=')[1].split()[0]
+                        hours, minutes, seconds = map(float, time_str.split(':'))
+                        current_processed_time = hours * 3600 + minutes * 60 + seconds
+                    
+                        if total_duration > 0:
+                            progress = min(100, max(0, (current_processed_time / total_duration) * 100))
+                            progress_callback(progress)
+                    except Exception as e:
+                        print(f"Error de seguimiento de progreso: {e}")
+
+            process.wait()
+        if job is not None and (job.get("cancelled") or job.get("preempted")):
+            raise JobCancelled("Trabajo cancelado")
+        if process.returncode != 0:
+            error_output = "\n".join(last_lines)
+            raise Exception(f"FFmpeg falló con el código {process.returncode}: {error_output}")
 
-def process_video(input_file, start_sec, end_sec, output_file, progress_callback):
-    """Ejecuta el comando FFmpeg para cortar el video/audio."""
-    duration_segment = end_sec - start_sec
+    except FileNotFoundError:
+        raise Exception("FFmpeg no encontrado. Asegúrese de que esté instalado y en su PATH.")
+    except JobCancelled:
+        raise
+    except Exception as e:
+        raise Exception(f"Error en el proceso FFmpeg: {e}")
 
-    # Comando base de FFmpeg
-    cmd = [
-        'ffmpeg',
-        '-ss', str(start_sec),  # Tiempo de inicio
-        '-i', input_file,       # Archivo de entrada
-        '-t', str(duration_segment)  # Duración del segmento a cortar
-    ]
+    progress_callback(100) # Asegura que se muestre el 100% de completado
 
-    # Determina el formato de salida y aplica los códecs apropiados
+def partial_output_path(output_file):
+    """Ruta temporal (oculta, con la misma extensión para que FFmpeg elija el formato) de una salida en curso."""
+    directory, name = os.path.split(output_file)
+    base, extension = os.path.splitext(name)
+    return os.path.join(directory, f".{base}.parcial{extension}")
+
+@contextmanager
+def atomic_output(output_file):
+    """Entrega una ruta temporal; al terminar bien la renombra atómicamente a output_file y si falla la borra.
+
+    Así nunca queda en la carpeta de salida un archivo a medio escribir con el nombre final.
+    """
+    partial_file = partial_output_path(output_file)
+    if os.path.exists(partial_file):
+        os.remove(partial_file) # Restos de un intento interrumpido
+    try:
+        yield partial_file
+        with trace_span("disco.reemplazo"):
+            os.replace(partial_file, output_file)
+    except BaseException:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+        raise
+
+def process_video(input_file, start_sec, end_sec, output_file, progress_callback, backend=None, use_cache=True,
+                  profile=None):
+    """Corta el video/audio con el motor de medios indicado (FFmpeg en subproceso si no se indica).
+
+    Con use_cache=False no se consulta ni se alimenta la caché de salidas (lo usa el banco de pruebas).
+    profile elige el perfil de codificación (ver ENCODING_PROFILES) cuando hay que recodificar.
+    Con .m3u8 o .mpd la salida es un paquete HLS/DASH (ver package_for_streaming), que no pasa por la caché.
+    """
+    # Determina el formato de salida y los códecs apropiados
     output_extension = os.path.splitext(output_file)[1].lower()
+    if output_extension in STREAMING_FORMATS:
+        with trace_span("empaquetado", formato=output_extension):
+            package_for_streaming(input_file, start_sec, end_sec, output_file, progress_callback, profile)
+        return output_file
+    codec_args = get_output_codec_args(output_extension, profile)
+    media_backend = get_media_backend(backend)
+    if not media_backend.supports_cut(output_extension):
+        media_backend = get_media_backend("ffmpeg") # Recodificar requiere el FFmpeg completo
+    settings = codec_args if media_backend.name == "ffmpeg" else codec_args + [media_backend.name]
+
+    cache_key = output_cache_key("corte", [(input_file, start_sec, end_sec)], output_extension, settings)
+    with trace_span("corte", formato=output_extension, motor=media_backend.name), \
+            atomic_output(output_file) as partial_file:
+        # Un corte idéntico ya realizado se sirve desde la caché de salidas sin ejecutar FFmpeg
+        with trace_span("corte.cache"):
+            cached = use_cache and serve_from_output_cache(cache_key, partial_file)
+        if cached:
+            progress_callback(100)
+            return output_file
+        media_backend.cut(input_file, start_sec, end_sec, partial_file, progress_callback, profile)
+        if use_cache:
+            with trace_span("corte.cache_guardar"):
+                store_in_output_cache(cache_key, partial_file)
+    return output_file
 
-    if output_extension == '.mp4':
-        # Copiar si es posible para evitar recodificación
-        cmd.extend(['-c:v', 'copy', '-c:a', 'copy'])
-    elif output_extension == '.mp3':
-        # Solo audio, sin video
-        cmd.extend(['-vn', '-c:a', 'libmp3lame', '-b:a', '192k'])
-    elif output_extension == '.wmv':
-        # Video WMV (Windows Media Video)
-        cmd.extend(['-c:v', 'wmv2', '-b:v', '1500k', '-c:a', 'wmav2', '-b:a', '192k'])
-    elif output_extension == '.aac':
-        # Solo audio AAC
-        cmd.extend(['-vn', '-c:a', 'aac', '-b:a', '128k'])
+# --- Empaquetado para la Web (HLS/DASH) ---
+
+STREAMING_FORMATS = {'.m3u8': "hls", '.mpd': "dash"}
+STREAMING_SEGMENT_SECONDS = 6
+WEB_VIDEO_CODECS = {"h264"} # Se reproducen en todos los navegadores (MSE) y reproductores HLS
+WEB_AUDIO_CODECS = {'.m3u8': {"aac", "mp3"}, '.mpd': {"aac"}} # MPEG-TS admite mp3; los fMP4 de DASH, solo aac
+
+def streaming_segments_dir(output_file):
+    """Carpeta (junto a la lista de reproducción) donde quedan los segmentos del paquete (ej. clip_hls)."""
+    base, extension = os.path.splitext(output_file)
+    return f"{base}_{STREAMING_FORMATS[extension.lower()]}"
+
+def get_streaming_codec_args(output_extension, info, profile=None):
+    """Copia cada flujo que ya es compatible con la web y recodifica (H.264/AAC del perfil) solo los que no.
+
+    Retorna los argumentos y si se copiaron todos los flujos.
+    """
+    reencode_args = get_reencode_codec_args('.mp4', profile)
+    split = reencode_args.index('-c:a')
+    video_reencode, audio_reencode = reencode_args[:split], reencode_args[split:]
+    codec_args, copied = [], True
+    if info.get("video_codec"):
+        if info["video_codec"] in WEB_VIDEO_CODECS:
+            codec_args += ['-c:v', 'copy']
+        else:
+            # Fotogramas clave en cada límite de segmento para que todos duren lo mismo
+            codec_args += video_reencode + ['-pix_fmt', 'yuv420p', '-force_key_frames',
+                                            f"expr:gte(t,n_forced*{STREAMING_SEGMENT_SECONDS})"]
+            copied = False
     else:
+        codec_args.append('-vn')
+    if info.get("audio_codec"):
+        if info["audio_codec"] in WEB_AUDIO_CODECS[output_extension]:
+            codec_args += ['-c:a', 'copy']
+        else:
+            codec_args += audio_reencode
+            copied = False
+    return codec_args, copied
+
+def package_for_streaming(input_file, start_sec, end_sec, output_file, progress_callback, profile=None):
+    """Corta y empaqueta en HLS (.m3u8) o DASH (.mpd) en una sola pasada de FFmpeg.
+
+    Los segmentos van a una carpeta junto a la lista. Todo se escribe primero en una carpeta oculta y al
+    terminar se mueven los segmentos y por último la lista, así nunca se publica un paquete incompleto.
+    """
+    output_extension = os.path.splitext(output_file)[1].lower()
+    codec_args, copied = get_streaming_codec_args(output_extension, get_media_info(input_file), profile)
+    directory, name = os.path.split(output_file)
+    segments_dir = streaming_segments_dir(output_file)
+    segments_name = os.path.basename(segments_dir)
+    partial_dir = os.path.join(directory, f".{os.path.splitext(name)[0]}.parcial")
+    partial_playlist = os.path.join(partial_dir, name)
+    if os.path.exists(partial_dir):
+        shutil.rmtree(partial_dir) # Restos de un intento interrumpido
+    os.makedirs(os.path.join(partial_dir, segments_name))
+
+    cmd = ['ffmpeg', '-ss', str(start_sec), '-i', local_media_input(input_file), '-t', str(end_sec - start_sec)]
+    cmd.extend(codec_args)
+    if STREAMING_FORMATS[output_extension] == "hls":
+        cmd.extend(['-f', 'hls', '-hls_time', str(STREAMING_SEGMENT_SECONDS), '-hls_playlist_type', 'vod',
+                    '-hls_segment_filename', os.path.join(partial_dir, segments_name, "seg_%05d.ts"),
+                    '-hls_base_url', segments_name + "/"])
+    else:
+        cmd.extend(['-f', 'dash', '-seg_duration', str(STREAMING_SEGMENT_SECONDS),
+                    '-init_seg_name', f"{segments_name}/init-$RepresentationID$.m4s",
+                    '-media_seg_name', f"{segments_name}/chunk-$RepresentationID$-$Number%05d$.m4s"])
+    cmd.append(partial_playlist)
+    try:
+        run_ffmpeg_with_progress(cmd, end_sec - start_sec, progress_callback)
+        with trace_span("disco.reemplazo"):
+            if os.path.exists(segments_dir):
+                shutil.rmtree(segments_dir) # Segmentos huérfanos sin lista publicada
+            os.replace(os.path.join(partial_dir, segments_name), segments_dir)
+            os.replace(partial_playlist, output_file)
+    finally:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+    return {"copy": copied, "segments_dir": segments_dir}
+
+# --- Caché de Salidas ---
+
+OUTPUT_CACHE_DIR = os.path.join(CACHE_DIR, "salidas")
+OUTPUT_CACHE_MAX_BYTES = 5 * 1024 ** 3 # Al superarse se eliminan las salidas usadas hace más tiempo
+OUTPUT_CACHE_VERSION = 1 # Cambiarlo invalida las salidas guardadas si cambia la forma de procesar
+
+def output_cache_key(kind, segments, output_extension, settings):
+    """Clave de una salida: identidad de cada origen, rangos, filtros, formato y ajustes de procesamiento.
+
+    segments es una lista de tuplas (origen, inicio, fin, *filtros); los tiempos se redondean al milisegundo.
+    """
+    parts = [f"v{OUTPUT_CACHE_VERSION}", kind, output_extension, " ".join(settings)]
+    for source, start_sec, end_sec, *filters in segments:
+        parts.append(f"{media_cache_key(source)}|{start_sec:.3f}|{end_sec:.3f}|{'|'.join(filters)}")
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+FICLONE = 0x40049409 # ioctl de Linux que clona un archivo compartiendo bloques (btrfs, XFS) sin compartir el inodo
+
+def _clone_or_copy(source, destination):
+    """Copia un archivo como clon (reflink) si el sistema de archivos lo permite, o byte a byte si no.
+
+    No se usan enlaces duros: la salida del usuario y la entrada de la caché serían el mismo inodo y
+    editar una alteraría la otra.
+    """
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            import fcntl
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+def _remove_cached_output(path):
+    """Borra una entrada de la caché (son de solo lectura, en Windows hay que devolverle el permiso)."""
+    try:
+        os.chmod(path, 0o644)
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def serve_from_output_cache(key, output_file):
+    """Si la salida ya existe en la caché (y no se modificó desde que se guardó) la copia a output_file y retorna True."""
+    with catalog_session() as conn:
+        row = conn.execute("SELECT path, size, created_at FROM output_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        try:
+            st = os.stat(row["path"])
+            intact = st.st_size == row["size"] and abs(st.st_mtime - row["created_at"]) < 1e-3
+        except FileNotFoundError:
+            intact = False
+        if not intact:
+            _remove_cached_output(row["path"])
+            conn.execute("DELETE FROM output_cache WHERE key = ?", (key,))
+            return False
+        _clone_or_copy(row["path"], output_file)
+        conn.execute("UPDATE output_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+    return True
+
+def store_in_output_cache(key, output_file):
+    """Guarda una copia de solo lectura de una salida recién generada y aplica el límite de tamaño."""
+    extension = os.path.splitext(output_file)[1].lower()
+    os.makedirs(OUTPUT_CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(OUTPUT_CACHE_DIR, key + extension)
+    try:
+        _remove_cached_output(cache_path) # Restos de una entrada que ya no está en el catálogo
+        _clone_or_copy(output_file, cache_path)
+        now = time.time()
+        os.utime(cache_path, (now, now)) # Fecha de la entrada = created_at: si cambia, el archivo fue alterado
+        os.chmod(cache_path, 0o444)
+        with catalog_session() as conn:
+            conn.execute("INSERT OR REPLACE INTO output_cache (key, path, size, created_at, last_used) "
+                         "VALUES (?, ?, ?, ?, ?)", (key, cache_path, os.path.getsize(cache_path), now, now))
+        evict_output_cache()
+    except (OSError, sqlite3.Error) as e:
+        print(f"No se pudo guardar la salida en la caché: {e}") # La salida del usuario ya está completa
+
+def evict_output_cache(max_bytes=OUTPUT_CACHE_MAX_BYTES):
+    """Elimina las salidas menos usadas recientemente hasta quedar bajo el límite de tamaño."""
+    with catalog_session() as conn:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM output_cache").fetchone()[0]
+        if total <= max_bytes:
+            return
+        for row in conn.execute("SELECT key, path, size FROM output_cache ORDER BY last_used").fetchall():
+            if total <= max_bytes:
+                break
+            _remove_cached_output(row["path"]) # Las salidas del usuario son copias independientes
+            conn.execute("DELETE FROM output_cache WHERE key = ?", (row["key"],))
+            total -= row["size"]
+
+# --- Cola de Trabajos de Corte ---
+
+CUT_QUEUE_MAX_JOBS = 64 # Al llenarse, quien encola espera (contrapresión en lugar de memoria sin límite)
+CUT_WORKERS = 2 # Procesos de FFmpeg de corte simultáneos
+JOB_HISTORY_DAYS = 7 # Los trabajos terminados se borran del diario después de este tiempo
+JOB_PRIORITIES = {"urgente": 0, "normal": 1, "fondo": 2} # Menor valor = se atiende antes
+
+cut_job_queue = queue.PriorityQueue(maxsize=CUT_QUEUE_MAX_JOBS) # Entradas (prioridad, orden de llegada, trabajo)
+_job_sequence = itertools.count()
+_cut_workers_lock = threading.Lock()
+_cut_workers_started = False
+active_jobs = {} # id -> trabajo en cola o en proceso (para cancelar o desalojar)
+_active_jobs_lock = threading.Lock()
+_worker_context = threading.local() # Trabajo que ejecuta el hilo actual (ver run_ffmpeg_with_progress)
+
+class JobCancelled(Exception):
+    """El trabajo se canceló (o se desalojó por uno más urgente) y su FFmpeg fue terminado."""
+
+def kill_process_group(process):
+    """Termina FFmpeg junto con cualquier proceso hijo que haya creado."""
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+def start_cut_workers(num_workers=CUT_WORKERS):
+    """Inicia (una sola vez) los hilos que toman trabajos de la cola y ejecutan FFmpeg."""
+    global _cut_workers_started
+    with _cut_workers_lock:
+        if _cut_workers_started:
+            return
+        for _ in range(num_workers):
+            threading.Thread(target=_cut_worker_loop, daemon=True).start()
+        _cut_workers_started = True
+
+def job_payload(job):
+    """Datos serializables del trabajo (sin callbacks, proceso ni marcas de cancelación)."""
+    return {key: value for key, value in job.items()
+            if key not in ("on_progress", "on_done", "result", "process", "running", "cancelled", "preempted")}
+
+# Dueño de los trabajos de este proceso en el diario. Mientras el proceso vive mantiene bloqueado su archivo
+# en _job_owners_dir(); si otro proceso logra bloquearlo, el dueño terminó y sus trabajos se pueden recuperar.
+# El bloqueo lo libera el sistema operativo aunque el proceso muera, y no depende de que se reutilice el pid.
+job_owner_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+_job_owner_file = None
+_job_owner_lock = threading.Lock()
+
+def _job_owners_dir():
+    return os.path.join(CACHE_DIR, "duenos")
+
+def _try_lock_file(f):
+    """Bloquea el archivo abierto en forma exclusiva sin esperar; retorna False si otro proceso lo tiene."""
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+def hold_job_owner_lock():
+    """Bloquea (una vez por proceso) el archivo que indica que los trabajos de job_owner_id siguen vivos."""
+    global _job_owner_file
+    with _job_owner_lock:
+        if _job_owner_file is None:
+            os.makedirs(_job_owners_dir(), exist_ok=True)
+            f = open(os.path.join(_job_owners_dir(), job_owner_id + ".lock"), "a+b")
+            if not _try_lock_file(f):
+                f.close()
+                raise OSError(f"No se pudo bloquear el archivo de dueño {job_owner_id}")
+            _job_owner_file = f
+    return job_owner_id
+
+def job_owner_alive(owner):
+    """Indica si el proceso dueño de un trabajo del diario sigue en ejecución (filas sin dueño: no)."""
+    if owner is None:
+        return False
+    if owner == job_owner_id:
+        return True
+    lock_path = os.path.join(_job_owners_dir(), owner + ".lock")
+    try:
+        f = open(lock_path, "r+b")
+    except FileNotFoundError:
+        return False
+    with f:
+        if not _try_lock_file(f):
+            return True
+    try:
+        os.remove(lock_path) # El dueño terminó: su archivo ya no hace falta
+    except OSError:
+        pass
+    return False
+
+def journal_record(job, state, error=None):
+    """Guarda el estado del trabajo en el diario persistente (en_cola, en_proceso, terminado, error o cancelado).
+
+    El trabajo queda a nombre de este proceso (ver job_owner_alive).
+    """
+    payload = job_payload(job)
+    owner = hold_job_owner_lock()
+    now = time.time()
+    with catalog_session() as conn:
+        conn.execute("""
+            INSERT INTO jobs (id, kind, payload, output_path, state, error, owner, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET state = excluded.state, error = excluded.error,
+                                          owner = excluded.owner, updated_at = excluded.updated_at
+        """, (job["id"], job["kind"], json.dumps(payload), os.path.abspath(job["output"]), state,
+              str(error) if error else None, owner, now, now))
+
+def journal_has_active_output(output_file):
+    """Indica si ya hay un trabajo pendiente o en curso que escribe esa salida."""
+    with catalog_session() as conn:
+        row = conn.execute("SELECT 1 FROM jobs WHERE output_path = ? AND state IN ('en_cola', 'en_proceso')",
+                           (os.path.abspath(output_file),)).fetchone()
+    return row is not None
+
+def _queue_job(job):
+    cut_job_queue.put((JOB_PRIORITIES[job["priority"]], next(_job_sequence), job))
+
+def submit_job(job, on_progress=None, on_done=None):
+    """Registra el trabajo en el diario y lo encola; on_done(trabajo, error) se llama desde el hilo trabajador.
+
+    job lleva "kind" ("corte" o "lista"), "output", "priority" (ver JOB_PRIORITIES) y los datos propios de su tipo.
+    Un trabajo urgente desaloja al trabajo en curso de menor prioridad si no hay trabajadores libres.
+    """
+    job.setdefault("id", uuid.uuid4().hex)
+    job.setdefault("priority", "normal")
+    journal_record(job, "en_cola")
+    job["on_progress"] = on_progress
+    job["on_done"] = on_done
+    with _active_jobs_lock:
+        active_jobs[job["id"]] = job
+    start_cut_workers()
+    _queue_job(job) # Primero en la cola: el trabajador que quede libre al desalojar debe tomar este trabajo
+    if job["priority"] == "urgente":
+        preempt_for(job)
+    return job
+
+def submit_cut_job(input_file, start_sec, end_sec, output_file, on_progress=None, on_done=None, priority="normal",
+                   backend=None, profile=None):
+    """Encola un corte simple de un archivo (backend: motor de medios, profile: perfil de codificación)."""
+    output_extension = os.path.splitext(output_file)[1].lower()
+    job = {"kind": "corte", "input": input_file, "start": start_sec, "end": end_sec, "output": output_file,
+           "priority": priority, "backend": backend or DEFAULT_MEDIA_BACKEND,
+           "profile": resolve_encoding_profile(output_extension, profile)}
+    return submit_job(job, on_progress, on_done)
+
+def submit_ranges_job(ranges, output_file, on_progress=None, on_done=None, priority="normal", profile=None):
+    """Encola la exportación de varios rangos (lista de edición o selección múltiple) a un solo archivo."""
+    output_extension = os.path.splitext(output_file)[1].lower()
+    job = {"kind": "lista", "ranges": ranges, "output": output_file, "priority": priority,
+           "profile": resolve_encoding_profile(output_extension, profile)}
+    return submit_job(job, on_progress, on_done)
+
+def cancel_job(job_id):
+    """Cancela un trabajo: si está en cola no se ejecutará; si está en curso se termina su FFmpeg
+    (los cortes con PyAV revisan la marca en cada paquete).
+
+    La salida parcial la borra atomic_output al fallar el proceso. Retorna False si el trabajo ya no está activo.
+    """
+    with _active_jobs_lock:
+        job = active_jobs.get(job_id)
+        if job is None:
+            return False
+        job["cancelled"] = True
+        process = job.get("process")
+    if process is not None:
+        kill_process_group(process)
+    return True
+
+def preempt_for(urgent_job):
+    """Si todos los trabajadores están ocupados, desaloja el trabajo en curso de menor prioridad.
+
+    El trabajo desalojado vuelve a la cola y se rehace desde el principio cuando haya un trabajador libre.
+    """
+    with _active_jobs_lock:
+        running = [job for job in active_jobs.values() if job.get("running")]
+        if not running or len(running) < CUT_WORKERS:
+            return
+        victim = max(running, key=lambda job: JOB_PRIORITIES[job["priority"]])
+        if JOB_PRIORITIES[victim["priority"]] <= JOB_PRIORITIES[urgent_job["priority"]]:
+            return
+        victim["preempted"] = True
+        process = victim.get("process") # Sin proceso (PyAV) el trabajo se detiene al ver la marca
+    if process is not None:
+        kill_process_group(process)
+
+def run_job(job, progress_callback, record_cuts=True):
+    """Ejecuta un trabajo según su tipo y registra los cortes en el catálogo (salvo con record_cuts=False)."""
+    output_extension = os.path.splitext(job["output"])[1].lower()
+    if job["kind"] == "corte":
+        process_video(job["input"], job["start"], job["end"], job["output"], progress_callback, job.get("backend"),
+                      profile=job.get("profile"))
+        cut_ranges = [(job["input"], job["start"], job["end"])]
+    elif job["kind"] == "lista":
+        job["result"] = render_edit_decision_list(job["ranges"], job["output"], progress_callback,
+                                                  job.get("profile"))
+        cut_ranges = [(item["source"], item["start"], item["end"]) for item in job["ranges"]]
+    else:
+        raise ValueError(f"Tipo de trabajo desconocido: {job['kind']}")
+    if not record_cuts:
+        return
+    for source, start_sec, end_sec in cut_ranges:
+        try:
+            catalog_record_cut(source, start_sec, end_sec, job["output"], output_extension)
+        except sqlite3.Error as e:
+            print(f"No se pudo registrar el corte en el catálogo: {e}")
+
+def _cut_worker_loop():
+    """Ejecuta los trabajos de la cola, primero los de mayor prioridad."""
+    while True:
+        _, _, job = cut_job_queue.get()
+        error = None
+        try:
+            if job.get("cancelled"):
+                raise JobCancelled("Trabajo cancelado antes de empezar")
+            journal_record(job, "en_proceso")
+            job["running"] = True
+            _worker_context.job = job
+            run_job(job, job["on_progress"] or (lambda p: None))
+        except Exception as e:
+            error = e
+        finally:
+            _worker_context.job = None
+            job.pop("running", None)
+            job.pop("process", None)
+            cut_job_queue.task_done()
+        _finish_job(job, error)
+
+def _finish_job(job, error):
+    """Cierra un trabajo: lo reencola si fue desalojado o registra su estado final y llama a on_done."""
+    if isinstance(error, JobCancelled) and job.pop("preempted", False) and not job.get("cancelled"):
+        journal_record(job, "en_cola")
+        # Se reencola desde otro hilo: si la cola está llena este trabajador no debe quedar bloqueado
+        threading.Thread(target=_queue_job, args=(job,), daemon=True).start()
+        return
+
+    with _active_jobs_lock:
+        active_jobs.pop(job["id"], None)
+    state = "cancelado" if isinstance(error, JobCancelled) else ("error" if error else "terminado")
+    try:
+        journal_record(job, state, error)
+    except sqlite3.Error as e:
+        print(f"No se pudo actualizar el diario de trabajos: {e}")
+    if job["on_done"]:
+        job["on_done"](job, error)
+
+def recover_jobs(on_done=None):
+    """Vuelve a encolar los trabajos que quedaron pendientes o interrumpidos en una ejecución anterior.
+
+    Solo se toman los trabajos cuyo proceso dueño ya terminó: los de otra instancia en ejecución (la interfaz,
+    --vigilar o --servidor) no se tocan. Se borran los archivos parciales que hubieran quedado; si la salida
+    final ya existe (se cerró justo después del renombrado) el trabajo se marca como terminado. Retorna la
+    cantidad de trabajos reanudados.
+    """
+    owner = hold_job_owner_lock()
+    with catalog_session() as conn:
+        conn.execute("DELETE FROM jobs WHERE state IN ('terminado', 'error', 'cancelado') AND updated_at < ?",
+                     (time.time() - JOB_HISTORY_DAYS * 86400,))
+        rows = conn.execute("SELECT * FROM jobs WHERE state IN ('en_cola', 'en_proceso') ORDER BY created_at").fetchall()
+
+    resumed = 0
+    for row in rows:
+        if job_owner_alive(row["owner"]):
+            continue
+        with catalog_session() as conn: # Si dos procesos arrancan a la vez, solo uno se queda con el trabajo
+            claimed = conn.execute("UPDATE jobs SET owner = ? WHERE id = ? AND owner IS ? AND state = ?",
+                                   (owner, row["id"], row["owner"], row["state"])).rowcount == 1
+        if not claimed:
+            continue
+        job = json.loads(row["payload"])
+        partial_file = partial_output_path(job["output"])
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+        if os.path.exists(job["output"]):
+            journal_record(job, "terminado")
+            continue
+        os.makedirs(os.path.dirname(os.path.abspath(job["output"])), exist_ok=True)
+        submit_job(job, on_done=on_done)
+        resumed += 1
+    return resumed
+
+# --- Lista de Decisiones de Edición (EDL) ---
+
+# Códecs que cada formato de salida acepta sin recodificar: (video, audio); None = el formato no lleva video
+COPY_COMPATIBLE_CODECS = {
+    ".mp4": ({"h264", "hevc", "mpeg4"}, {"aac", "mp3", "mp3float"}),
+    ".wmv": ({"wmv1", "wmv2", "wmv3", "vc1"}, {"wmav1", "wmav2"}),
+    ".mp3": (None, {"mp3", "mp3float"}), # Algunas versiones de ffprobe reportan el decodificador mp3float
+    ".aac": (None, {"aac"}),
+}
+EDL_AUDIO_SAMPLE_RATE = 48000 # Formato común del audio al unir rangos recodificados
+
+def edl_add_range(source, start_sec, end_sec, audio_filters="", video_filters=""):
+    """Agrega un rango a la lista (no procesa nada hasta exportar)."""
+    if end_sec <= start_sec:
+        raise ValueError("El tiempo de fin debe ser mayor que el de inicio.")
+    edit_decision_list.append({"source": source, "start": float(start_sec), "end": float(end_sec),
+                               "audio_filters": audio_filters.strip(), "video_filters": video_filters.strip()})
+
+def edl_remove_range(index):
+    """Quita un rango de la lista."""
+    del edit_decision_list[index]
+
+def edl_move_range(index, offset):
+    """Mueve un rango dentro de la lista; retorna su nueva posición."""
+    new_index = min(max(0, index + offset), len(edit_decision_list) - 1)
+    edit_decision_list.insert(new_index, edit_decision_list.pop(index))
+    return new_index
+
+def merge_adjacent_ranges(ranges):
+    """Une rangos consecutivos del mismo archivo que se tocan y tienen los mismos filtros."""
+    merged = []
+    for item in ranges:
+        previous = merged[-1] if merged else None
+        if (previous and previous["source"] == item["source"] and abs(previous["end"] - item["start"]) < 1e-3
+                and previous["audio_filters"] == item["audio_filters"]
+                and previous["video_filters"] == item["video_filters"]):
+            previous["end"] = item["end"]
+        else:
+            merged.append(dict(item))
+    return merged
+
+def can_stream_copy_ranges(ranges, output_extension, sources_info):
+    """Indica si los rangos pueden unirse con el demuxer concat sin recodificar."""
+    if output_extension not in COPY_COMPATIBLE_CODECS:
+        return False
+    if any(item["audio_filters"] or item["video_filters"] for item in ranges):
+        return False
+    video_codecs, audio_codecs = COPY_COMPATIBLE_CODECS[output_extension]
+    signatures = set()
+    for info in sources_info.values():
+        if info.get("audio_codec") not in audio_codecs:
+            return False
+        if video_codecs is None:
+            signatures.add((info.get("audio_codec"), info.get("channels")))
+        else:
+            if info.get("video_codec") not in video_codecs:
+                return False
+            signatures.add((info.get("audio_codec"), info.get("channels"),
+                            info.get("video_codec"), info.get("width"), info.get("height")))
+    return len(signatures) == 1 # Todos los orígenes deben compartir los parámetros de flujo
+
+def _concat_list_line(path):
+    """Escapa una ruta (o la dirección en el proxy local de una URL) para la lista del demuxer concat."""
+    path = local_media_input(path) if is_url(path) else os.path.abspath(path)
+    return "file '" + path.replace("'", "'\\''") + "'"
+
+def compile_edit_decision_list(ranges, output_file, profile=None):
+    """Traduce la lista a una sola invocación de FFmpeg.
+
+    Si no hay filtros y los orígenes son compatibles con el formato de salida se usa el demuxer concat
+    con copia de flujos; si no, un único filter_complex que normaliza, filtra y concatena los rangos.
+    Retorna un dict con el comando, la duración total, si se copian los flujos y la lista temporal de concat.
+    """
+    if not ranges:
+        raise ValueError("La lista de edición está vacía.")
+    ranges = merge_adjacent_ranges(ranges)
+    output_extension = os.path.splitext(output_file)[1].lower()
+    if output_extension not in COPY_COMPATIBLE_CODECS:
         raise ValueError(f"Formato no soportado: {output_extension}")
-    
+    sources_info = {item["source"]: get_media_info(item["source"]) for item in ranges}
+    total_duration = sum(item["end"] - item["start"] for item in ranges)
+
+    if can_stream_copy_ranges(ranges, output_extension, sources_info):
+        lines = ["ffconcat version 1.0"]
+        for item in ranges:
+            lines.extend([_concat_list_line(item["source"]),
+                          f"inpoint {item['start']:.3f}", f"outpoint {item['end']:.3f}"])
+        list_fd, list_file = tempfile.mkstemp(prefix="cortador_edl_", suffix=".txt")
+        with os.fdopen(list_fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        cmd = ['ffmpeg', '-f', 'concat', '-safe', '0']
+        if any(is_url(item["source"]) for item in ranges):
+            cmd.extend(['-protocol_whitelist', 'file,http,tcp']) # La lista apunta al proxy local
+        cmd.extend(['-i', list_file])
+        if COPY_COMPATIBLE_CODECS[output_extension][0] is None:
+            cmd.append('-vn')
+        cmd.extend(['-c', 'copy', output_file])
+        return {"cmd": cmd, "duration": total_duration, "copy": True, "list_file": list_file}
+
+    target_has_video = COPY_COMPATIBLE_CODECS[output_extension][0] is not None
+    use_video = target_has_video and all(info.get("video_codec") for info in sources_info.values())
+    use_audio = all(info.get("audio_codec") for info in sources_info.values())
+    if not use_audio and not use_video:
+        raise ValueError("Los archivos de la lista no tienen pistas compatibles con el formato de salida.")
+    if use_video:
+        first_video = next(info for info in sources_info.values() if info.get("width"))
+        width, height = first_video["width"], first_video["height"]
+
+    cmd = ['ffmpeg']
+    filter_parts, concat_inputs = [], []
+    for i, item in enumerate(ranges):
+        cmd.extend(['-ss', str(item["start"]), '-t', str(item["end"] - item["start"]),
+                    '-i', local_media_input(item["source"])])
+        if use_video:
+            chain = (f"[{i}:v:0]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                     f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1")
+            if item["video_filters"]:
+                chain += "," + item["video_filters"]
+            filter_parts.append(chain + f"[v{i}]")
+            concat_inputs.append(f"[v{i}]")
+        if use_audio:
+            chain = f"[{i}:a:0]aresample={EDL_AUDIO_SAMPLE_RATE},aformat=channel_layouts=stereo"
+            if item["audio_filters"]:
+                chain += "," + item["audio_filters"]
+            filter_parts.append(chain + f"[a{i}]")
+            concat_inputs.append(f"[a{i}]")
+
+    outputs = ("[v]" if use_video else "") + ("[a]" if use_audio else "")
+    filter_parts.append("".join(concat_inputs) +
+                        f"concat=n={len(ranges)}:v={int(use_video)}:a={int(use_audio)}" + outputs)
+    cmd.extend(['-filter_complex', ";".join(filter_parts)])
+    if use_video:
+        cmd.extend(['-map', '[v]'])
+    if use_audio:
+        cmd.extend(['-map', '[a]'])
+    cmd.extend(get_reencode_codec_args(output_extension, profile))
     cmd.append(output_file)
+    return {"cmd": cmd, "duration": total_duration, "copy": False, "list_file": None}
 
+def render_edit_decision_list(ranges, output_file, progress_callback, profile=None):
+    """Compila y ejecuta la lista en una sola pasada de FFmpeg (o la sirve desde la caché de salidas)."""
+    output_extension = os.path.splitext(output_file)[1].lower()
+    cache_key = output_cache_key(
+        "lista", [(item["source"], item["start"], item["end"], item["audio_filters"], item["video_filters"])
+                  for item in merge_adjacent_ranges(ranges)],
+        output_extension,
+        get_output_codec_args(output_extension, profile) + get_reencode_codec_args(output_extension, profile))
+    with atomic_output(output_file) as partial_file:
+        if serve_from_output_cache(cache_key, partial_file):
+            progress_callback(100)
+            return {"cmd": None, "duration": sum(item["end"] - item["start"] for item in ranges),
+                    "copy": True, "list_file": None, "cached": True}
+
+        plan = compile_edit_decision_list(ranges, partial_file, profile)
+        try:
+            run_ffmpeg_with_progress(plan["cmd"], plan["duration"], progress_callback)
+        finally:
+            if plan["list_file"]:
+                os.remove(plan["list_file"])
+        store_in_output_cache(cache_key, partial_file)
+    plan["cached"] = False
+    return plan
+
+def refresh_edl_tree():
+    """Vuelve a llenar la tabla de la lista de edición."""
+    if edl_tree is None:
+        return
+    edl_tree.delete(*edl_tree.get_children())
+    for index, item in enumerate(edit_decision_list):
+        filters = " | ".join(f for f in (item["audio_filters"], item["video_filters"]) if f)
+        edl_tree.insert("", "end", iid=str(index), values=(os.path.basename(item["source"]),
+                        format_seconds_to_time(item["start"]), format_seconds_to_time(item["end"]), filters))
+
+def _selected_edl_index():
+    selection = edl_tree.selection() if edl_tree is not None else ()
+    return int(selection[0]) if selection else None
+
+def on_edl_add_selection():
+    """Agrega la selección actual a la lista de edición."""
+    file_path = entry_file_path.get()
+    if not source_exists(file_path):
+        messagebox.showerror("Error", "Seleccione un archivo válido.")
+        return
     try:
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-            bufsize=1,
-            creationflags=subprocess.CREATE_NO_WINDOW # Evita que aparezca una ventana de consola en Windows
-        )
+        start_seconds = time_to_seconds(entry_start_time.get())
+        end_seconds = time_to_seconds(entry_end_time.get())
+        edl_add_range(file_path, start_seconds, end_seconds,
+                      entry_edl_audio_filters.get(), entry_edl_video_filters.get())
+    except ValueError as e:
+        messagebox.showerror("Error de tiempo", str(e))
+        return
+    refresh_edl_tree()
+
+def on_edl_remove():
+    index = _selected_edl_index()
+    if index is not None:
+        edl_remove_range(index)
+        refresh_edl_tree()
+
+def on_edl_move(offset):
+    index = _selected_edl_index()
+    if index is not None:
+        new_index = edl_move_range(index, offset)
+        refresh_edl_tree()
+        edl_tree.selection_set(str(new_index))
+
+def export_edit_decision_list():
+    """Exporta la lista completa a un solo archivo en la carpeta de salida."""
+    if not edit_decision_list:
+        messagebox.showerror("Error", "La lista de edición está vacía.")
+        return
+    ranges = [dict(item) for item in edit_decision_list] # La lista puede seguir editándose durante la exportación
+    export_ranges(ranges, "Exportando lista...", "lista de edición")
 
-        for line in process.stderr:
-            if 'time=' in line:
-                try:
-                    time_str = line.split('time=')[1].split()[0]
-                    hours, minutes, seconds = map(float, time_str.split(':'))
-                    current_processed_time = hours * 3600 + minutes * 60 + seconds
-                    
-                    if duration_segment > 0:
-                        progress = min(100, max(0, (current_processed_time / duration_segment) * 100))
-                        progress_callback(progress)
-                except Exception as e:
-                    print(f"Error de seguimiento de progreso: {e}")
+def export_selected_ranges():
+    """Exporta la selección principal y los rangos adicionales del archivo actual como un solo archivo."""
+    file_path = entry_file_path.get()
+    if not source_exists(file_path):
+        messagebox.showerror("Error", "Seleccione un archivo válido.")
+        return
+    selected = get_selected_ranges()
+    if not selected:
+        messagebox.showerror("Error de tiempo", "No hay rangos seleccionados.")
+        return
+    ranges = [{"source": file_path, "start": start_sec, "end": end_sec, "audio_filters": "", "video_filters": ""}
+              for start_sec, end_sec in selected]
+    export_ranges(ranges, "Uniendo rangos...", "rangos seleccionados")
+
+def export_ranges(ranges, title, description):
+    """Renderiza los rangos a un solo archivo de salida (nombre y formato tomados de la interfaz)."""
+    output_name = entry_output_name.get()
+    if not output_name:
+        messagebox.showerror("Error", "Ingrese un nombre para el archivo de salida.")
+        return
+    selected_format = output_format_combobox.get()
+    output_extension = "." + selected_format.lower() if not selected_format.startswith('.') else selected_format.lower()
+
+    output_dir = "VideoFinal"
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{output_name}{output_extension}")
+    if output_extension in STREAMING_FORMATS:
+        messagebox.showerror("Error", "HLS/DASH solo está disponible para cortes simples. "
+                                      "Exporte la lista a un archivo y córtelo con ese formato.")
+        return
+    if os.path.exists(output_path) or journal_has_active_output(output_path):
+        messagebox.showerror("Error", f"El archivo '{output_name}{output_extension}' ya existe en la carpeta '{output_dir}'. Elija otro nombre.")
+        return
 
+    job = None
+    progress_window, update_progress = create_progress_window(title, "Uniendo rangos...",
+                                                              on_cancel=lambda: job and cancel_job(job["id"]))
+    status_label.config(text=f"Exportando {description}...", fg="orange")
+
+    def on_export_done(job, error):
+        progress_window.destroy()
+        if isinstance(error, JobCancelled):
+            status_label.config(text="Exportación cancelada", fg="red")
+        elif error is None:
+            plan = job["result"]
+            mode = "desde la caché" if plan["cached"] else ("sin recodificar" if plan["copy"] else "recodificada")
+            status_label.config(text=f"Exportado ({mode}): {output_path}", fg="green")
+            messagebox.showinfo("Éxito", f"Archivo exportado con éxito: {output_path}")
+        else:
+            status_label.config(text=f"Error al exportar {description}", fg="red")
+            messagebox.showerror("Error", f"No se pudo exportar: {error}")
+
+    job = submit_ranges_job(ranges, output_path, update_progress,
+                            lambda job, error: post_ui_event(on_export_done, job, error),
+                            priority=job_priority_combobox.get(), profile=get_selected_encoding_profile())
+
+# --- Análisis de Audio (PCM) y Búsqueda de Jingles ---
+
+PCM_ANALYSIS_SAMPLE_RATE = 8000 # Frecuencia reducida para el análisis (suficiente para voz y jingles)
+PCM_CHUNK_SECONDS = 30 # Segundos de audio que se leen del pipe de FFmpeg en cada bloque
+JINGLE_MATCH_THRESHOLD = 0.6 # Confianza mínima (correlación normalizada) para aceptar una coincidencia
+
+def stream_pcm(file_path, sample_rate=PCM_ANALYSIS_SAMPLE_RATE, channels=1, start_sec=None, duration_sec=None,
+               chunk_seconds=PCM_CHUNK_SECONDS, backend=None):
+    """Decodifica el audio y lo entrega por bloques como arrays float32 en [-1, 1].
+
+    Con channels=1 se mezcla a mono; con varios canales se conservan los canales originales
+    (channels debe coincidir con los de la pista) y cada bloque tiene forma (muestras, canales).
+    Nunca se carga el archivo completo en memoria.
+    """
+    return get_media_backend(backend).pcm_chunks(file_path, sample_rate, channels, start_sec, duration_sec,
+                                                 chunk_seconds)
+
+PEAKS_PER_SECOND = 50 # Resolución de los picos guardados (un bin cada 20 ms)
+
+def _reduce_channel_peaks(chunks, channels, progress_callback=None, duration=0):
+    """Reduce un flujo de bloques PCM intercalados a bins de mín/máx/RMS por canal."""
+    require_numpy()
+    samples_per_bin = PCM_ANALYSIS_SAMPLE_RATE // PEAKS_PER_SECOND
+    mins, maxs, rms = [], [], []
+    leftover = np.zeros((0, channels), dtype=np.float32)
+    processed_bins = 0
+
+    def reduce_bins(block):
+        frames = block.reshape(-1, samples_per_bin, channels) if len(block) % samples_per_bin == 0 \
+            else block.reshape(1, -1, channels)
+        mins.append(frames.min(axis=1))
+        maxs.append(frames.max(axis=1))
+        rms.append(np.sqrt(np.mean(frames ** 2, axis=1)))
+        return len(frames)
+
+    for chunk in chunks:
+        chunk = chunk.reshape(-1, channels)
+        block = np.concatenate((leftover, chunk))
+        usable = (len(block) // samples_per_bin) * samples_per_bin
+        if usable:
+            processed_bins += reduce_bins(block[:usable])
+        leftover = block[usable:]
+        if progress_callback and duration > 0:
+            progress_callback(min(100, processed_bins / PEAKS_PER_SECOND / duration * 100))
+    if len(leftover):
+        reduce_bins(leftover) # Último bin incompleto
+
+    empty = np.zeros((0, channels), dtype=np.float32)
+    return {"mins": np.concatenate(mins) if mins else empty,
+            "maxs": np.concatenate(maxs) if maxs else empty,
+            "rms": np.concatenate(rms) if rms else empty}
+
+@traced("onda.picos")
+def extract_channel_peaks(file_path, channels, progress_callback=None, duration=0, use_cache=True):
+    """Calcula mín/máx/RMS de todos los canales a la vez con una sola decodificación PCM intercalada.
+
+    Retorna un diccionario con arrays de forma (bins, canales) y lo guarda en la caché del archivo.
+    Agregar canales no agrega pasadas de decodificación ni procesos de FFmpeg.
+    """
+    require_numpy()
+    cache_path = get_cache_path(file_path, "picos", ".npz") if use_cache else None
+    if cache_path and os.path.exists(cache_path):
+        with np.load(cache_path) as stored:
+            if stored["maxs"].shape[1:] == (channels,):
+                return {"path": file_path, "channels": channels,
+                        "mins": stored["mins"], "maxs": stored["maxs"], "rms": stored["rms"]}
+
+    chunks = stream_pcm(file_path, PCM_ANALYSIS_SAMPLE_RATE, channels=channels)
+    peaks = {"path": file_path, "channels": channels}
+    peaks.update(_reduce_channel_peaks(chunks, channels, progress_callback, duration))
+
+    if cache_path:
+        temp_path = cache_path + ".tmp.npz"
+        np.savez(temp_path, mins=peaks["mins"], maxs=peaks["maxs"], rms=peaks["rms"])
+        os.replace(temp_path, cache_path)
+        catalog_record_artifact(file_path, "peaks_path", cache_path)
+    return peaks
+
+def extend_channel_peaks(peaks):
+    """Agrega a los picos existentes solo la parte nueva de un archivo que sigue creciendo.
+
+    Se recalcula el último bin (pudo quedar incompleto) y se decodifica desde ahí con búsqueda en la
+    entrada, sin volver a leer el principio del archivo.
+    """
+    require_numpy()
+    channels = peaks["channels"]
+    kept_bins = max(0, len(peaks["maxs"]) - 1)
+    chunks = stream_pcm(peaks["path"], PCM_ANALYSIS_SAMPLE_RATE, channels=channels,
+                        start_sec=kept_bins / PEAKS_PER_SECOND)
+    new_peaks = _reduce_channel_peaks(chunks, channels)
+    extended = {"path": peaks["path"], "channels": channels}
+    for name in ("mins", "maxs", "rms"):
+        extended[name] = np.concatenate((peaks[name][:kept_bins], new_peaks[name]))
+    return extended
+
+def start_peak_extraction_thread(file_path, duration):
+    """Calcula (o carga de la caché) los picos por canal del archivo en segundo plano y redibuja la onda."""
+
+    def run_peak_extraction():
+        try:
+            channels = get_media_info(file_path)["channels"]
+            if channels == 0:
+                peaks = {"path": file_path, "channels": 0}
+            else:
+                # Un archivo en grabación cambia a cada momento: no tiene sentido guardarlo en la caché
+                peaks = extract_channel_peaks(file_path, channels, duration=duration,
+                                              use_cache=not is_live_file(file_path))
+        except Exception as e:
+            print(f"Error al calcular la forma de onda: {e}")
+            return
+
+        def show_peaks():
+            global waveform_peaks
+            if entry_file_path.get() == file_path: # El usuario pudo haber cambiado de archivo mientras tanto
+                waveform_peaks = peaks
+                request_redraw("onda")
+
+        post_ui_event(show_peaks)
+
+    threading.Thread(target=run_peak_extraction, daemon=True).start()
+
+def find_jingle_matches(reference_path, target_path, threshold=JINGLE_MATCH_THRESHOLD,
+                        sample_rate=PCM_ANALYSIS_SAMPLE_RATE, progress_callback=None, target_duration=0):
+    """Localiza todas las apariciones de un clip de referencia dentro de una grabación larga.
+
+    Calcula la correlación cruzada por FFT con el método overlap-save sobre bloques de PCM
+    reducido, normalizada por la energía local de la grabación para obtener una confianza
+    entre 0 y 1. Retorna una lista de tuplas (segundos, confianza) ordenada por tiempo.
+    """
+    require_numpy()
+    chunks = list(stream_pcm(reference_path, sample_rate))
+    if not chunks:
+        raise ValueError("No se pudo decodificar el audio del clip de referencia.")
+    reference = np.concatenate(chunks).astype(np.float64)
+    reference -= reference.mean()
+    ref_len = len(reference)
+    ref_norm = np.sqrt(np.sum(reference ** 2))
+    if ref_len < sample_rate // 10 or ref_norm == 0:
+        raise ValueError("El clip de referencia es demasiado corto o está en silencio.")
+
+    # Bloques de al menos 4 veces la referencia: cada FFT aporta fft_size - ref_len + 1 resultados válidos
+    fft_size = 1 << int(np.ceil(np.log2(4 * ref_len)))
+    step = fft_size - ref_len + 1
+    ref_spectrum = np.conj(np.fft.rfft(reference, fft_size))
+    min_window_energy = (ref_norm ** 2) * 1e-4 # Ignora tramos prácticamente en silencio
+
+    candidates = []
+
+    def correlate_block(block, base, valid):
+        spectrum = np.fft.rfft(block, fft_size)
+        correlation = np.fft.irfft(spectrum * ref_spectrum, fft_size)[:valid]
+        energy_cumsum = np.concatenate(([0.0], np.cumsum(block.astype(np.float64) ** 2)))
+        window_energy = energy_cumsum[ref_len:ref_len + valid] - energy_cumsum[:valid]
+        scores = np.where(window_energy > min_window_energy,
+                          correlation / (ref_norm * np.sqrt(np.maximum(window_energy, 1e-12))), 0.0)
+        # Supresión de no máximos dentro del bloque: un pico por cada longitud de referencia
+        while True:
+            best = int(np.argmax(scores))
+            if scores[best] < threshold:
+                break
+            candidates.append((base + best, float(min(1.0, scores[best]))))
+            scores[max(0, best - ref_len):best + ref_len] = 0.0
+
+    pending = np.zeros(0, dtype=np.float32)
+    base = 0
+    for chunk in stream_pcm(target_path, sample_rate):
+        pending = np.concatenate((pending, chunk))
+        while len(pending) >= fft_size:
+            correlate_block(pending[:fft_size], base, step)
+            pending = pending[step:]
+            base += step
+        if progress_callback and target_duration > 0:
+            progress_callback(min(100, (base / sample_rate) / target_duration * 100))
+
+    if len(pending) >= ref_len:
+        correlate_block(pending, base, len(pending) - ref_len + 1)
+
+    # Fusiona coincidencias duplicadas entre bloques contiguos
+    matches = []
+    for offset, confidence in sorted(candidates, key=lambda c: c[1], reverse=True):
+        if all(abs(offset - other) >= ref_len for other, _ in matches):
+            matches.append((offset, confidence))
+
+    return sorted((offset / sample_rate, confidence) for offset, confidence in matches)
+
+def draw_jingle_markers(canvas, duration):
+    """Dibuja las coincidencias del jingle como marcadores sobre la onda o la regla de tiempo."""
+    canvas.delete("jingle_markers")
+    width, height = get_canvas_size(canvas)
+
+    if duration <= 0 or width <= 1:
+        return
+
+    view_start, view_span = get_view_window()
+    for seconds, confidence in jingle_matches:
+        if not view_start <= seconds <= view_start + view_span:
+            continue
+        x = seconds_to_x(seconds, width)
+        canvas.create_line(x, 0, x, height, fill="#FFC107", width=2, dash=(4, 2), tags="jingle_markers")
+        if canvas is time_ruler_canvas:
+            canvas.create_text(x + 2, 2, text=f"♪ {confidence * 100:.0f}%", anchor="nw", fill="#FFC107",
+                               font=("Inter", 8, "bold"), tags="jingle_markers")
+    canvas.tag_raise("jingle_markers")
+
+def start_jingle_search_thread():
+    """Pide el clip de referencia y busca sus apariciones en el archivo actual en un hilo separado."""
+    file_path = entry_file_path.get()
+    if not file_path or waveform_current_file_duration <= 0:
+        messagebox.showerror("Error", "Primero seleccione el archivo en el que se buscará el jingle.")
+        return
+
+    reference_path = filedialog.askopenfilename(title="Seleccione el jingle de referencia", filetypes=[
+        ("Archivos de medios", "*.mp4;*.wmv;*.avi;*.mov;*.mkv;*.mp3;*.aac;*.wav;*.flac"),
+        ("Todos los archivos", "*.*")
+    ])
+    if not reference_path:
+        return
+
+    duration = waveform_current_file_duration
+    status_label.config(text="Buscando jingle...", fg="orange")
+
+    def update_search_progress(percentage):
+        post_ui_event(lambda: status_label.config(text=f"Buscando jingle... {percentage:.0f}%", fg="orange"),
+                      key="estado_jingle")
+
+    def run_jingle_search():
+        started = time.time()
+        try:
+            matches = find_jingle_matches(reference_path, file_path, progress_callback=update_search_progress,
+                                          target_duration=duration)
+        except Exception as e:
+            post_ui_event(show_task_error, "Error al buscar el jingle", f"No se pudo buscar el jingle: {e}",
+                          key="estado_jingle")
+            return
+
+        elapsed = max(time.time() - started, 1e-6)
+
+        def show_matches():
+            global jingle_matches
+            jingle_matches = matches
+            draw_jingle_markers(waveform_canvas, duration)
+            draw_jingle_markers(time_ruler_canvas, duration)
+            status_label.config(text=f"{len(matches)} coincidencia(s) del jingle encontradas "
+                                     f"({duration / elapsed:.0f}x tiempo real)", fg="green")
+
+        post_ui_event(show_matches, key="estado_jingle")
+
+    threading.Thread(target=run_jingle_search, daemon=True).start()
+
+# --- Detección de Cambios de Escena ---
+
+SCENE_SAMPLE_FPS = 10 # Fotogramas por segundo analizados (no hace falta decodificar todos)
+SCENE_FRAME_SIZE = (64, 36) # Resolución reducida de cada fotograma analizado
+SCENE_CHANGE_THRESHOLD = 0.12 # Diferencia media de píxeles (0-1) a partir de la cual hay un corte
+SCENE_MIN_CHUNK_SECONDS = 30 # Duración mínima de cada tramo que analiza un proceso
+SNAP_DISTANCE_PIXELS = 8 # Distancia a la que los bordes de la selección se ajustan a un límite
+
+def _scene_changes_in_chunk(file_path, start_sec, duration_sec, threshold):
+    """Analiza un tramo del video y retorna los tiempos de cambio de escena (se ejecuta en otro proceso)."""
+    require_numpy()
+    frame_width, frame_height = SCENE_FRAME_SIZE
+    frame_bytes = frame_width * frame_height
+    cmd = ['ffmpeg', '-v', 'error']
+    if start_sec > 0:
+        cmd.extend(['-ss', str(start_sec)])
+    cmd.extend(['-i', local_media_input(file_path), '-t', str(duration_sec), '-an',
+                '-vf', f"fps={SCENE_SAMPLE_FPS},scale={frame_width}:{frame_height},format=gray",
+                '-f', 'rawvideo', '-'])
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, creationflags=NO_WINDOW_FLAGS)
+    boundaries = []
+    previous = None
+    index = 0
+    try:
+        while True:
+            data = process.stdout.read(frame_bytes)
+            if len(data) < frame_bytes:
+                break
+            frame = np.frombuffer(data, dtype=np.uint8).astype(np.int16)
+            if previous is not None:
+                difference = np.mean(np.abs(frame - previous)) / 255.0
+                if difference > threshold:
+                    boundaries.append(start_sec + index / SCENE_SAMPLE_FPS)
+            previous = frame
+            index += 1
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
         process.wait()
-        if process.returncode != 0:
-            error_output = process.stderr.read()
-            raise Exception(f"FFmpeg falló con el código {process.returncode}: {error_output}")
+    return boundaries
+
+def detect_scene_changes(file_path, duration, threshold=SCENE_CHANGE_THRESHOLD, max_workers=None):
+    """Detecta los cambios de plano de un video analizando tramos en paralelo en un pool de procesos.
+
+    El resultado se guarda en la caché por archivo, así que las siguientes llamadas son inmediatas.
+    """
+    cache_path = get_cache_path(file_path, "escenas", ".json")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("threshold") == threshold and cached.get("fps") == SCENE_SAMPLE_FPS:
+            return cached["boundaries"]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    num_chunks = max(1, min(max_workers * 2, math.ceil(duration / SCENE_MIN_CHUNK_SECONDS)))
+    chunk_length = duration / num_chunks
+    frame_step = 1.0 / SCENE_SAMPLE_FPS
+
+    # Cada tramo empieza un fotograma antes para comparar también a través del borde entre tramos
+    chunks = []
+    for i in range(num_chunks):
+        chunk_start = i * chunk_length
+        read_start = max(0.0, chunk_start - frame_step)
+        chunks.append((read_start, chunk_start + chunk_length - read_start))
+
+    boundaries = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_scene_changes_in_chunk, file_path, start, length, threshold)
+                   for start, length in chunks]
+        for future in futures:
+            boundaries.extend(future.result())
+
+    boundaries = sorted(set(round(b, 3) for b in boundaries))
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"threshold": threshold, "fps": SCENE_SAMPLE_FPS, "boundaries": boundaries}, f)
+    catalog_record_artifact(file_path, "scenes_path", cache_path)
+    return boundaries
+
+def draw_scene_markers(canvas, duration):
+    """Dibuja los límites de escena como líneas finas sobre la forma de onda."""
+    canvas.delete("scene_markers")
+    width, height = get_canvas_size(canvas)
+
+    if duration <= 0 or width <= 1:
+        return
 
-    except FileNotFoundError:
-        raise Exception("FFmpeg no encontrado. Asegúrese de que esté instalado y en su PATH.")
+    view_start, view_span = get_view_window()
+    for seconds in scene_boundaries:
+        if not view_start <= seconds <= view_start + view_span:
+            continue
+        x = seconds_to_x(seconds, width)
+        canvas.create_line(x, 0, x, height, fill="#26C6DA", width=1, tags="scene_markers")
+    canvas.tag_raise("selection_elements")
+
+def snap_x_to_targets(x):
+    """Ajusta una posición x del canvas al límite de escena o jingle más cercano, si está a pocos píxeles."""
+    canvas_width = get_canvas_size(waveform_canvas)[0]
+    if waveform_current_file_duration <= 0 or canvas_width <= 1:
+        return x
+
+    targets = list(scene_boundaries) + [seconds for seconds, _ in jingle_matches]
+    best_x = x
+    best_distance = SNAP_DISTANCE_PIXELS + 1
+    for seconds in targets:
+        target_x = seconds_to_x(seconds, canvas_width)
+        distance = abs(target_x - x)
+        if distance < best_distance:
+            best_x, best_distance = target_x, distance
+    return best_x
+
+def start_scene_detection_thread():
+    """Detecta los cambios de escena del video actual en segundo plano."""
+    file_path = entry_file_path.get()
+    if not file_path or waveform_current_file_duration <= 0:
+        messagebox.showerror("Error", "Primero seleccione un archivo de video.")
+        return
+
+    duration = waveform_current_file_duration
+    status_label.config(text="Detectando cambios de escena...", fg="orange")
+
+    def run_scene_detection():
+        try:
+            boundaries = detect_scene_changes(file_path, duration)
+        except Exception as e:
+            post_ui_event(show_task_error, "Error al detectar escenas", f"No se pudieron detectar las escenas: {e}")
+            return
+
+        def show_boundaries():
+            global scene_boundaries
+            scene_boundaries = boundaries
+            draw_scene_markers(waveform_canvas, duration)
+            status_label.config(text=f"{len(boundaries)} cambio(s) de escena detectados", fg="green")
+
+        post_ui_event(show_boundaries)
+
+    threading.Thread(target=run_scene_detection, daemon=True).start()
+
+# --- Espectrograma por Mosaicos (STFT) ---
+
+SPECTROGRAM_SAMPLE_RATE = 16000 # Hasta 8 kHz: cubre voz, música de fondo y zumbidos
+SPECTROGRAM_FFT_SIZE = 512
+SPECTROGRAM_TILE_COLUMNS = 256 # Columnas (instantes) por mosaico
+SPECTROGRAM_BASE_COLUMN_SECONDS = 0.01 # Nivel 0: cada columna cubre 10 ms; cada nivel duplica
+SPECTROGRAM_MAX_FRAMES_PER_COLUMN = 8 # Ventanas FFT promediadas por columna en los niveles alejados
+SPECTROGRAM_DB_RANGE = (-100.0, -10.0)
+SPECTROGRAM_MEMORY_TILES = 48 # Mosaicos que se mantienen en memoria (el resto queda en disco)
+
+spectrogram_tile_cache = OrderedDict() # (clave del archivo, nivel, índice) -> imagen PIL
+spectrogram_pending = {} # (clave del archivo, nivel, índice) -> Future del cálculo en curso
+_spectrogram_lock = threading.Lock() # Protege ambos: los usan el hilo de Tk y los hilos que calculan mosaicos
+spectrogram_executor = ThreadPoolExecutor(max_workers=2)
+
+def get_spectrogram_colormap():
+    """Tabla de 256 colores (negro, azul, magenta, naranja, amarillo) para el espectrograma."""
+    global _spectrogram_colormap
+    if _spectrogram_colormap is None:
+        _spectrogram_colormap = _build_spectrogram_colormap()
+    return _spectrogram_colormap
+
+def _build_spectrogram_colormap():
+    require_numpy()
+    stops = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+    colors = np.array([[0, 0, 0], [30, 20, 110], [150, 30, 130], [240, 110, 30], [255, 240, 150]], dtype=np.float64)
+    positions = np.linspace(0.0, 1.0, 256)
+    return np.stack([np.interp(positions, stops, colors[:, i]) for i in range(3)], axis=1).astype(np.uint8)
+
+_spectrogram_colormap = None # Se crea con el primer mosaico (necesita NumPy)
+
+def get_spectrogram_level(seconds_per_pixel):
+    """Elige el nivel de zoom cuyas columnas son tan finas como un píxel de pantalla (o más)."""
+    if seconds_per_pixel <= SPECTROGRAM_BASE_COLUMN_SECONDS:
+        return 0
+    return int(math.floor(math.log2(seconds_per_pixel / SPECTROGRAM_BASE_COLUMN_SECONDS)))
+
+def compute_spectrogram_tile(file_path, level, index):
+    """Calcula un mosaico del espectrograma con una STFT por bloques sobre el PCM decodificado en streaming.
+
+    Solo se decodifica el tramo de tiempo del mosaico y la memoria usada no depende de su duración.
+    """
+    require_numpy()
+    require_pil()
+    column_seconds = SPECTROGRAM_BASE_COLUMN_SECONDS * (2 ** level)
+    tile_start = index * SPECTROGRAM_TILE_COLUMNS * column_seconds
+    hop = column_seconds * SPECTROGRAM_SAMPLE_RATE
+    fft_size = SPECTROGRAM_FFT_SIZE
+    column_span = min(max(int(hop), fft_size), fft_size * SPECTROGRAM_MAX_FRAMES_PER_COLUMN)
+    window = np.hanning(fft_size).astype(np.float32)
+    normalization = float(np.sum(window)) ** 2
+
+    columns = np.zeros((SPECTROGRAM_TILE_COLUMNS, fft_size // 2 + 1), dtype=np.float32)
+    column = 0
+    pending = np.zeros(0, dtype=np.float32)
+    pending_offset = 0 # Índice absoluto (dentro del mosaico) de la primera muestra de 'pending'
+
+    read_seconds = SPECTROGRAM_TILE_COLUMNS * column_seconds + column_span / SPECTROGRAM_SAMPLE_RATE
+    for chunk in stream_pcm(file_path, SPECTROGRAM_SAMPLE_RATE, start_sec=tile_start, duration_sec=read_seconds):
+        pending = np.concatenate((pending, chunk))
+        while column < SPECTROGRAM_TILE_COLUMNS:
+            column_start = int(round(column * hop)) - pending_offset
+            if column_start + column_span > len(pending):
+                break
+            segment = pending[column_start:column_start + column_span]
+            frames = segment[:(len(segment) // fft_size) * fft_size].reshape(-1, fft_size)
+            power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+            columns[column] = power.mean(axis=0) / normalization
+            column += 1
+        # Descarta las muestras que ya no necesita ninguna columna
+        discard = min(int(round(column * hop)) - pending_offset, len(pending))
+        if discard > 0:
+            pending = pending[discard:]
+            pending_offset += discard
+        if column >= SPECTROGRAM_TILE_COLUMNS:
+            break
+
+    low_db, high_db = SPECTROGRAM_DB_RANGE
+    decibels = 10 * np.log10(columns + 1e-12)
+    levels = np.clip((decibels - low_db) / (high_db - low_db) * 255, 0, 255).astype(np.uint8)
+    pixels = get_spectrogram_colormap()[levels.T[::-1]] # Frecuencias bajas abajo
+    return Image.fromarray(pixels, mode="RGB")
+
+def get_spectrogram_tile_path(file_path, level, index):
+    """Ruta del mosaico en la caché de disco del archivo."""
+    tile_dir = get_cache_path(file_path, "espectrograma", "")
+    os.makedirs(tile_dir, exist_ok=True)
+    return os.path.join(tile_dir, f"n{level}_{index}.png")
+
+def _remember_spectrogram_tile(key, image):
+    """Guarda un mosaico en la caché en memoria, descartando los menos usados recientemente."""
+    with _spectrogram_lock:
+        spectrogram_tile_cache[key] = image
+        spectrogram_tile_cache.move_to_end(key)
+        while len(spectrogram_tile_cache) > SPECTROGRAM_MEMORY_TILES:
+            spectrogram_tile_cache.popitem(last=False)
+
+def _spectrogram_tile_worker(file_path, key, level, index):
+    """Calcula y guarda en disco un mosaico; al terminar pide redibujar el espectrograma."""
+    try:
+        image = compute_spectrogram_tile(file_path, level, index)
+        if not is_live_file(file_path): # En vivo solo se guarda en memoria: el final sigue cambiando
+            tile_path = get_spectrogram_tile_path(file_path, level, index)
+            temp_path = tile_path + ".tmp"
+            image.save(temp_path, format="PNG")
+            os.replace(temp_path, tile_path)
+            catalog_record_artifact(file_path, "spectrogram_dir", os.path.dirname(tile_path))
+        _remember_spectrogram_tile(key, image)
     except Exception as e:
-        raise Exception(f"Error en el proceso FFmpeg: {e}")
+        print(f"Error al calcular el espectrograma: {e}")
+    finally:
+        with _spectrogram_lock:
+            spectrogram_pending.pop(key, None)
+    if spectrogram_canvas is not None:
+        post_ui_event(request_redraw, "espectrograma", key="redibujar_espectrograma")
+
+def get_spectrogram_tile(file_path, file_key, level, index):
+    """Retorna el mosaico desde memoria o disco; si no existe aún, programa su cálculo y retorna None."""
+    key = (file_key, level, index)
+    with _spectrogram_lock:
+        image = spectrogram_tile_cache.get(key)
+        if image is not None:
+            spectrogram_tile_cache.move_to_end(key)
+            return image
+
+    tile_path = None if is_live_file(file_path) else get_spectrogram_tile_path(file_path, level, index)
+    if tile_path and os.path.exists(tile_path):
+        require_pil()
+        with Image.open(tile_path) as stored:
+            image = stored.convert("RGB")
+        _remember_spectrogram_tile(key, image)
+        return image
+
+    with _spectrogram_lock:
+        if key not in spectrogram_pending:
+            spectrogram_pending[key] = spectrogram_executor.submit(_spectrogram_tile_worker, file_path, key, level,
+                                                                   index)
+    return None
+
+def draw_spectrogram(canvas):
+    """Dibuja los mosaicos del espectrograma visibles en la ventana de tiempo actual."""
+    if canvas is None:
+        return
+    canvas.delete("spectrogram_tiles")
+    width, height = get_canvas_size(canvas)
+    file_path = entry_file_path.get() if entry_file_path else ""
 
-    progress_callback(100) # Asegura que se muestre el 100% de completado
-    return output_file
+    if waveform_current_file_duration <= 0 or width <= 1 or height <= 1 or not source_exists(file_path):
+        canvas.tile_photos = []
+        return
+
+    require_pil() # Sin archivo cargado no hace falta Pillow: no retrasa el primer dibujado de la ventana
+    view_start, view_span = get_view_window()
+    level = get_spectrogram_level(view_span / width)
+    tile_seconds = SPECTROGRAM_TILE_COLUMNS * SPECTROGRAM_BASE_COLUMN_SECONDS * (2 ** level)
+    first_tile = int(view_start // tile_seconds)
+    last_tile = int(min(view_start + view_span, waveform_current_file_duration) // tile_seconds)
+    file_key = live_state["key"] if is_live_file(file_path) else media_cache_key(file_path)
+    visible_keys = set()
+
+    photos = []
+    for index in range(first_tile, last_tile + 1):
+        visible_keys.add((file_key, level, index))
+        x0 = int(round(seconds_to_x(index * tile_seconds, width)))
+        x1 = int(round(seconds_to_x((index + 1) * tile_seconds, width)))
+        image = get_spectrogram_tile(file_path, file_key, level, index)
+        if image is None:
+            canvas.create_rectangle(x0, 0, x1, height, fill="#1a1a1a", outline="", tags="spectrogram_tiles")
+            canvas.create_text(max(x0, 0) + 4, 4, text="Calculando...", anchor="nw", fill="gray",
+                               font=("Inter", 8, "italic"), tags="spectrogram_tiles")
+            continue
+        photo = ImageTk.PhotoImage(image.resize((max(1, x1 - x0), height), Image.BILINEAR))
+        canvas.create_image(x0, 0, anchor="nw", image=photo, tags="spectrogram_tiles")
+        photos.append(photo)
+
+    canvas.tile_photos = photos # Mantiene las referencias solo de los mosaicos visibles
+
+    # Cancela los cálculos que ya no se ven (por ejemplo tras un zoom rápido)
+    with _spectrogram_lock:
+        for key, future in list(spectrogram_pending.items()):
+            if key not in visible_keys and future.cancel():
+                spectrogram_pending.pop(key, None)
 
 # --- Lógica de Previsualización de Video ---
 
@@ -436,6 +3472,8 @@ def start_preview_thread():
 
 def preview_video():
     """Muestra una previsualización del segmento de video seleccionado."""
+    require_cv2()
+    require_pil()
     file_path = entry_file_path.get()
     start_time_str = entry_start_time.get()
     end_time_str = entry_end_time.get()
@@ -455,7 +3493,7 @@ def preview_video():
         messagebox.showerror("Error de tiempo", "El tiempo de fin debe ser mayor que el tiempo de inicio para la previsualización.")
         return
 
-    cap = cv2.VideoCapture(file_path)
+    cap = cv2.VideoCapture(local_media_input(file_path))
 
     if not cap.isOpened():
         messagebox.showerror("Error", "No se pudo abrir el archivo de video. Asegúrese de que es un archivo de video válido.")
@@ -534,7 +3572,8 @@ def preview_video():
             preview_window.after(1, update_frame_preview)
             return
 
-        ret, frame = cap.read()
+        with trace_span("preview.decodificar"):
+            ret, frame = cap.read()
         if ret:
             current_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
             if current_ms/1000 >= end_sec:
@@ -544,25 +3583,27 @@ def preview_video():
             canvas_width = canvas_preview.winfo_width()
             canvas_height = canvas_preview.winfo_height()
             
-            # Escalado eficiente
-            scale = min(canvas_width/frame.shape[1], canvas_height/frame.shape[0])
-            if scale != 1:
-                width = int(frame.shape[1] * scale)
-                height = int(frame.shape[0] * scale)
-                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_LINEAR)
-
-            # Conversión de color optimizada
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb)
-            photo = ImageTk.PhotoImage(image=img)
+            with trace_span("preview.convertir"):
+                # Escalado eficiente
+                scale = min(canvas_width/frame.shape[1], canvas_height/frame.shape[0])
+                if scale != 1:
+                    width = int(frame.shape[1] * scale)
+                    height = int(frame.shape[0] * scale)
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_LINEAR)
+
+                # Conversión de color optimizada
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                img = Image.fromarray(frame_rgb)
+                photo = ImageTk.PhotoImage(image=img)
             
             # Centrado de la imagen
             x = (canvas_width - width) // 2
             y = (canvas_height - height) // 2
             
-            canvas_preview.delete("all")
-            canvas_preview.create_image(x, y, anchor="nw", image=photo)
-            canvas_preview.image = photo # Mantiene una referencia!
+            with trace_span("preview.presentar"):
+                canvas_preview.delete("all")
+                canvas_preview.create_image(x, y, anchor="nw", image=photo)
+                canvas_preview.image = photo # Mantiene una referencia!
 
             update_progress_preview()
             last_update = current
@@ -597,10 +3638,1268 @@ def preview_video():
 
     preview_window.protocol("WM_DELETE_WINDOW", on_closing_preview)
 
+# --- Precálculo por Lotes (sin interfaz) ---
+
+THUMBNAIL_WIDTH = 160
+
+_io_semaphore = None # Limita las lecturas de medios simultáneas entre los procesos del pool
+
+def extract_keyframe_index(file_path):
+    """Obtiene los tiempos de los fotogramas clave del video leyendo solo los paquetes (sin decodificar)."""
+    cache_path = get_cache_path(file_path, "fotogramas_clave", ".json")
+    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'packet=pts_time,flags',
+           '-of', 'csv=p=0', local_media_input(file_path)]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+                            creationflags=NO_WINDOW_FLAGS)
+    keyframes = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(',')
+        if len(parts) >= 2 and 'K' in parts[1] and parts[0] not in ('', 'N/A'):
+            keyframes.append(float(parts[0]))
+    keyframes.sort()
+
+    temp_path = cache_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(keyframes, f)
+    os.replace(temp_path, cache_path)
+    catalog_record_artifact(file_path, "keyframes_path", cache_path)
+    return keyframes
+
+def extract_thumbnail(file_path, duration):
+    """Genera una miniatura JPEG tomada al 10% de la duración del video."""
+    cache_path = get_cache_path(file_path, "miniaturas", ".jpg")
+    temp_path = cache_path + ".tmp.jpg"
+    cmd = ['ffmpeg', '-v', 'error', '-y', '-ss', str(duration * 0.1), '-i', local_media_input(file_path),
+           '-frames:v', '1', '-vf', f"scale={THUMBNAIL_WIDTH}:-2", temp_path]
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=NO_WINDOW_FLAGS)
+    if not os.path.exists(temp_path):
+        raise Exception("FFmpeg no generó la miniatura")
+    os.replace(temp_path, cache_path)
+    catalog_record_artifact(file_path, "thumbnail_path", cache_path)
+    return cache_path
+
+def _artifact_ready(row, column):
+    """Indica si el artefacto figura en el catálogo y su archivo sigue existiendo."""
+    return bool(row and row.get(column) and os.path.exists(row[column]))
+
+def missing_artifacts(row):
+    """Lista los artefactos que faltan para un archivo según su fila del catálogo (None = sin analizar)."""
+    if row is None:
+        return ["probe", "peaks_path", "keyframes_path", "thumbnail_path"]
+    missing = []
+    if row["channels"] and not _artifact_ready(row, "peaks_path"):
+        missing.append("peaks_path")
+    if row["video_codec"]:
+        missing.extend(column for column in ("keyframes_path", "thumbnail_path") if not _artifact_ready(row, column))
+    return missing
+
+def _init_precompute_worker(io_semaphore, media_backend=None):
+    """Inicializa cada proceso del pool con el semáforo compartido de E/S y el motor de medios elegido."""
+    global _io_semaphore, DEFAULT_MEDIA_BACKEND
+    _io_semaphore = io_semaphore
+    DEFAULT_MEDIA_BACKEND = media_backend or DEFAULT_MEDIA_BACKEND
+
+def precompute_media_artifacts(file_path):
+    """Genera en un proceso del pool todos los artefactos que le faltan al archivo."""
+    with _io_semaphore:
+        info = get_media_info(file_path)
+    done = []
+    for column in missing_artifacts(catalog_get_media(file_path)):
+        with _io_semaphore:
+            if column == "peaks_path":
+                extract_channel_peaks(file_path, info["channels"])
+            elif column == "keyframes_path":
+                extract_keyframe_index(file_path)
+            elif column == "thumbnail_path":
+                extract_thumbnail(file_path, info["duration"])
+        done.append(column)
+    return done
+
+def find_pending_media(root):
+    """Recorre la carpeta y retorna los archivos de medios nuevos, modificados o con artefactos incompletos."""
+    with catalog_session() as conn:
+        rows = {row["path"]: dict(row) for row in conn.execute("SELECT * FROM media")}
+
+    pending = []
+    for directory, _, files in os.walk(root):
+        for name in sorted(files):
+            if not name.lower().endswith(MEDIA_EXTENSIONS):
+                continue
+            path = os.path.abspath(os.path.join(directory, name))
+            row = rows.get(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if row is not None and (row["size"] != stat.st_size or row["mtime_ns"] != stat.st_mtime_ns):
+                row = None # El archivo cambió: se analiza de nuevo
+            if missing_artifacts(row):
+                pending.append(path)
+    return pending
+
+def run_precompute(root, workers=None, io_limit=None):
+    """Precalcula en paralelo probes, picos, índices de fotogramas clave y miniaturas de toda una carpeta.
+
+    Cada artefacto se escribe de forma atómica y se registra en el catálogo al terminar, así que si se
+    interrumpe basta con volver a ejecutar el comando para continuar donde quedó.
+    """
+    workers = workers or os.cpu_count() or 1
+    io_limit = io_limit or workers
+    pending = find_pending_media(root)
+    total = len(pending)
+    print(f"{total} archivo(s) pendientes en '{root}' ({workers} procesos, {io_limit} lecturas simultáneas)")
+    if not total:
+        return 0
+
+    started = time.time()
+    completed = failed = 0
+    io_semaphore = multiprocessing.BoundedSemaphore(io_limit)
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_precompute_worker,
+                                   initargs=(io_semaphore, DEFAULT_MEDIA_BACKEND))
+    try:
+        futures = {executor.submit(precompute_media_artifacts, path): path for path in pending}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                future.result()
+                completed += 1
+            except Exception as e:
+                failed += 1
+                print(f"Error en '{path}': {e}")
+            elapsed = max(time.time() - started, 1e-6)
+            print(f"[{completed + failed}/{total}] {os.path.basename(path)} - {(completed + failed) / elapsed:.2f} archivos/s")
+    except KeyboardInterrupt:
+        print("Interrumpido: los archivos terminados quedan en la caché; vuelva a ejecutar para continuar.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    elapsed = max(time.time() - started, 1e-6)
+    print(f"Listo: {completed} archivo(s) en {elapsed:.1f} s ({completed / elapsed:.2f} archivos/s), {failed} con error")
+    return 1 if failed else 0
+
+# --- Carpeta Vigilada (Corte Automático) ---
+
+WATCH_CONFIG_NAMES = ("cortador.json", "cortador.yaml", "cortador.yml") # Reglas de toda la carpeta
+WATCH_SIDECAR_SUFFIXES = (".cortador.json", ".cortador.yaml", ".cortador.yml") # Reglas de un archivo
+WATCH_STABLE_SECONDS = 5 # Tiempo sin cambios de tamaño ni fecha para considerar terminada la escritura
+WATCH_POLL_SECONDS = 2
+WATCH_RETRY_SECONDS = 30 # Espera antes de reintentar un archivo sin reglas o cuyo procesamiento falló
+
+# Constantes de inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+
+class InotifyWatcher:
+    """Vigila una carpeta y sus subcarpetas con inotify (solo Linux) usando ctypes, sin dependencias."""
+
+    def __init__(self, root):
+        self.libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init falló")
+        self.directories = {}
+        for directory, _, _ in os.walk(root):
+            self.add_directory(directory)
+
+    def add_directory(self, directory):
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+        if wd >= 0:
+            self.directories[wd] = directory
+
+    def read_paths(self, timeout):
+        """Espera eventos hasta 'timeout' segundos y retorna las rutas de archivos que cambiaron."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        paths = []
+        offset = 0
+        while offset + 16 <= len(data):
+            wd, mask, _, name_length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + 16:offset + 16 + name_length].rstrip(b"\0")
+            offset += 16 + name_length
+            if wd not in self.directories or not name:
+                continue
+            path = os.path.join(self.directories[wd], os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_directory(path)
+            else:
+                paths.append(path)
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+def load_rules_file(path):
+    """Lee un archivo de reglas JSON o YAML (YAML requiere PyYAML instalado)."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        try:
+            import yaml
+        except ImportError:
+            raise Exception(f"Instale PyYAML para usar reglas YAML ({path}) o use JSON")
+        return yaml.safe_load(f) or {}
+
+def find_watch_rules(file_path, root):
+    """Combina las reglas de carpeta (de la raíz hacia abajo) con las del archivo sidecar, si existen."""
+    rules = {}
+    relative_dir = os.path.relpath(os.path.dirname(file_path), root)
+    directories = [root]
+    if relative_dir != ".":
+        current = root
+        for part in relative_dir.split(os.sep):
+            current = os.path.join(current, part)
+            directories.append(current)
+
+    for directory in directories:
+        for name in WATCH_CONFIG_NAMES:
+            config_path = os.path.join(directory, name)
+            if os.path.exists(config_path):
+                rules.update(load_rules_file(config_path))
+                break
+
+    base_path = os.path.splitext(file_path)[0]
+    for suffix in WATCH_SIDECAR_SUFFIXES:
+        for candidate in (base_path + suffix, file_path + suffix):
+            if os.path.exists(candidate):
+                rules.update(load_rules_file(candidate))
+                return rules
+    return rules
+
+def _rule_seconds(value):
+    """Acepta segundos (número) o un tiempo hh:mm:ss en las reglas."""
+    return float(value) if isinstance(value, (int, float)) else time_to_seconds(str(value))
+
+def plan_watch_cuts(file_path, root, output_root, rules, duration):
+    """Convierte las reglas en la lista de cortes (inicio, fin, ruta de salida) para un archivo."""
+    start_sec = _rule_seconds(rules.get("inicio", 0))
+    if "fin" in rules:
+        end_sec = min(_rule_seconds(rules["fin"]), duration)
+    else:
+        end_sec = duration - float(rules.get("recortar_final", 0)) # Recorte contado desde el final
+    if end_sec <= start_sec:
+        raise ValueError(f"Las reglas dejan un corte vacío ({start_sec:.1f}s - {end_sec:.1f}s)")
+
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    date = time.strftime("%Y%m%d", time.localtime(os.path.getmtime(file_path)))
+    relative_dir = os.path.relpath(os.path.dirname(file_path), root)
+    output_dir = os.path.normpath(os.path.join(output_root, relative_dir, rules.get("subcarpeta", "").format(fecha=date)))
+
+    cuts = []
+    for output_format in rules.get("formatos", [".mp3"]):
+        extension = output_format.lower() if output_format.startswith(".") else "." + output_format.lower()
+        output_name = rules.get("nombre", "{nombre}").format(nombre=name, fecha=date, formato=extension[1:])
+        cuts.append((start_sec, end_sec, os.path.join(output_dir, output_name + extension)))
+    return cuts
+
+def handle_watched_file(file_path, root, output_root):
+    """Aplica las reglas a un archivo terminado de escribir y envía sus cortes a la cola de trabajos.
+
+    Retorna la cantidad de cortes encolados, o None si todavía no hay reglas para el archivo.
+    """
+    rules = find_watch_rules(file_path, root)
+    if not rules:
+        return None
+
+    duration = get_media_info(file_path)["duration"]
+    submitted = 0
+    for start_sec, end_sec, output_path in plan_watch_cuts(file_path, root, output_root, rules, duration):
+        if os.path.exists(output_path) or journal_has_active_output(output_path):
+            continue # Ya se generó (o está en la cola) desde una ejecución anterior
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        def report(job, error):
+            if error:
+                print(f"Error al cortar '{job['input']}' -> '{job['output']}': {error}")
+            else:
+                print(f"Corte listo: {job['output']}")
+
+        submit_cut_job(file_path, start_sec, end_sec, output_path, on_done=report, priority="fondo")
+        submitted += 1
+    return submitted
+
+def process_watch_candidates(candidates, handled, root, output_root, now=None):
+    """Procesa los candidatos cuyo tamaño y fecha no cambiaron durante WATCH_STABLE_SECONDS.
+
+    candidates: ruta -> (tamaño, mtime_ns, desde cuándo está estable); handled: (ruta, tamaño, mtime_ns) ya
+    procesados. Un archivo solo se marca como procesado si sus cortes se encolaron; si todavía no tiene reglas
+    (por ejemplo, el sidecar llega después) o falló, se reintenta tras WATCH_RETRY_SECONDS.
+    """
+    now = time.time() if now is None else now
+    for path, (size, mtime_ns, stable_since) in list(candidates.items()):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            candidates.pop(path, None)
+            continue
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            candidates[path] = (stat.st_size, stat.st_mtime_ns, now)
+            continue
+        if now - stable_since < WATCH_STABLE_SECONDS:
+            continue
+
+        candidates.pop(path, None)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        if key in handled:
+            continue
+        try:
+            submitted = handle_watched_file(path, root, output_root)
+            if submitted is None:
+                print(f"Sin reglas para '{path}', se reintentará")
+        except Exception as e:
+            print(f"Error al procesar '{path}': {e}")
+            submitted = None
+        if submitted is None:
+            # Vuelve a ser candidato: queda "estable" recién dentro de WATCH_RETRY_SECONDS
+            candidates[path] = (stat.st_size, stat.st_mtime_ns, now + WATCH_RETRY_SECONDS - WATCH_STABLE_SECONDS)
+            continue
+        handled.add(key)
+
+def run_watch_folder(root, output_root, poll_seconds=WATCH_POLL_SECONDS):
+    """Vigila una carpeta de ingesta y corta automáticamente cada grabación según sus reglas.
+
+    Usa inotify en Linux y, si no está disponible, revisa la carpeta periódicamente. Un archivo se procesa
+    cuando su tamaño y fecha no cambian durante WATCH_STABLE_SECONDS.
+    """
+    root = os.path.abspath(root)
+    output_root = os.path.abspath(output_root)
+    try:
+        watcher = InotifyWatcher(root) if sys.platform.startswith("linux") else None
+    except OSError as e:
+        print(f"inotify no disponible ({e}), se usará sondeo periódico")
+        watcher = None
+    print(f"Vigilando '{root}' -> '{output_root}' ({'inotify' if watcher else 'sondeo'})")
+
+    def report_recovered(job, error):
+        print(f"Trabajo reanudado {'con error: ' + str(error) if error else 'listo'}: {job['output']}")
+
+    resumed = recover_jobs(on_done=report_recovered)
+    if resumed:
+        print(f"Se reanudaron {resumed} trabajos interrumpidos")
+
+    candidates = {} # ruta -> (tamaño, mtime_ns, desde cuándo está estable)
+    handled = set() # (ruta, tamaño, mtime_ns) ya procesados
+
+    def scan_tree():
+        for directory, _, files in os.walk(root):
+            if path_is_within(directory, output_root):
+                continue
+            for name in files:
+                add_candidate(os.path.join(directory, name))
+
+    def add_candidate(path):
+        if path.lower().endswith(MEDIA_EXTENSIONS) and not path_is_within(path, output_root) and path not in candidates:
+            candidates[path] = (-1, -1, time.time())
+
+    scan_tree()
+    try:
+        while True:
+            if watcher:
+                for path in watcher.read_paths(poll_seconds):
+                    candidates.pop(path, None) # Cualquier evento reinicia la espera de estabilidad
+                    add_candidate(path)
+            else:
+                time.sleep(poll_seconds)
+                scan_tree()
+
+            process_watch_candidates(candidates, handled, root, output_root)
+    except KeyboardInterrupt:
+        print("Deteniendo: esperando a que terminen los cortes en curso...")
+        cut_job_queue.join()
+    finally:
+        if watcher:
+            watcher.close()
+    return 0
+
+# --- Servidor de Render (HTTP/JSON) ---
+
+RENDER_SERVER_PORT = 8765
+RENDER_OUTPUT_DIR = os.path.join(CACHE_DIR, "render") # Resultados del servidor hasta que el cliente los borra
+RENDER_FORMATS = ('.mp3', '.aac', '.wmv', '.mp4') # Salidas de un solo archivo (HLS/DASH no se entregan por HTTP)
+RENDER_CLAIM_WAIT_SECONDS = 20 # Espera máxima de un trabajador remoto por un trabajo (sondeo largo)
+RENDER_LEASE_SECONDS = 60 # Sin noticias del trabajador en este tiempo, el trabajo vuelve a la cola
+RENDER_HEARTBEAT_SECONDS = 2 # Cada cuánto un trabajador remoto informa el avance (y renueva la asignación)
+RENDER_POLL_SECONDS = 1 # Cada cuánto el cliente consulta el estado de su trabajo
+RENDER_MAX_POLL_FAILURES = 10 # Consultas fallidas seguidas antes de dar el trabajo por perdido
+RENDER_COPY_CHUNK = 1024 * 1024
+RENDER_TOKEN_ENV = "CORTADOR_TOKEN" # Variable de entorno con el token compartido (si no se indica --token)
+
+render_token = os.environ.get(RENDER_TOKEN_ENV) or None # Lo envían clientes y trabajadores; lo exige el servidor
+render_media_root = None # Carpeta del servidor de la que se pueden cortar archivos locales (--raiz-medios)
+render_jobs = {} # id -> estado público del trabajo (lo que responde GET /trabajos/<id>)
+render_leases = {} # asignación -> {"job", "worker", "expires"} de los trabajos tomados por trabajadores remotos
+_render_lock = threading.Lock()
+
+def normalize_render_server(address):
+    """URL base del servidor de render a partir de "host:puerto" o de una URL completa."""
+    address = address.strip().rstrip("/")
+    return address if is_url(address) else f"http://{address}"
+
+def render_auth_headers():
+    """Encabezado con el token compartido que el servidor de render exige en cada pedido."""
+    return {"Authorization": f"Bearer {render_token}"} if render_token else {}
+
+def render_api_request(server, method, path, payload=None, timeout=HTTP_TIMEOUT_SECONDS):
+    """Hace un pedido JSON al servidor de render y retorna (código HTTP, respuesta).
+
+    Los errores HTTP se retornan como respuesta ({"error": mensaje}); solo los de red lanzan OSError.
+    """
+    import urllib.request
+    import urllib.error
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = render_auth_headers()
+    if data is not None:
+        headers["Content-Type"] = "application/json"
+    request = urllib.request.Request(server + path, data=data, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, body = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, body = e.code, e.read()
+    try:
+        return status, json.loads(body) if body else {}
+    except ValueError:
+        return status, {"error": body.decode("utf-8", "replace")}
+
+def _update_render_status(status, **changes):
+    with _render_lock:
+        status.update(changes, actualizado=time.time())
+
+def _parse_render_time(value):
+    """Acepta segundos o "hh:mm:ss"."""
+    return time_to_seconds(value) if isinstance(value, str) else float(value)
+
+def resolve_render_source(source):
+    """Valida el origen de un pedido: una URL o un archivo dentro de render_media_root (relativo a ella o absoluto).
+
+    Retorna la ruta real del archivo (sin enlaces simbólicos) o la URL tal cual.
+    """
+    if is_url(source):
+        return source
+    if render_media_root is None:
+        raise ValueError("El servidor solo acepta URLs (no tiene una carpeta de medios configurada)")
+    root = os.path.realpath(render_media_root)
+    path = os.path.realpath(os.path.join(root, str(source)))
+    if not path_is_within(path, root) or not os.path.isfile(path):
+        raise ValueError(f"El origen no está en la carpeta de medios del servidor: {source}")
+    return path
+
+def _parse_render_range(item):
+    """Valida un rango pedido al servidor y retorna (origen, inicio, fin)."""
+    if item.get("filtros_audio") or item.get("filtros_video"):
+        raise ValueError("El servidor de render no acepta filtros de FFmpeg en los pedidos")
+    try:
+        source = item["origen"]
+        start_sec, end_sec = _parse_render_time(item["inicio"]), _parse_render_time(item["fin"])
+    except KeyError as e:
+        raise ValueError(f"Falta el campo {e}")
+    except TypeError:
+        raise ValueError("Los tiempos deben ser segundos o hh:mm:ss")
+    if end_sec <= start_sec:
+        raise ValueError("El tiempo de fin debe ser mayor que el de inicio.")
+    return resolve_render_source(source), start_sec, end_sec
+
+def render_submit(request):
+    """Encola en el servidor el trabajo pedido por un cliente y retorna su estado público.
+
+    request: {"tipo": "corte" | "lista", "formato", "prioridad", "perfil", "motor"} y, según el tipo,
+    "origen"/"inicio"/"fin" o "rangos" (lista de {"origen", "inicio", "fin"}). Los filtros de FFmpeg no se
+    aceptan: irían sin control a la línea de comandos del servidor.
+    """
+    kind = request.get("tipo", "corte")
+    extension = str(request.get("formato", ".mp3")).lower()
+    extension = extension if extension.startswith(".") else "." + extension
+    if extension not in RENDER_FORMATS:
+        raise ValueError(f"Formato no disponible en el servidor: {extension} (use {', '.join(RENDER_FORMATS)})")
+    priority = request.get("prioridad", "normal")
+    if priority not in JOB_PRIORITIES:
+        raise ValueError(f"Prioridad desconocida: {priority}")
+    profile = request.get("perfil")
+    if profile is not None and profile not in ENCODING_PROFILE_NAMES:
+        raise ValueError(f"Perfil de codificación desconocido: {profile}")
+    backend = request.get("motor")
+    if backend is not None and (backend not in MEDIA_BACKENDS or not MEDIA_BACKENDS[backend].available()):
+        raise ValueError(f"Motor de medios no disponible en el servidor: {backend}")
+
+    os.makedirs(RENDER_OUTPUT_DIR, exist_ok=True)
+    output_file = os.path.join(RENDER_OUTPUT_DIR, uuid.uuid4().hex + extension)
+    now = time.time()
+    status = {"tipo": kind, "estado": "en_cola", "progreso": 0.0, "error": None, "formato": extension,
+              "prioridad": priority, "trabajador": None, "salida": os.path.basename(output_file),
+              "creado": now, "actualizado": now}
+
+    def on_progress(percentage):
+        _update_render_status(status, estado="en_proceso", progreso=round(percentage, 1))
+
+    def on_done(job, error):
+        if isinstance(error, JobCancelled):
+            _update_render_status(status, estado="cancelado")
+        elif error:
+            _update_render_status(status, estado="error", error=str(error))
+        else:
+            _update_render_status(status, estado="terminado", progreso=100.0)
+
+    if kind == "corte":
+        source, start_sec, end_sec = _parse_render_range(request)
+        job = submit_cut_job(source, start_sec, end_sec, output_file, on_progress, on_done, priority, backend, profile)
+    elif kind == "lista":
+        ranges = []
+        for item in request.get("rangos") or []:
+            source, start_sec, end_sec = _parse_render_range(item)
+            ranges.append({"source": source, "start": start_sec, "end": end_sec,
+                           "audio_filters": "", "video_filters": ""})
+        if not ranges:
+            raise ValueError("La lista de rangos está vacía")
+        job = submit_ranges_job(ranges, output_file, on_progress, on_done, priority, profile)
+    else:
+        raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+    with _render_lock:
+        status["id"] = job["id"]
+        render_jobs[job["id"]] = status
+        return dict(status)
+
+def render_job_status(job_id):
+    """Estado público de un trabajo del servidor, o None si no existe.
+
+    Los trabajos reanudados tras reiniciar el servidor no están en memoria: su estado se lee del diario.
+    """
+    with _render_lock:
+        status = render_jobs.get(job_id)
+        if status is not None:
+            return dict(status)
+    with catalog_session() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None or os.path.dirname(row["output_path"]) != os.path.abspath(RENDER_OUTPUT_DIR):
+        return None # No es un trabajo del servidor (por ejemplo, un corte de la interfaz en esta máquina)
+    return {"id": job_id, "tipo": row["kind"], "estado": row["state"],
+            "progreso": 100.0 if row["state"] == "terminado" else None, "error": row["error"],
+            "formato": os.path.splitext(row["output_path"])[1], "trabajador": None,
+            "salida": os.path.basename(row["output_path"]), "creado": row["created_at"],
+            "actualizado": row["updated_at"]}
+
+def render_cancel(job_id):
+    """Cancela un trabajo pendiente o en curso; si ya terminó, borra su resultado del servidor."""
+    if cancel_job(job_id):
+        return {"id": job_id, "cancelado": True}
+    status = render_job_status(job_id)
+    if status is None:
+        raise KeyError(job_id)
+    try:
+        os.remove(os.path.join(RENDER_OUTPUT_DIR, status["salida"]))
+    except FileNotFoundError:
+        pass
+    with _render_lock:
+        render_jobs.pop(job_id, None)
+    return {"id": job_id, "borrado": True}
+
+def render_claim(worker, wait_seconds):
+    """Entrega a un trabajador remoto el próximo trabajo de la cola (la misma que usan los hilos locales).
+
+    Espera hasta wait_seconds a que haya uno; retorna None si no llegó ninguno. El trabajo queda asignado
+    mientras el trabajador siga informando su avance (ver RENDER_LEASE_SECONDS).
+    """
+    deadline = time.monotonic() + min(max(0.0, wait_seconds), RENDER_CLAIM_WAIT_SECONDS)
+    while True:
+        try:
+            _, _, job = cut_job_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            return None
+        if not job.get("cancelled"):
+            break
+        cut_job_queue.task_done()
+        _finish_job(job, JobCancelled("Trabajo cancelado antes de empezar"))
+    journal_record(job, "en_proceso")
+    lease = uuid.uuid4().hex
+    with _render_lock:
+        render_leases[lease] = {"job": job, "worker": worker, "expires": time.monotonic() + RENDER_LEASE_SECONDS}
+        status = render_jobs.get(job["id"])
+        if status is not None:
+            status.update(estado="en_proceso", trabajador=worker, actualizado=time.time())
+    return {"asignacion": lease, "trabajo": job_payload(job), "plazo": RENDER_LEASE_SECONDS}
+
+def _get_lease(lease):
+    with _render_lock:
+        entry = render_leases.get(lease)
+        if entry is None:
+            raise KeyError(lease)
+        entry["expires"] = time.monotonic() + RENDER_LEASE_SECONDS
+        return entry
+
+def _finish_leased_job(lease, error):
+    """Libera la asignación y cierra el trabajo; si el trabajador lo abandonó sin cancelarse, vuelve a la cola."""
+    with _render_lock:
+        entry = render_leases.pop(lease, None)
+    if entry is None:
+        return
+    job = entry["job"]
+    if isinstance(error, JobCancelled) and not job.get("cancelled"):
+        job["preempted"] = True # _finish_job lo reencola
+        with _render_lock:
+            status = render_jobs.get(job["id"])
+            if status is not None:
+                status.update(estado="en_cola", progreso=0.0, trabajador=None, actualizado=time.time())
+    cut_job_queue.task_done()
+    _finish_job(job, error)
+
+def render_lease_progress(lease, percentage):
+    """Renueva la asignación con el avance del trabajador y le indica si el trabajo fue cancelado."""
+    job = _get_lease(lease)["job"]
+    if job["on_progress"]:
+        job["on_progress"](float(percentage))
+    return {"cancelado": bool(job.get("cancelled"))}
+
+def render_lease_failed(lease, message, cancelled=False):
+    """El trabajador no pudo completar el trabajo (o lo abandonó, con cancelled=True)."""
+    _get_lease(lease)
+    _finish_leased_job(lease, JobCancelled(message) if cancelled else RuntimeError(message))
+
+def render_lease_result(lease, stream, length):
+    """Recibe el archivo terminado de un trabajador remoto y lo guarda como resultado del trabajo."""
+    entry = _get_lease(lease)
+    entry["expires"] = float("inf") # La subida de un archivo grande puede tardar más que la asignación
+    try:
+        with atomic_output(entry["job"]["output"]) as partial_file, open(partial_file, "wb") as f:
+            remaining = length
+            while remaining > 0:
+                data = stream.read(min(RENDER_COPY_CHUNK, remaining))
+                if not data:
+                    raise OSError("La subida del resultado quedó incompleta")
+                f.write(data)
+                remaining -= len(data)
+    except OSError as e:
+        _finish_leased_job(lease, JobCancelled(str(e))) # Se rehace: el corte en sí no falló
+        raise
+    _finish_leased_job(lease, None)
+
+def expire_render_leases():
+    """Devuelve a la cola los trabajos cuyos trabajadores remotos dejaron de dar señales."""
+    now = time.monotonic()
+    with _render_lock:
+        expired = [(lease, entry) for lease, entry in render_leases.items() if entry["expires"] < now]
+    for lease, entry in expired:
+        print(f"El trabajador '{entry['worker']}' no respondió; el trabajo {entry['job']['id']} vuelve a la cola")
+        _finish_leased_job(lease, JobCancelled("Asignación vencida"))
+
+def _create_render_handler():
+    """Construye la clase del manejador HTTP del servidor de render (http.server se importa al usarse)."""
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import urlsplit
+
+    class RenderRequestHandler(BaseHTTPRequestHandler):
+        """API JSON del servidor de render.
+
+        Clientes:      POST /trabajos, GET /trabajos, GET/DELETE /trabajos/<id>, GET /trabajos/<id>/resultado
+        Trabajadores:  POST /asignaciones, POST /asignaciones/<a>/progreso, POST /asignaciones/<a>/error,
+                       PUT /asignaciones/<a>/resultado
+        """
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_PUT(self):
+            self._dispatch("PUT")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def _send_json(self, status, data=None):
+            body = json.dumps(data).encode("utf-8") if data is not None else b""
+            self.send_response(status)
+            if data is not None:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                data = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                raise ValueError("El cuerpo del pedido no es JSON válido")
+            if not isinstance(data, dict):
+                raise ValueError("El cuerpo del pedido debe ser un objeto JSON")
+            return data
+
+        def _send_result(self, job_id):
+            status = render_job_status(job_id)
+            if status is None:
+                raise KeyError(job_id)
+            if status["estado"] != "terminado":
+                self._send_json(409, {"error": f"El trabajo está {status['estado']}"})
+                return
+            try:
+                f = open(os.path.join(RENDER_OUTPUT_DIR, status["salida"]), "rb")
+            except FileNotFoundError:
+                raise KeyError(job_id) # El cliente ya lo descargó y lo borró
+            with f:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+                self.end_headers()
+                try:
+                    shutil.copyfileobj(f, self.wfile, RENDER_COPY_CHUNK)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        def _authorized(self):
+            if not render_token:
+                return False # Sin token configurado no se atiende a nadie
+            expected = f"Bearer {render_token}".encode("utf-8")
+            return hmac.compare_digest(self.headers.get("Authorization", "").encode("utf-8"), expected)
+
+        def _dispatch(self, method):
+            parts = [part for part in urlsplit(self.path).path.split("/") if part]
+            if not self._authorized():
+                self.close_connection = True # El cuerpo del pedido no se leyó
+                self._send_json(401, {"error": "Token inválido o ausente"})
+                return
+            try:
+                self._route(method, parts)
+            except KeyError:
+                self._send_json(404, {"error": f"No existe: {self.path}"})
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True # El cliente cerró la conexión (por ejemplo, un trabajador detenido)
+            except Exception as e:
+                print(f"Error del servidor de render en {method} {self.path}: {e}")
+                self.close_connection = True
+                try:
+                    self._send_json(500, {"error": str(e)})
+                except OSError:
+                    pass
+
+        def _route(self, method, parts):
+            if method == "GET" and parts == ["estado"]:
+                with _render_lock:
+                    leases = [entry["worker"] for entry in render_leases.values()]
+                self._send_json(200, {"en_cola": cut_job_queue.qsize(), "trabajadores_locales": CUT_WORKERS,
+                                      "asignaciones": leases, "formatos": list(RENDER_FORMATS)})
+            elif parts == ["trabajos"] and method == "POST":
+                self._send_json(201, render_submit(self._read_json()))
+            elif parts == ["trabajos"] and method == "GET":
+                with _render_lock:
+                    statuses = sorted((dict(status) for status in render_jobs.values()),
+                                      key=lambda status: status["creado"])
+                self._send_json(200, statuses)
+            elif len(parts) == 2 and parts[0] == "trabajos" and method == "GET":
+                status = render_job_status(parts[1])
+                if status is None:
+                    raise KeyError(parts[1])
+                self._send_json(200, status)
+            elif len(parts) == 2 and parts[0] == "trabajos" and method == "DELETE":
+                self._send_json(200, render_cancel(parts[1]))
+            elif len(parts) == 3 and parts[0] == "trabajos" and parts[2] == "resultado" and method == "GET":
+                self._send_result(parts[1])
+            elif parts == ["asignaciones"] and method == "POST":
+                request = self._read_json()
+                claim = render_claim(str(request.get("trabajador", self.client_address[0])),
+                                     float(request.get("espera", RENDER_CLAIM_WAIT_SECONDS)))
+                if claim is None:
+                    self._send_json(204)
+                    return
+                try:
+                    self._send_json(200, claim)
+                except OSError:
+                    # El trabajador se desconectó sin recibirlo: vuelve a la cola sin esperar a que venza
+                    _finish_leased_job(claim["asignacion"], JobCancelled("Asignación no entregada"))
+                    raise
+            elif len(parts) == 3 and parts[0] == "asignaciones" and parts[2] == "progreso" and method == "POST":
+                self._send_json(200, render_lease_progress(parts[1], self._read_json().get("progreso", 0)))
+            elif len(parts) == 3 and parts[0] == "asignaciones" and parts[2] == "error" and method == "POST":
+                request = self._read_json()
+                render_lease_failed(parts[1], str(request.get("error", "Error desconocido")),
+                                    bool(request.get("cancelado")))
+                self._send_json(200, {})
+            elif len(parts) == 3 and parts[0] == "asignaciones" and parts[2] == "resultado" and method == "PUT":
+                render_lease_result(parts[1], self.rfile, int(self.headers.get("Content-Length") or 0))
+                self._send_json(200, {})
+            else:
+                raise KeyError(self.path)
+
+    return RenderRequestHandler
+
+def run_render_server(address, local_workers=CUT_WORKERS):
+    """Atiende pedidos de corte por HTTP/JSON con la cola de trabajos de siempre.
+
+    address es "puerto" o "host:puerto". Los trabajos los ejecutan local_workers hilos de esta máquina y los
+    trabajadores remotos (--trabajador) que se conecten, todos tomando de la misma cola de prioridades.
+    """
+    global CUT_WORKERS
+    from http.server import ThreadingHTTPServer
+    if not render_token:
+        print(f"El servidor de render requiere un token compartido (--token o la variable {RENDER_TOKEN_ENV})")
+        return 1
+    if render_media_root is None:
+        print("Sin --raiz-medios solo se aceptan orígenes por URL")
+    host, _, port = address.rpartition(":")
+    try:
+        server = ThreadingHTTPServer((host or "127.0.0.1", int(port or RENDER_SERVER_PORT)), _create_render_handler())
+    except (OSError, ValueError) as e:
+        print(f"No se pudo abrir el servidor de render en '{address}': {e}")
+        return 1
+    server.daemon_threads = True
+
+    CUT_WORKERS = max(0, local_workers) # preempt_for y el reparto de hilos del codificador usan este valor
+    start_cut_workers(CUT_WORKERS)
+    resumed = recover_jobs()
+    if resumed:
+        print(f"Se reanudaron {resumed} trabajos interrumpidos")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Servidor de render en http://{server.server_address[0]}:{server.server_port} "
+          f"({CUT_WORKERS} trabajadores locales)")
+    try:
+        while True:
+            time.sleep(RENDER_LEASE_SECONDS / 4)
+            expire_render_leases()
+    except KeyboardInterrupt:
+        server.shutdown()
+        return 130
+
+def _run_claimed_job(server, lease, job, work_dir):
+    """Ejecuta en esta máquina un trabajo asignado por el servidor y le sube el resultado."""
+    extension = os.path.splitext(job["output"])[1]
+    job["output"] = os.path.join(work_dir, job["id"] + extension)
+    last_report = 0.0
+
+    def report_progress(percentage):
+        nonlocal last_report
+        if time.monotonic() - last_report < RENDER_HEARTBEAT_SECONDS:
+            return
+        last_report = time.monotonic()
+        try:
+            status, reply = render_api_request(server, "POST", f"/asignaciones/{lease}/progreso",
+                                               {"progreso": percentage})
+        except OSError:
+            return # Se reintenta en el próximo aviso; el servidor espera RENDER_LEASE_SECONDS
+        if status == 404 or reply.get("cancelado"): # Cancelado, o la asignación venció y se reasignó
+            cancel_job_locally()
+
+    def cancel_job_locally():
+        job["cancelled"] = True
+        process = job.get("process")
+        if process is not None:
+            kill_process_group(process)
+
+    _worker_context.job = job # Así run_ffmpeg_with_progress asocia el proceso al trabajo y se puede cancelar
+    try:
+        run_job(job, report_progress, record_cuts=False)
+    except JobCancelled as e:
+        render_api_request(server, "POST", f"/asignaciones/{lease}/error", {"error": str(e), "cancelado": True})
+        return
+    except Exception as e:
+        render_api_request(server, "POST", f"/asignaciones/{lease}/error", {"error": str(e)})
+        return
+    except KeyboardInterrupt:
+        cancel_job_locally()
+        render_api_request(server, "POST", f"/asignaciones/{lease}/error",
+                           {"error": "Trabajador detenido", "cancelado": True})
+        raise
+    finally:
+        _worker_context.job = None
+        job.pop("process", None)
+
+    import urllib.request
+    try:
+        with open(job["output"], "rb") as f:
+            request = urllib.request.Request(f"{server}/asignaciones/{lease}/resultado", data=f, method="PUT",
+                                             headers={"Content-Length": str(os.fstat(f.fileno()).st_size),
+                                                      "Content-Type": "application/octet-stream",
+                                                      **render_auth_headers()})
+            urllib.request.urlopen(request, timeout=HTTP_TIMEOUT_SECONDS).close()
+    finally:
+        os.remove(job["output"])
+
+def run_render_worker(server):
+    """Toma trabajos de un servidor de render, los corta con el FFmpeg de esta máquina y sube los resultados.
+
+    Los orígenes deben ser URLs o rutas que esta máquina también pueda leer (por ejemplo, una carpeta compartida).
+    """
+    server = normalize_render_server(server)
+    worker = f"{socket.gethostname()}-{os.getpid()}"
+    work_dir = tempfile.mkdtemp(prefix="cortador_render_")
+    print(f"Trabajador '{worker}' tomando trabajos de {server}")
+    try:
+        while True:
+            try:
+                status, claim = render_api_request(server, "POST", "/asignaciones",
+                                                   {"trabajador": worker, "espera": RENDER_CLAIM_WAIT_SECONDS},
+                                                   timeout=RENDER_CLAIM_WAIT_SECONDS + HTTP_TIMEOUT_SECONDS)
+                if status == 204:
+                    continue
+                if status != 200:
+                    raise OSError(claim.get("error", f"HTTP {status}"))
+                print(f"Trabajo {claim['trabajo']['id']} ({claim['trabajo']['kind']})")
+                _run_claimed_job(server, claim["asignacion"], claim["trabajo"], work_dir)
+            except OSError as e:
+                print(f"Error de comunicación con el servidor de render: {e}")
+                time.sleep(RENDER_HEARTBEAT_SECONDS)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+# --- Cliente del Servidor de Render ---
+
+def submit_remote_cut_job(server, input_file, start_sec, end_sec, output_file, on_progress=None, on_done=None,
+                          priority="normal", backend=None, profile=None):
+    """Como submit_cut_job, pero el corte lo hace el servidor de render y el resultado se descarga a output_file.
+
+    on_progress y on_done(trabajo, error) se llaman desde un hilo propio; cancel_remote_job lo cancela.
+    """
+    server = normalize_render_server(server)
+    request = {"tipo": "corte", "origen": input_file, "inicio": start_sec, "fin": end_sec,
+               "formato": os.path.splitext(output_file)[1].lower(), "prioridad": priority, "motor": backend,
+               "perfil": profile}
+    job = {"id": None, "server": server, "output": output_file, "cancelled": False}
+    threading.Thread(target=_remote_job_loop, args=(job, request, on_progress or (lambda p: None), on_done),
+                     daemon=True).start()
+    return job
+
+def cancel_remote_job(job):
+    """Pide al servidor que cancele el trabajo (sin bloquear el hilo de Tk)."""
+    job["cancelled"] = True
+    if job["id"] is not None:
+        threading.Thread(target=_delete_remote_job, args=(job,), daemon=True).start()
+    return True
+
+def _delete_remote_job(job):
+    try:
+        render_api_request(job["server"], "DELETE", f"/trabajos/{job['id']}")
+    except OSError as e:
+        print(f"No se pudo avisar al servidor de render: {e}")
+
+def _remote_job_loop(job, request, on_progress, on_done):
+    server = job["server"]
+    error = None
+    try:
+        status, reply = render_api_request(server, "POST", "/trabajos", request)
+        if status != 201:
+            raise RuntimeError(reply.get("error", f"El servidor de render respondió {status}"))
+        job["id"] = reply["id"]
+        if job["cancelled"]: # Se canceló mientras se enviaba el pedido
+            _delete_remote_job(job)
+
+        failures = 0
+        while True:
+            time.sleep(RENDER_POLL_SECONDS)
+            try:
+                status, reply = render_api_request(server, "GET", f"/trabajos/{job['id']}")
+                failures = 0
+            except OSError:
+                failures += 1
+                if failures >= RENDER_MAX_POLL_FAILURES:
+                    raise
+                continue
+            if status != 200:
+                raise RuntimeError(reply.get("error", f"El servidor de render respondió {status}"))
+            if reply["progreso"] is not None:
+                on_progress(reply["progreso"])
+            if reply["estado"] == "terminado":
+                break
+            if reply["estado"] == "cancelado":
+                raise JobCancelled("Trabajo cancelado en el servidor de render")
+            if reply["estado"] == "error":
+                raise RuntimeError(reply["error"])
+
+        import urllib.request
+        request = urllib.request.Request(f"{server}/trabajos/{job['id']}/resultado", headers=render_auth_headers())
+        with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT_SECONDS) as response, \
+                atomic_output(job["output"]) as partial_file, open(partial_file, "wb") as f:
+            shutil.copyfileobj(response, f, RENDER_COPY_CHUNK)
+        _delete_remote_job(job) # El resultado ya está aquí: se libera el espacio en el servidor
+    except Exception as e:
+        error = e
+    if on_done:
+        on_done(job, error)
+
+# --- Banco de Pruebas de Rendimiento (medios sintéticos) ---
+
+BENCHMARK_DIR = os.path.join(CACHE_DIR, "banco")
+BENCHMARK_VERSION = 1 # Cambiarlo regenera los medios y marca los resultados como no comparables
+BENCHMARK_REPEATS = 3
+BENCHMARK_CUT_FORMATS = ('.mp4', '.mp3', '.wmv', '.aac')
+BENCHMARK_PREVIEW_SIZE = (800, 600) # Tamaño de la ventana de previsualización
+BENCHMARK_PREVIEW_FRAMES = 120
+
+# Medios deterministas generados con las fuentes lavfi de FFmpeg (sin archivos externos)
+BENCHMARK_MEDIA = [
+    {"name": "tono_mono_60s", "extension": ".mp3", "duration": 60, "video": None,
+     "audio": "sine=frequency=1000:sample_rate=44100", "channels": 1,
+     "codec_args": ['-c:a', 'libmp3lame', '-b:a', '128k']},
+    {"name": "ruido_estereo_60s", "extension": ".wav", "duration": 60, "video": None,
+     "audio": "anoisesrc=color=pink:seed=42:sample_rate=48000", "channels": 2,
+     "codec_args": ['-c:a', 'pcm_s16le']},
+    {"name": "testsrc_360p_h264_30s", "extension": ".mp4", "duration": 30,
+     "video": "testsrc2=size=640x360:rate=30", "audio": "sine=frequency=440:sample_rate=48000", "channels": 1,
+     "codec_args": ['-c:v', 'libx264', '-preset', 'veryfast', '-g', '60', '-pix_fmt', 'yuv420p',
+                    '-c:a', 'aac', '-b:a', '128k']},
+    {"name": "testsrc_720p_h264_30s", "extension": ".mp4", "duration": 30,
+     "video": "testsrc2=size=1280x720:rate=30", "audio": "sine=frequency=440:sample_rate=48000", "channels": 1,
+     "codec_args": ['-c:v', 'libx264', '-preset', 'veryfast', '-g', '60', '-pix_fmt', 'yuv420p',
+                    '-c:a', 'aac', '-b:a', '128k']},
+    {"name": "testsrc_1080p_mpeg4_15s", "extension": ".mp4", "duration": 15,
+     "video": "testsrc2=size=1920x1080:rate=25", "audio": "sine=frequency=220:sample_rate=48000", "channels": 1,
+     "codec_args": ['-c:v', 'mpeg4', '-q:v', '4', '-g', '50', '-c:a', 'aac', '-b:a', '128k']},
+]
+
+def generate_benchmark_media(spec, directory=BENCHMARK_DIR):
+    """Genera (una sola vez) el medio sintético descrito por spec y retorna su ruta.
+
+    El nombre incluye un hash de la descripción, así que cambiar la receta genera un archivo nuevo.
+    Se fuerzan un solo hilo y el modo bitexact para que el resultado sea el mismo en cada máquina.
+    """
+    digest = hashlib.sha1(json.dumps([BENCHMARK_VERSION, spec], sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    path = os.path.join(directory, f"{spec['name']}_{digest}{spec['extension']}")
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+
+    cmd = ['ffmpeg', '-y', '-v', 'error']
+    if spec["video"]:
+        cmd += ['-f', 'lavfi', '-i', spec["video"]]
+    cmd += ['-f', 'lavfi', '-i', spec["audio"]]
+    cmd += ['-t', str(spec["duration"]), '-ac', str(spec["channels"]), '-threads', '1',
+            '-fflags', '+bitexact', '-flags', '+bitexact', '-map_metadata', '-1']
+    cmd += spec["codec_args"]
+    with atomic_output(path) as partial_file:
+        result = subprocess.run(cmd + [partial_file], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                universal_newlines=True, creationflags=NO_WINDOW_FLAGS)
+        if result.returncode != 0:
+            raise RuntimeError(f"No se pudo generar {spec['name']}: {result.stderr.strip()}")
+    return path
+
+def time_benchmark(function, repeats=BENCHMARK_REPEATS):
+    """Ejecuta function varias veces y retorna los tiempos (en segundos) y el último resultado."""
+    timings = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+def summarize_timings(timings):
+    """Resume una lista de tiempos con las medidas que se comparan entre ejecuciones."""
+    ordered = sorted(timings)
+    return {"repeticiones": len(ordered), "min_s": round(ordered[0], 6),
+            "mediana_s": round(ordered[len(ordered) // 2], 6),
+            "media_s": round(sum(ordered) / len(ordered), 6), "tiempos_s": [round(t, 6) for t in timings]}
+
+def measure_preview_throughput(file_path, frames=BENCHMARK_PREVIEW_FRAMES, size=BENCHMARK_PREVIEW_SIZE):
+    """Mide cuántos fotogramas por segundo puede preparar la previsualización (decodificar, escalar y convertir).
+
+    Reproduce los pasos de preview_video hasta la imagen PIL; la subida a Tk no se mide porque requiere pantalla.
+    """
+    require_cv2()
+    require_pil()
+    cap = cv2.VideoCapture(file_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"OpenCV no pudo abrir {file_path}")
+    try:
+        processed = 0
+        started = time.perf_counter()
+        while processed < frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            scale = min(size[0] / frame.shape[1], size[1] / frame.shape[0])
+            if scale != 1:
+                frame = cv2.resize(frame, (int(frame.shape[1] * scale), int(frame.shape[0] * scale)),
+                                   interpolation=cv2.INTER_LINEAR)
+            Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            processed += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        cap.release()
+    return {"fotogramas": processed, "segundos": round(elapsed, 6),
+            "fps": round(processed / elapsed, 2) if elapsed > 0 else 0.0}
+
+def get_ffmpeg_version():
+    """Retorna la primera línea de 'ffmpeg -version' para identificar la compilación usada."""
+    try:
+        result = subprocess.run(['ffmpeg', '-version'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                universal_newlines=True, creationflags=NO_WINDOW_FLAGS)
+        return result.stdout.splitlines()[0] if result.stdout else None
+    except OSError:
+        return None
+
+def run_benchmarks(output_path, repeats=BENCHMARK_REPEATS, media_names=None):
+    """Ejecuta el banco de pruebas completo y escribe los resultados en JSON.
+
+    Mide get_media_duration, cada formato de process_video (sin caché de salidas), la extracción de la
+    forma de onda (sin caché de picos) y el rendimiento de la previsualización.
+    """
+    import platform
+    specs = [spec for spec in BENCHMARK_MEDIA if not media_names or spec["name"] in media_names]
+    report = {
+        "version": BENCHMARK_VERSION,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "entorno": {"python": platform.python_version(), "plataforma": platform.platform(),
+                    "cpus": os.cpu_count(), "ffmpeg": get_ffmpeg_version(), "motor": DEFAULT_MEDIA_BACKEND},
+        "medios": [],
+        "resultados": [],
+    }
+
+    def record(test, media, timings=None, **extra):
+        entry = {"prueba": test, "medio": media}
+        if timings is not None:
+            entry.update(summarize_timings(timings))
+        entry.update(extra)
+        report["resultados"].append(entry)
+        detail = f"{entry['mediana_s'] * 1000:9.1f} ms" if timings is not None else ""
+        if "fps" in extra:
+            detail = f"{extra['fps']:9.1f} fps"
+        if "error" in extra:
+            detail = f"error: {extra['error']}"
+        print(f"  {test:<22} {extra.get('formato', ''):<5} {detail}")
+
+    with tempfile.TemporaryDirectory(prefix="cortador_banco_") as scratch:
+        for spec in specs:
+            print(f"{spec['name']}:")
+            path = generate_benchmark_media(spec)
+            report["medios"].append({"nombre": spec["name"], "ruta": path, "bytes": os.path.getsize(path),
+                                     "duracion_s": spec["duration"], "video": spec["video"], "audio": spec["audio"]})
+
+            timings, _ = time_benchmark(lambda: get_media_duration(path), repeats)
+            record("duracion", spec["name"], timings)
+
+            cut_start, cut_end = spec["duration"] * 0.25, spec["duration"] * 0.75
+            for extension in BENCHMARK_CUT_FORMATS:
+                if spec["video"] is None and extension in ('.mp4', '.wmv'):
+                    continue # Sin pista de video estos formatos no aplican
+                output = os.path.join(scratch, f"{spec['name']}{extension}")
+                try:
+                    timings, _ = time_benchmark(
+                        lambda: process_video(path, cut_start, cut_end, output, lambda p: None, use_cache=False),
+                        repeats)
+                    record("corte", spec["name"], timings, formato=extension,
+                           segundos_cortados=cut_end - cut_start, bytes_salida=os.path.getsize(output))
+                except Exception as e:
+                    record("corte", spec["name"], formato=extension, error=str(e))
+
+            timings, peaks = time_benchmark(
+                lambda: extract_channel_peaks(path, spec["channels"], use_cache=False), repeats)
+            record("forma_de_onda", spec["name"], timings, bins=int(peaks["maxs"].shape[0]))
+
+            if spec["video"]:
+                try:
+                    record("previsualizacion", spec["name"], **measure_preview_throughput(path))
+                except Exception as e:
+                    record("previsualizacion", spec["name"], error=str(e))
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {output_path}")
+    return 0
+
+# --- Autoajuste de Perfiles de Codificación ---
+
+AUTOTUNE_SECONDS = 20 # Segundos del medio sintético que se codifican con cada perfil
+AUTOTUNE_MIN_AUDIO_KBPS = 128 # Objetivo de los formatos de audio: tasa de bits mínima
+AUTOTUNE_MIN_PSNR = 35.0 # Objetivo de los formatos de video: PSNR mínimo (dB) frente a la fuente
+AUTOTUNE_SOURCES = { # Formato -> medio sintético (ver BENCHMARK_MEDIA) con el que se mide
+    '.mp3': "ruido_estereo_60s",
+    '.aac': "ruido_estereo_60s",
+    '.wmv': "testsrc_720p_h264_30s",
+    '.mp4': "testsrc_720p_h264_30s",
+}
+
+def run_ffmpeg_quiet(cmd):
+    """Ejecuta FFmpeg sin informar avance; retorna su salida de error y falla si el proceso falla."""
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True,
+                            creationflags=NO_WINDOW_FLAGS)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg falló con el código {result.returncode}: {result.stderr.strip()[-500:]}")
+    return result.stderr
+
+def measure_video_psnr(encoded_path, reference_path, seconds):
+    """PSNR promedio (dB) del video codificado frente a los primeros segundos de la fuente.
+
+    Los tiempos de ambos se llevan a la misma base y a cero (ASF usa milisegundos, MP4 no) para que el filtro
+    compare cada fotograma con el que le corresponde.
+    """
+    stderr = run_ffmpeg_quiet(['ffmpeg', '-v', 'info', '-i', encoded_path, '-t', str(seconds), '-i', reference_path,
+                               '-lavfi', '[0:v]settb=AVTB,setpts=PTS-STARTPTS[codificado];'
+                                         '[1:v]settb=AVTB,setpts=PTS-STARTPTS[fuente];[codificado][fuente]psnr',
+                               '-f', 'null', '-'])
+    for line in reversed(stderr.splitlines()):
+        if "PSNR" in line and "average:" in line:
+            return float(line.split("average:")[1].split()[0]) # "inf" si son idénticos
+    raise RuntimeError("FFmpeg no informó el PSNR")
+
+def run_autotune(min_audio_kbps=AUTOTUNE_MIN_AUDIO_KBPS, min_psnr=AUTOTUNE_MIN_PSNR, repeats=BENCHMARK_REPEATS):
+    """Mide cada perfil de cada formato en esta máquina y elige el más rápido que cumple el objetivo.
+
+    El objetivo es una tasa de bits mínima en los formatos de audio y un PSNR mínimo en los de video. Si
+    ningún perfil lo cumple se elige "calidad". La elección se guarda en ENCODING_PROFILES_PATH y pasa a
+    ser el perfil "automático" de cada formato.
+    """
+    global tuned_encoding_profiles
+    specs = {spec["name"]: spec for spec in BENCHMARK_MEDIA}
+    chosen, measurements = {}, []
+    with tempfile.TemporaryDirectory(prefix="cortador_autoajuste_") as scratch:
+        for output_extension, source_name in AUTOTUNE_SOURCES.items():
+            source = generate_benchmark_media(specs[source_name])
+            is_video = output_extension in ('.wmv', '.mp4')
+            candidates = []
+            for profile in ENCODING_PROFILE_NAMES:
+                output = os.path.join(scratch, f"{profile}{output_extension}")
+                cmd = (['ffmpeg', '-y', '-v', 'error', '-t', str(AUTOTUNE_SECONDS), '-i', source] +
+                       get_reencode_codec_args(output_extension, profile) + [output])
+                timings, _ = time_benchmark(lambda: run_ffmpeg_quiet(cmd), repeats)
+                kbps = os.path.getsize(output) * 8 / AUTOTUNE_SECONDS / 1000
+                psnr = measure_video_psnr(output, source, AUTOTUNE_SECONDS) if is_video else None
+                meets = psnr >= min_psnr if is_video else kbps >= min_audio_kbps
+                entry = {"formato": output_extension, "perfil": profile, "kbps": round(kbps, 1),
+                         "psnr_db": psnr, "cumple": meets}
+                entry.update(summarize_timings(timings))
+                measurements.append(entry)
+                candidates.append(entry)
+                quality = f"{psnr:6.2f} dB" if is_video else f"{kbps:6.0f} kbps"
+                print(f"  {output_extension:<5} {profile:<12} {entry['mediana_s'] * 1000:9.1f} ms  {quality}"
+                      f"  {'cumple' if meets else 'no cumple'}")
+            passing = [entry for entry in candidates if entry["cumple"]]
+            chosen[output_extension] = (min(passing, key=lambda entry: entry["mediana_s"])["perfil"]
+                                        if passing else "calidad")
+            print(f"{output_extension}: perfil elegido '{chosen[output_extension]}'")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    report = {"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "cpus": os.cpu_count(),
+              "objetivo": {"kbps_audio": min_audio_kbps, "psnr_db": min_psnr},
+              "perfiles": chosen, "mediciones": measurements}
+    temp_path = ENCODING_PROFILES_PATH + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, ENCODING_PROFILES_PATH)
+    tuned_encoding_profiles = chosen
+    print(f"Perfiles guardados en {ENCODING_PROFILES_PATH}")
+    return 0
+
 # --- Ventana Principal de la Aplicación ---
 
-def create_video_cutter_window():
-    """Crea la ventana principal de la aplicación de corte de video."""
+def create_video_cutter_window(startup_report=False):
+    """Crea la ventana principal de la aplicación de corte de video.
+
+    Con startup_report se imprimen (y se agregan al historial) los tiempos de cada etapa del arranque.
+    """
     
     global entry_file_path, label_duration
     global entry_start_time, entry_end_time
@@ -610,11 +4909,13 @@ def create_video_cutter_window():
     global time_ruler_canvas, selected_start_time_label, selected_end_time_label
     global status_label
 
-    master = TkinterDnD.Tk()
+    master = tk.Tk() # tkdnd se carga después de mostrar la ventana (ver enable_drag_and_drop)
     master.title("Editor Audio GLOBALNEWS by David")
     master.geometry("900x700")
     master.resizable(False, False)
     master.configure(bg="#f0f0f0")
+    master.update() # Muestra la ventana vacía de inmediato mientras se construye el resto
+    mark_startup("ventana_visible")
 
     # Scroll (puede ir más abajo)
     canvas = tk.Canvas(master, bg="#f0f0f0", highlightthickness=0)
@@ -681,11 +4982,36 @@ def create_video_cutter_window():
     entry_output_name.pack(pady=5, anchor="w")
 
     tk.Label(output_frame, text="Formato de salida:", bg="#ffffff").pack(pady=(10, 5), anchor="w")
-    output_formats = [".mp3", ".wmv", ".aac"]
+    output_formats = [".mp3", ".wmv", ".aac", ".m3u8", ".mpd"]
     output_format_combobox = ttk.Combobox(output_frame, values=output_formats, state="readonly", width=10)
     output_format_combobox.set(".mp3")
     output_format_combobox.pack(pady=5, anchor="w")
 
+    global job_priority_combobox
+    tk.Label(output_frame, text="Prioridad:", bg="#ffffff").pack(pady=(10, 5), anchor="w")
+    job_priority_combobox = ttk.Combobox(output_frame, values=list(JOB_PRIORITIES), state="readonly", width=10)
+    job_priority_combobox.set("normal")
+    job_priority_combobox.pack(pady=5, anchor="w")
+
+    global media_backend_combobox
+    tk.Label(output_frame, text="Motor de medios:", bg="#ffffff").pack(pady=(10, 5), anchor="w")
+    available_backends = [name for name, backend in MEDIA_BACKENDS.items() if backend.available()]
+    media_backend_combobox = ttk.Combobox(output_frame, values=available_backends, state="readonly", width=10)
+    media_backend_combobox.set(DEFAULT_MEDIA_BACKEND)
+    media_backend_combobox.pack(pady=5, anchor="w")
+
+    global encoding_profile_combobox
+    tk.Label(output_frame, text="Perfil de codificación:", bg="#ffffff").pack(pady=(10, 5), anchor="w")
+    encoding_profile_combobox = ttk.Combobox(output_frame, values=("automático",) + ENCODING_PROFILE_NAMES,
+                                             state="readonly", width=12)
+    encoding_profile_combobox.set(DEFAULT_ENCODING_PROFILE or "automático")
+    encoding_profile_combobox.pack(pady=5, anchor="w")
+
+    global render_server_entry
+    tk.Label(output_frame, text="Servidor de render (vacío = local):", bg="#ffffff").pack(pady=(10, 5), anchor="w")
+    render_server_entry = tk.Entry(output_frame, width=30)
+    render_server_entry.pack(pady=5, anchor="w")
+
     # Archivo
     file_frame = tk.LabelFrame(top_frame, text="Selección de Archivo", padx=15, pady=15, bg="#ffffff", bd=2, relief="groove")
     file_frame.pack(side="left", fill="both", expand=True, padx=5)
@@ -694,17 +5020,43 @@ def create_video_cutter_window():
     tk.Label(file_frame, text="Ruta del archivo de video/audio:", bg="#ffffff").pack(pady=(0, 5), anchor="w")
     entry_file_path = tk.Entry(file_frame, width=60)
     entry_file_path.pack(pady=5, fill="x")
-    entry_file_path.drop_target_register(DND_FILES)
-    entry_file_path.dnd_bind('<<Drop>>', lambda e: select_file_from_path(e.data.strip('{}'), entry_file_path, label_duration))
 
 
     label_duration = tk.Label(file_frame, text="Duración del medio: 00:00:00", bg="#ffffff")
     label_duration.pack(pady=5, anchor="w")
 
     tk.Button(file_frame, text="Seleccionar archivo", command=lambda: select_file(entry_file_path, label_duration)).pack(pady=10, fill="x")
-    tk.Label(file_frame, text="(Arrastre y suelte el archivo aquí si tiene TkDND instalado localmente)", 
+    tk.Button(file_frame, text="Abrir URL", command=lambda: select_url(entry_file_path, label_duration)).pack(pady=(0, 10), fill="x")
+
+    global live_mode_var
+    live_frame = tk.Frame(file_frame, bg="#ffffff")
+    live_frame.pack(fill="x")
+    live_mode_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(live_frame, text="Modo en vivo (archivo en grabación)", variable=live_mode_var,
+                   command=on_live_mode_toggle, bg="#ffffff").pack(side="left")
+    tk.Button(live_frame, text="Últimos 5 min", command=select_live_tail).pack(side="right")
+    tk.Label(file_frame, text="(Arrastre y suelte uno o varios archivos aquí si tiene TkDND instalado localmente)", 
              fg="gray", font=('Inter', 8, 'italic'), bg="#ffffff").pack(pady=(0, 5))
 
+    # --- Lista de Archivos ---
+    file_list_frame = tk.LabelFrame(scrollable_frame, text="Lista de Archivos", padx=15, pady=10, bg="#ffffff", bd=2, relief="groove")
+    file_list_frame.pack(padx=20, fill="x")
+
+    global file_list_tree
+    file_list_tree = ttk.Treeview(file_list_frame, columns=("archivo", "duracion", "estado"), show="headings", height=5)
+    file_list_tree.heading("archivo", text="Archivo")
+    file_list_tree.heading("duracion", text="Duración")
+    file_list_tree.heading("estado", text="Estado")
+    file_list_tree.column("archivo", width=520)
+    file_list_tree.column("duracion", width=100, anchor="center")
+    file_list_tree.column("estado", width=100, anchor="center")
+    file_list_scrollbar = tk.Scrollbar(file_list_frame, orient="vertical", command=file_list_tree.yview)
+    file_list_tree.configure(yscrollcommand=file_list_scrollbar.set)
+    file_list_tree.pack(side="left", fill="x", expand=True)
+    file_list_scrollbar.pack(side="right", fill="y")
+    file_list_tree.bind("<Double-1>", on_file_list_activate)
+    file_list_tree.bind("<Return>", on_file_list_activate)
+
     # --- Visualizador de Onda ---
     waveform_outer_frame = tk.LabelFrame(scrollable_frame, text="Visualizador de Onda", padx=15, pady=15, bg="#ffffff", bd=2, relief="groove")
     waveform_outer_frame.pack(pady=15, padx=20, fill="x", expand=True)
@@ -717,11 +5069,13 @@ def create_video_cutter_window():
     selected_start_time_label.pack(side="left", padx=10)
     selected_end_time_label = tk.Label(selection_time_labels_frame, text="Fin: 00:00:00", bg="#ffffff", fg="black", font=('Inter', 9, 'bold'))
     selected_end_time_label.pack(side="right", padx=10)
+    tk.Label(selection_time_labels_frame, text="(Mayús + arrastrar agrega rangos)", bg="#ffffff", fg="gray",
+             font=('Inter', 8, 'italic')).pack()
 
     global time_ruler_canvas
     time_ruler_canvas = tk.Canvas(waveform_outer_frame, bg="#333333", height=80, bd=0, highlightthickness=0)
     time_ruler_canvas.pack(fill="x")
-    time_ruler_canvas.bind("<Configure>", lambda event: draw_time_ruler(time_ruler_canvas, waveform_current_file_duration))
+    time_ruler_canvas.bind("<Configure>", lambda event: on_timeline_configure(event, "regla"))
 
     global waveform_canvas
     waveform_canvas = tk.Canvas(waveform_outer_frame, bg="#333333", height=150, bd=0, highlightthickness=0)
@@ -730,22 +5084,188 @@ def create_video_cutter_window():
     waveform_canvas.bind("<ButtonPress-1>", on_waveform_press)
     waveform_canvas.bind("<B1-Motion>", on_waveform_drag)
     waveform_canvas.bind("<ButtonRelease-1>", on_waveform_release)
-    waveform_canvas.bind("<Configure>", lambda event: draw_simulated_waveform(waveform_canvas, waveform_current_file_duration))
+    waveform_canvas.bind("<Configure>", lambda event: on_timeline_configure(event, "onda"))
+
+    # --- Espectrograma (debajo de la onda) ---
+    global spectrogram_canvas
+    spectrogram_canvas = tk.Canvas(waveform_outer_frame, bg="#111111", height=120, bd=0, highlightthickness=0)
+    spectrogram_canvas.pack(fill="x", pady=(5, 0))
+    spectrogram_canvas.bind("<Configure>", lambda event: on_timeline_configure(event, "espectrograma"))
+
+    # Ctrl + rueda: zoom; rueda: desplazamiento (Windows/macOS usan <MouseWheel>, Linux usa los botones 4 y 5)
+    for timeline_widget in (waveform_canvas, spectrogram_canvas, time_ruler_canvas):
+        timeline_widget.bind("<MouseWheel>", on_timeline_mousewheel)
+        timeline_widget.bind("<Button-4>", on_timeline_mousewheel)
+        timeline_widget.bind("<Button-5>", on_timeline_mousewheel)
+
+    # --- Lista de Edición ---
+    edl_frame = tk.LabelFrame(scrollable_frame, text="Lista de Edición", padx=15, pady=10, bg="#ffffff", bd=2, relief="groove")
+    edl_frame.pack(padx=20, fill="x")
+
+    global edl_tree, entry_edl_audio_filters, entry_edl_video_filters
+    edl_tree = ttk.Treeview(edl_frame, columns=("origen", "inicio", "fin", "filtros"), show="headings", height=5)
+    edl_tree.heading("origen", text="Origen")
+    edl_tree.heading("inicio", text="Inicio")
+    edl_tree.heading("fin", text="Fin")
+    edl_tree.heading("filtros", text="Filtros")
+    edl_tree.column("origen", width=260)
+    edl_tree.column("inicio", width=90, anchor="center")
+    edl_tree.column("fin", width=90, anchor="center")
+    edl_tree.column("filtros", width=220)
+    edl_tree.pack(fill="x")
+
+    edl_filters_frame = tk.Frame(edl_frame, bg="#ffffff")
+    edl_filters_frame.pack(fill="x", pady=(5, 0))
+    tk.Label(edl_filters_frame, text="Filtros de audio:", bg="#ffffff").pack(side="left")
+    entry_edl_audio_filters = tk.Entry(edl_filters_frame, width=25)
+    entry_edl_audio_filters.pack(side="left", padx=5)
+    tk.Label(edl_filters_frame, text="Filtros de video:", bg="#ffffff").pack(side="left")
+    entry_edl_video_filters = tk.Entry(edl_filters_frame, width=25)
+    entry_edl_video_filters.pack(side="left", padx=5)
+
+    edl_buttons_frame = tk.Frame(edl_frame, bg="#ffffff")
+    edl_buttons_frame.pack(fill="x", pady=(5, 0))
+    tk.Button(edl_buttons_frame, text="Agregar selección", command=on_edl_add_selection).pack(side="left", padx=(0, 5))
+    tk.Button(edl_buttons_frame, text="Quitar", command=on_edl_remove).pack(side="left", padx=5)
+    tk.Button(edl_buttons_frame, text="Subir", command=lambda: on_edl_move(-1)).pack(side="left", padx=5)
+    tk.Button(edl_buttons_frame, text="Bajar", command=lambda: on_edl_move(1)).pack(side="left", padx=5)
+    tk.Button(edl_buttons_frame, text="Exportar lista", command=export_edit_decision_list).pack(side="right")
 
     # --- Botones y estado ---
     button_frame = tk.Frame(scrollable_frame, bg="#f0f0f0")
     button_frame.pack(pady=10)
 
     tk.Button(button_frame, text="Cortar Archivo", command=start_cut_video_thread, width=15).pack(side="left", padx=10)
+    tk.Button(button_frame, text="Cortar Rangos", command=export_selected_ranges, width=15).pack(side="left", padx=10)
+    tk.Button(button_frame, text="Limpiar Rangos", command=clear_extra_selections, width=15).pack(side="left", padx=10)
     tk.Button(button_frame, text="Probar Previsualización", command=start_preview_thread, width=20).pack(side="left", padx=10)
+    tk.Button(button_frame, text="Buscar Jingle", command=start_jingle_search_thread, width=15).pack(side="left", padx=10)
+    tk.Button(button_frame, text="Detectar Escenas", command=start_scene_detection_thread, width=15).pack(side="left", padx=10)
+    tk.Button(button_frame, text="Rendimiento", command=lambda: show_trace_stats_window(master), width=12).pack(side="left", padx=10)
 
     global status_label
     status_label = tk.Label(scrollable_frame, text="Listo para cortar video/audio", fg="#4CAF50", bg="#f0f0f0", font=('Inter', 10, 'bold'))
     status_label.pack(pady=10)
 
+    def report_recovered(job, error):
+        if error:
+            status_label.config(text=f"Error en trabajo reanudado: {os.path.basename(job['output'])}", fg="red")
+        else:
+            status_label.config(text=f"Trabajo reanudado listo: {os.path.basename(job['output'])}", fg="green")
+
+    def resume_interrupted_jobs():
+        resumed = recover_jobs(on_done=lambda job, error: post_ui_event(report_recovered, job, error))
+        if resumed:
+            post_ui_event(lambda: status_label.config(text=f"Reanudando {resumed} trabajos interrumpidos...", fg="orange"))
+
+    mark_startup("interfaz_completa")
+
+    def warm_up():
+        # Verificación de FFmpeg y reanudación de trabajos: fuera del hilo de Tk, con la ventana ya visible
+        if not check_ffmpeg_available():
+            post_ui_event(lambda: status_label.config(
+                text="FFmpeg/ffprobe no encontrado: instálelo y agréguelo al PATH", fg="red"))
+        resume_interrupted_jobs()
+        if startup_report:
+            print(format_startup_report())
+            try:
+                save_startup_report()
+            except OSError as e:
+                print(f"No se pudo guardar el informe de arranque: {e}")
+
+    def finish_startup():
+        enable_drag_and_drop(master, (entry_file_path, file_list_tree))
+        mark_startup("arrastrar_soltar")
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    master.after_idle(finish_startup)
+    drain_ui_events(master)
+
     master.mainloop()
 
+# --- Punto de Entrada ---
+
+def main(argv=None):
+    """Abre la interfaz o, con opciones de línea de comandos, ejecuta un modo sin interfaz."""
+    global DEFAULT_MEDIA_BACKEND, DEFAULT_ENCODING_PROFILE, render_token, render_media_root
+    parser = argparse.ArgumentParser(description="Editor Audio GLOBALNEWS: corte de video/audio con FFmpeg")
+    parser.add_argument("--precalcular", metavar="CARPETA",
+                        help="Precalcula probes, formas de onda, fotogramas clave y miniaturas de una carpeta")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos de análisis simultáneos (CPU)")
+    parser.add_argument("--io", type=int, default=None, help="Lecturas de medios simultáneas (E/S)")
+    parser.add_argument("--vigilar", metavar="CARPETA",
+                        help="Vigila una carpeta de ingesta y corta cada grabación según sus reglas JSON/YAML")
+    parser.add_argument("--salida", metavar="CARPETA", default="VideoFinal",
+                        help="Carpeta donde se escriben los cortes automáticos (por defecto VideoFinal)")
+    parser.add_argument("--motor", choices=sorted(MEDIA_BACKENDS), default=DEFAULT_MEDIA_BACKEND,
+                        help="Motor de medios para sondeo, PCM y cortes con copia (ffmpeg en subproceso o pyav)")
+    parser.add_argument("--banco", metavar="RESULTADOS_JSON",
+                        help="Ejecuta el banco de pruebas de rendimiento con medios sintéticos y guarda los tiempos")
+    parser.add_argument("--repeticiones", type=int, default=BENCHMARK_REPEATS,
+                        help="Repeticiones de cada medición del banco de pruebas")
+    parser.add_argument("--medios-banco", nargs="+", metavar="NOMBRE",
+                        help="Limita el banco de pruebas a estos medios sintéticos")
+    parser.add_argument("--perfil", choices=ENCODING_PROFILE_NAMES,
+                        help="Perfil de codificación al recodificar (por defecto el del autoajuste o equilibrado)")
+    parser.add_argument("--autoajustar", action="store_true",
+                        help="Mide los perfiles de codificación en esta máquina y elige uno por formato")
+    parser.add_argument("--objetivo-kbps", type=float, default=AUTOTUNE_MIN_AUDIO_KBPS,
+                        help="Tasa de bits mínima que debe lograr un perfil de audio en el autoajuste")
+    parser.add_argument("--objetivo-psnr", type=float, default=AUTOTUNE_MIN_PSNR,
+                        help="PSNR mínimo (dB) que debe lograr un perfil de video en el autoajuste")
+    parser.add_argument("--trazas", metavar="ARCHIVO_JSON",
+                        help="Registra tramos de rendimiento y los exporta al salir (formato Chrome trace)")
+    parser.add_argument("--servidor", metavar="[HOST:]PUERTO",
+                        help="Atiende pedidos de corte por HTTP/JSON (clientes de la interfaz y trabajadores remotos)")
+    parser.add_argument("--trabajadores", type=int, default=CUT_WORKERS,
+                        help="Cortes simultáneos en la máquina del servidor (0 = solo trabajadores remotos)")
+    parser.add_argument("--trabajador", metavar="URL_SERVIDOR",
+                        help="Toma trabajos de un servidor de render y los corta en esta máquina")
+    parser.add_argument("--token", default=render_token,
+                        help=f"Token compartido del servidor de render (por defecto la variable {RENDER_TOKEN_ENV})")
+    parser.add_argument("--raiz-medios", metavar="CARPETA",
+                        help="Carpeta de la que el servidor de render puede cortar archivos locales")
+    parser.add_argument("--tiempos-arranque", action="store_true",
+                        help="Muestra cuánto tarda cada etapa del arranque y lo guarda en el historial")
+    args = parser.parse_args(argv)
+
+    DEFAULT_MEDIA_BACKEND = args.motor
+    if not get_media_backend().available():
+        print(f"El motor '{args.motor}' no está disponible; se usará ffmpeg")
+        DEFAULT_MEDIA_BACKEND = "ffmpeg"
+
+    DEFAULT_ENCODING_PROFILE = args.perfil
+    render_token = args.token or None
+    render_media_root = args.raiz_medios
+
+    if args.trazas:
+        set_tracing(True)
+        atexit.register(export_trace, args.trazas)
+
+    if args.precalcular:
+        try:
+            return run_precompute(args.precalcular, args.procesos, args.io)
+        except KeyboardInterrupt:
+            return 130
+
+    if args.vigilar:
+        return run_watch_folder(args.vigilar, args.salida)
+
+    if args.banco:
+        return run_benchmarks(args.banco, max(1, args.repeticiones), args.medios_banco)
+
+    if args.autoajustar:
+        return run_autotune(args.objetivo_kbps, args.objetivo_psnr, max(1, args.repeticiones))
+
+    if args.servidor:
+        return run_render_server(args.servidor, args.trabajadores)
+
+    if args.trabajador:
+        return run_render_worker(args.trabajador)
+
+    create_video_cutter_window(startup_report=args.tiempos_arranque)
+    return 0
 
 
 if __name__ == "__main__":
-    create_video_cutter_window()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+# La caché y el catálogo se ubican bajo HOME al importar el módulo: se aíslan antes de importarlo
+os.environ["HOME"] = tempfile.mkdtemp(prefix="cortador_pruebas_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cortador # noqa: E402
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                                     reason="ffmpeg/ffprobe no están en el PATH")
+
+
+@pytest.fixture(autouse=True)
+def catalogo_aislado(tmp_path, monkeypatch):
+    """Cada prueba usa su propio catálogo SQLite y su propia carpeta de caché."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(cortador, "CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(cortador, "CATALOG_PATH", str(cache_dir / "catalogo.sqlite3"))
+    monkeypatch.setattr(cortador, "OUTPUT_CACHE_DIR", str(cache_dir / "salidas"))
+    monkeypatch.setattr(cortador, "_catalog_schema_ready", False)
+    return cache_dir
+
+
+def pcm_stub(signals):
+    """Reemplazo de stream_pcm que entrega arrays sintéticos por ruta, en bloques de un segundo."""
+    def stream_pcm(file_path, sample_rate=cortador.PCM_ANALYSIS_SAMPLE_RATE, channels=1, *args, **kwargs):
+        signal = signals[file_path]
+        for start in range(0, len(signal), sample_rate):
+            yield signal[start:start + sample_rate]
+    return stream_pcm
+
+
+def lavfi_media(path, *args):
+    """Genera un medio sintético con FFmpeg (args: entradas lavfi y opciones de salida)."""
+    subprocess.run(["ffmpeg", "-v", "error", "-y", *args, str(path)], check=True)
+    return str(path)
+
+
+class StubWidget:
+    """Widget de Tk falso: acepta cualquier método y registra las llamadas (las consultas retornan 0)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return 0
+        return method
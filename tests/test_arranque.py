@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+import cortador
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en un intérprete nuevo: en este proceso otras pruebas ya importaron los módulos pesados
+STARTUP_PROBE = """
+import sys
+sys.path.insert(0, {root!r})
+import cortador
+
+class Canvas:
+    def delete(self, *args):
+        pass
+    def winfo_width(self):
+        return 800
+    def winfo_height(self):
+        return 100
+
+cortador.draw_spectrogram(Canvas()) # Sin archivo cargado
+print(",".join(name for name in ("numpy", "PIL", "cv2", "av") if name in sys.modules))
+"""
+
+
+def test_el_arranque_no_importa_modulos_pesados(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path))
+    result = subprocess.run([sys.executable, "-c", STARTUP_PROBE.format(root=ROOT)], env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_numpy_se_carga_al_usarse():
+    assert cortador.require_numpy() is cortador.np
+    assert cortador.get_spectrogram_colormap().shape == (256, 3)
+    assert cortador.get_spectrogram_colormap() is cortador.get_spectrogram_colormap()
@@ -0,0 +1,48 @@
+import functools
+import json
+import os
+
+import pytest
+
+import cortador
+from conftest import requires_ffmpeg
+
+TONO_CORTO = {"name": "tono_corto", "extension": ".wav", "duration": 2, "video": None,
+              "audio": "sine=frequency=1000:sample_rate=8000", "channels": 1, "codec_args": ['-c:a', 'pcm_s16le']}
+
+
+def test_resumen_de_tiempos():
+    summary = cortador.summarize_timings([0.3, 0.1, 0.2])
+    assert summary["repeticiones"] == 3 and summary["min_s"] == 0.1 and summary["mediana_s"] == 0.2
+    assert summary["media_s"] == pytest.approx(0.2) and summary["tiempos_s"] == [0.3, 0.1, 0.2]
+
+
+def test_cada_repeticion_se_mide():
+    calls = []
+    timings, result = cortador.time_benchmark(lambda: calls.append(1) or len(calls), repeats=4)
+    assert len(timings) == 4 and result == 4 and all(t >= 0 for t in timings)
+
+
+@requires_ffmpeg
+def test_medio_sintetico_se_genera_una_vez(tmp_path):
+    path = cortador.generate_benchmark_media(TONO_CORTO, str(tmp_path))
+    mtime = os.stat(path).st_mtime_ns
+    assert cortador.generate_benchmark_media(TONO_CORTO, str(tmp_path)) == path
+    assert os.stat(path).st_mtime_ns == mtime
+    assert cortador.generate_benchmark_media(dict(TONO_CORTO, duration=3), str(tmp_path)) != path
+
+
+@requires_ffmpeg
+def test_informe_del_banco(tmp_path, monkeypatch):
+    monkeypatch.setattr(cortador, "BENCHMARK_MEDIA", [TONO_CORTO])
+    monkeypatch.setattr(cortador, "generate_benchmark_media", # El directorio por omisión se fija al importar
+                        functools.partial(cortador.generate_benchmark_media, directory=str(tmp_path / "banco")))
+    report_path = tmp_path / "resultados.json"
+
+    assert cortador.run_benchmarks(str(report_path), repeats=1) == 0
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    tests = {(entry["prueba"], entry.get("formato")) for entry in report["resultados"] if "error" not in entry}
+    assert tests == {("duracion", None), ("corte", ".mp3"), ("corte", ".aac"), ("forma_de_onda", None)}
+    assert report["medios"][0]["nombre"] == "tono_corto"
+
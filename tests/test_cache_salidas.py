@@ -0,0 +1,65 @@
+import os
+
+import cortador
+
+
+def salida(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_clave_depende_de_rangos_formato_y_ajustes(tmp_path):
+    source = salida(tmp_path, "a.wav", b"audio")
+    base = cortador.output_cache_key("corte", [(source, 1.0, 2.0)], ".mp3", ["-c:a", "libmp3lame"])
+    assert base == cortador.output_cache_key("corte", [(source, 1.0001, 2.0)], ".mp3", ["-c:a", "libmp3lame"])
+    assert base != cortador.output_cache_key("corte", [(source, 1.0, 2.5)], ".mp3", ["-c:a", "libmp3lame"])
+    assert base != cortador.output_cache_key("corte", [(source, 1.0, 2.0)], ".aac", ["-c:a", "libmp3lame"])
+    assert base != cortador.output_cache_key("corte", [(source, 1.0, 2.0)], ".mp3", ["-b:a", "320k"])
+    assert base != cortador.output_cache_key("corte", [(source, 1.0, 2.0, "volume=2")], ".mp3", ["-c:a", "libmp3lame"])
+
+
+def test_fallo_y_acierto_entregan_copias_independientes(tmp_path):
+    output = salida(tmp_path, "corte.mp3", b"datos de la salida")
+    served = str(tmp_path / "otra.mp3")
+    assert not cortador.serve_from_output_cache("clave", served)
+
+    cortador.store_in_output_cache("clave", output)
+    assert cortador.serve_from_output_cache("clave", served)
+    with open(served, "rb") as f:
+        assert f.read() == b"datos de la salida"
+
+    cache_path = os.path.join(cortador.OUTPUT_CACHE_DIR, "clave.mp3")
+    assert not os.path.samefile(output, cache_path) and not os.path.samefile(served, cache_path)
+    assert not os.access(cache_path, os.W_OK) or os.geteuid() == 0 # root ignora el permiso de solo lectura
+    with open(output, "ab") as f:
+        f.write(b" editada") # Editar la salida del usuario no altera la caché
+    with open(cache_path, "rb") as f:
+        assert f.read() == b"datos de la salida"
+
+
+def test_entrada_alterada_no_se_sirve(tmp_path):
+    output = salida(tmp_path, "corte.mp3", b"original")
+    cortador.store_in_output_cache("clave", output)
+    cache_path = os.path.join(cortador.OUTPUT_CACHE_DIR, "clave.mp3")
+    os.chmod(cache_path, 0o644)
+    with open(cache_path, "wb") as f:
+        f.write(b"truncada")
+
+    assert not cortador.serve_from_output_cache("clave", str(tmp_path / "otra.mp3"))
+    assert not os.path.exists(cache_path)
+
+
+def test_desalojo_por_uso_mas_antiguo(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(cortador.time, "time", lambda: next(clock))
+    for key in ("a", "b", "c"):
+        cortador.store_in_output_cache(key, salida(tmp_path, key + ".mp3", b"x" * 10))
+    assert cortador.serve_from_output_cache("a", str(tmp_path / "usada.mp3")) # "a" pasa a ser la más reciente
+
+    cortador.evict_output_cache(max_bytes=20)
+
+    with cortador.catalog_session() as conn:
+        keys = {row["key"] for row in conn.execute("SELECT key FROM output_cache")}
+    assert keys == {"a", "c"}
+    assert not os.path.exists(os.path.join(cortador.OUTPUT_CACHE_DIR, "b.mp3"))
@@ -0,0 +1,79 @@
+import os
+
+import cortador
+from conftest import lavfi_media, requires_ffmpeg
+
+PROBE = {"duration": 42.0, "channels": 2, "format_name": "wav", "video_codec": None, "audio_codec": "pcm_s16le",
+         "width": None, "height": None}
+
+
+def fake_probe(results):
+    calls = []
+
+    def probe_media(file_path, backend=None):
+        calls.append(file_path)
+        return dict(results[len(calls) - 1] if len(calls) <= len(results) else results[-1])
+
+    return probe_media, calls
+
+
+def test_segunda_consulta_sale_del_catalogo(tmp_path, monkeypatch):
+    media = tmp_path / "a.wav"
+    media.write_bytes(b"x" * 10)
+    probe_media, calls = fake_probe([PROBE])
+    monkeypatch.setattr(cortador, "probe_media", probe_media)
+
+    assert cortador.get_media_info(str(media))["duration"] == 42.0
+    assert cortador.get_media_info(str(media))["duration"] == 42.0
+    assert len(calls) == 1
+
+
+def test_cambio_de_archivo_invalida_la_fila_y_sus_artefactos(tmp_path, monkeypatch):
+    media = tmp_path / "a.wav"
+    media.write_bytes(b"x" * 10)
+    probe_media, calls = fake_probe([PROBE, dict(PROBE, duration=50.0)])
+    monkeypatch.setattr(cortador, "probe_media", probe_media)
+    cortador.get_media_info(str(media))
+    cortador.catalog_record_artifact(str(media), "peaks_path", "/cache/picos.npz")
+    assert cortador.catalog_get_media(str(media))["peaks_path"] == "/cache/picos.npz"
+
+    media.write_bytes(b"x" * 20)
+    info = cortador.get_media_info(str(media))
+
+    assert info["duration"] == 50.0 and len(calls) == 2
+    assert cortador.catalog_get_media(str(media))["peaks_path"] is None
+
+
+def test_sondeo_fallido_no_se_guarda(tmp_path, monkeypatch):
+    media = tmp_path / "roto.mp4"
+    media.write_bytes(b"no es un video")
+    probe_media, calls = fake_probe([dict(PROBE, duration=0.0), PROBE])
+    monkeypatch.setattr(cortador, "probe_media", probe_media)
+
+    assert cortador.get_media_info(str(media))["duration"] == 0.0
+    assert cortador.catalog_get_media(str(media)) is None
+    assert cortador.get_media_info(str(media))["duration"] == 42.0 # Se vuelve a sondear
+    assert len(calls) == 2
+
+
+def test_consulta_por_duracion_y_codec(tmp_path, monkeypatch):
+    for name, duration, codec in (("corto.wav", 5.0, "pcm_s16le"), ("largo.mp3", 90.0, "mp3")):
+        media = tmp_path / name
+        media.write_bytes(b"x")
+        monkeypatch.setattr(cortador, "probe_media", lambda path, backend=None, d=duration, c=codec:
+                            dict(PROBE, duration=d, audio_codec=c))
+        cortador.get_media_info(str(media))
+
+    assert [os.path.basename(r["path"]) for r in cortador.catalog_query(min_duration=10)] == ["largo.mp3"]
+    assert [os.path.basename(r["path"]) for r in cortador.catalog_query(codec="pcm_s16le")] == ["corto.wav"]
+
+
+@requires_ffmpeg
+def test_ffprobe_de_un_archivo_invalido_no_queda_en_catalogo(tmp_path):
+    media = tmp_path / "roto.mp3"
+    media.write_bytes(b"basura" * 100)
+    assert cortador.get_media_info(str(media))["duration"] == 0
+    assert cortador.catalog_get_media(str(media)) is None
+
+    lavfi_media(media, "-f", "lavfi", "-i", "sine=frequency=440:duration=2")
+    assert round(cortador.get_media_info(str(media))["duration"]) == 2
@@ -0,0 +1,55 @@
+import pytest
+
+import cortador
+from conftest import lavfi_media, requires_ffmpeg
+
+
+@pytest.fixture
+def cola_vacia(monkeypatch):
+    monkeypatch.setattr(cortador, "active_jobs", {})
+    monkeypatch.setattr(cortador, "start_cut_workers", lambda num_workers=cortador.CUT_WORKERS: None)
+    return cortador.active_jobs
+
+
+def test_urgente_se_encola_antes_de_desalojar(tmp_path, cola_vacia, monkeypatch):
+    order = []
+    monkeypatch.setattr(cortador, "_queue_job", lambda job: order.append(("cola", job["id"])))
+    monkeypatch.setattr(cortador, "preempt_for", lambda job: order.append(("desalojo", job["id"])))
+
+    cortador.submit_job({"id": "u", "kind": "corte", "output": str(tmp_path / "u.mp3"), "priority": "urgente"})
+
+    assert order == [("cola", "u"), ("desalojo", "u")]
+
+
+def test_desaloja_trabajos_sin_proceso_de_ffmpeg(cola_vacia, monkeypatch):
+    monkeypatch.setattr(cortador, "CUT_WORKERS", 2)
+    cola_vacia.update({"n": {"id": "n", "priority": "normal", "running": True},   # Corte con PyAV
+                       "f": {"id": "f", "priority": "fondo", "running": True},
+                       "q": {"id": "q", "priority": "fondo"}})                      # En cola, no cuenta
+
+    cortador.preempt_for({"id": "u", "priority": "urgente"})
+
+    assert cola_vacia["f"].get("preempted") and not cola_vacia["n"].get("preempted")
+    assert not cola_vacia["q"].get("preempted")
+
+
+def test_con_trabajadores_libres_no_se_desaloja(cola_vacia, monkeypatch):
+    monkeypatch.setattr(cortador, "CUT_WORKERS", 2)
+    cola_vacia["f"] = {"id": "f", "priority": "fondo", "running": True}
+    cortador.preempt_for({"id": "u", "priority": "urgente"})
+    assert not cola_vacia["f"].get("preempted")
+
+
+@requires_ffmpeg
+def test_corte_con_pyav_se_detiene_al_cancelar(tmp_path):
+    backend = cortador.get_media_backend("pyav")
+    if not backend.available():
+        pytest.skip("PyAV no está instalado")
+    source = lavfi_media(tmp_path / "tono.mp4", "-f", "lavfi", "-i", "sine=duration=5", "-c:a", "aac")
+    job = {"id": "p", "cancelled": True}
+    cortador._worker_context.job = job
+    try:
+        with pytest.raises(cortador.JobCancelled):
+            backend.cut(source, 1, 3, str(tmp_path / "salida.mp4"), lambda p: None)
+    finally:
+        cortador._worker_context.job = None
@@ -0,0 +1,126 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import cortador
+
+
+def trabajo(tmp_path, name, **extra):
+    return dict({"id": name, "kind": "corte", "input": str(tmp_path / "a.wav"), "start": 0.0, "end": 1.0,
+                 "output": str(tmp_path / "salida" / (name + ".mp3")), "priority": "normal"}, **extra)
+
+
+def a_nombre_de(owner, *job_ids):
+    """Pasa trabajos del diario a otro proceso dueño (como si los hubiera registrado él)."""
+    with cortador.catalog_session() as conn:
+        conn.executemany("UPDATE jobs SET owner = ? WHERE id = ?", [(owner, job_id) for job_id in job_ids])
+
+
+@pytest.fixture
+def dueno_vivo():
+    """Otro proceso en ejecución que mantiene bloqueado su archivo de dueño; retorna su identificador."""
+    owner = "otra-maquina-1-vivo"
+    os.makedirs(cortador._job_owners_dir(), exist_ok=True)
+    lock_path = os.path.join(cortador._job_owners_dir(), owner + ".lock")
+    process = subprocess.Popen([sys.executable, "-c", textwrap.dedent(f"""
+        import fcntl, sys
+        f = open({lock_path!r}, "a+b")
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        print("listo", flush=True)
+        sys.stdin.read()
+        """)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    assert process.stdout.readline().strip() == "listo"
+    yield owner
+    process.stdin.close()
+    process.wait(timeout=10)
+
+
+def estados():
+    with cortador.catalog_session() as conn:
+        return {row["id"]: row["state"] for row in conn.execute("SELECT id, state FROM jobs")}
+
+
+def test_el_diario_no_guarda_callbacks_ni_marcas(tmp_path):
+    job = trabajo(tmp_path, "t1", on_done=print, on_progress=print, process=object(), cancelled=True)
+    cortador.journal_record(job, "en_cola")
+    with cortador.catalog_session() as conn:
+        payload = json.loads(conn.execute("SELECT payload FROM jobs").fetchone()["payload"])
+    assert set(payload) == {"id", "kind", "input", "start", "end", "output", "priority"}
+    assert cortador.journal_has_active_output(job["output"])
+    cortador.journal_record(job, "terminado")
+    assert not cortador.journal_has_active_output(job["output"])
+
+
+def test_recuperacion_reencola_pendientes_y_borra_parciales(tmp_path, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(cortador, "submit_job", lambda job, on_progress=None, on_done=None: submitted.append(job))
+    (tmp_path / "salida").mkdir()
+    interrupted, queued, finished = trabajo(tmp_path, "corte"), trabajo(tmp_path, "cola"), trabajo(tmp_path, "listo")
+    cortador.journal_record(interrupted, "en_proceso")
+    cortador.journal_record(queued, "en_cola")
+    cortador.journal_record(finished, "en_proceso")
+    partial = cortador.partial_output_path(interrupted["output"])
+    open(partial, "wb").close()
+    open(finished["output"], "wb").close() # Se cerró justo después del renombrado final
+    a_nombre_de("otra-maquina-2-terminado", "corte", "cola", "listo") # Proceso que ya no existe
+
+    assert cortador.recover_jobs() == 2
+
+    assert [job["id"] for job in submitted] == ["corte", "cola"]
+    assert not os.path.exists(partial)
+    assert estados()["listo"] == "terminado"
+
+
+def test_historial_antiguo_se_purga(tmp_path, monkeypatch):
+    monkeypatch.setattr(cortador, "submit_job", lambda job, on_progress=None, on_done=None: None)
+    now = cortador.time.time()
+    monkeypatch.setattr(cortador.time, "time", lambda: now - (cortador.JOB_HISTORY_DAYS + 1) * 86400)
+    cortador.journal_record(trabajo(tmp_path, "viejo"), "terminado")
+    monkeypatch.setattr(cortador.time, "time", lambda: now)
+    cortador.journal_record(trabajo(tmp_path, "reciente"), "error", ValueError("falló"))
+
+    assert cortador.recover_jobs() == 0
+    assert estados() == {"reciente": "error"}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="el proceso auxiliar usa fcntl")
+def test_trabajos_de_un_proceso_vivo_no_se_tocan(tmp_path, monkeypatch, dueno_vivo):
+    submitted = []
+    monkeypatch.setattr(cortador, "submit_job", lambda job, on_progress=None, on_done=None: submitted.append(job))
+    (tmp_path / "salida").mkdir()
+    running, orphan = trabajo(tmp_path, "en_curso"), trabajo(tmp_path, "huerfano")
+    cortador.journal_record(running, "en_proceso")
+    cortador.journal_record(orphan, "en_cola")
+    a_nombre_de(dueno_vivo, "en_curso")
+    a_nombre_de("otra-maquina-3-terminado", "huerfano")
+    partial = cortador.partial_output_path(running["output"])
+    open(partial, "wb").close() # Salida que el otro proceso está escribiendo
+
+    assert cortador.recover_jobs() == 1
+
+    assert [job["id"] for job in submitted] == ["huerfano"]
+    assert os.path.exists(partial)
+    with cortador.catalog_session() as conn:
+        owners = {row["id"]: row["owner"] for row in conn.execute("SELECT id, owner FROM jobs")}
+    assert owners == {"en_curso": dueno_vivo, "huerfano": cortador.job_owner_id}
+
+
+def test_trabajos_propios_no_se_recuperan(tmp_path, monkeypatch):
+    monkeypatch.setattr(cortador, "submit_job", lambda job, on_progress=None, on_done=None: None)
+    cortador.journal_record(trabajo(tmp_path, "propio"), "en_proceso")
+    assert cortador.recover_jobs() == 0
+
+
+def test_catalogo_anterior_recibe_la_columna_de_dueno(tmp_path):
+    with cortador.sqlite3.connect(cortador.CATALOG_PATH) as conn:
+        conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+                     "output_path TEXT NOT NULL, state TEXT NOT NULL, error TEXT, created_at REAL NOT NULL, "
+                     "updated_at REAL NOT NULL)")
+    conn.close()
+    cortador.journal_record(trabajo(tmp_path, "t1"), "en_cola")
+    with cortador.catalog_session() as conn:
+        assert conn.execute("SELECT owner FROM jobs").fetchone()["owner"] == cortador.job_owner_id
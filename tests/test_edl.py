@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+import cortador
+from conftest import lavfi_media, requires_ffmpeg
+
+H264 = {"duration": 10.0, "channels": 2, "format_name": "mov,mp4", "video_codec": "h264", "audio_codec": "aac",
+        "width": 320, "height": 240}
+
+
+def rango(source, start, end, audio_filters="", video_filters=""):
+    return {"source": source, "start": start, "end": end, "audio_filters": audio_filters,
+            "video_filters": video_filters}
+
+
+@pytest.fixture
+def infos(monkeypatch):
+    """get_media_info falso: la información de cada origen se define en el dict retornado."""
+    table = {}
+    monkeypatch.setattr(cortador, "get_media_info", lambda path: table[path])
+    return table
+
+
+def test_rangos_contiguos_se_unen():
+    merged = cortador.merge_adjacent_ranges([rango("a.mp4", 0, 5), rango("a.mp4", 5, 8), rango("b.mp4", 8, 9),
+                                             rango("b.mp4", 9, 10, audio_filters="volume=2")])
+    assert [(item["source"], item["start"], item["end"]) for item in merged] == [
+        ("a.mp4", 0, 8), ("b.mp4", 8, 9), ("b.mp4", 9, 10)]
+
+
+def test_origenes_compatibles_usan_concat_con_copia(infos, tmp_path):
+    infos.update({"a.mp4": H264, "b.mp4": H264})
+    plan = cortador.compile_edit_decision_list([rango("a.mp4", 1, 3), rango("b.mp4", 0, 2)], str(tmp_path / "o.mp4"))
+    try:
+        assert plan["copy"] and plan["duration"] == pytest.approx(4.0)
+        assert plan["cmd"][:3] == ["ffmpeg", "-f", "concat"] and "-filter_complex" not in plan["cmd"]
+        with open(plan["list_file"], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert lines[0] == "ffconcat version 1.0"
+        assert lines[1] == "file '" + os.path.abspath("a.mp4") + "'"
+        assert lines[2:4] == ["inpoint 1.000", "outpoint 3.000"]
+    finally:
+        os.remove(plan["list_file"])
+
+
+def test_filtros_o_formatos_distintos_usan_filter_complex(infos, tmp_path):
+    infos.update({"a.mp4": H264, "b.mp4": dict(H264, width=640, height=480)})
+    output = str(tmp_path / "o.mp4")
+
+    plan = cortador.compile_edit_decision_list([rango("a.mp4", 0, 2), rango("b.mp4", 0, 2)], output)
+    assert not plan["copy"] and plan["list_file"] is None
+    graph = plan["cmd"][plan["cmd"].index("-filter_complex") + 1]
+    assert "scale=320:240" in graph and "concat=n=2:v=1:a=1[v][a]" in graph
+
+    plan = cortador.compile_edit_decision_list([rango("a.mp4", 0, 2, audio_filters="volume=2")], output)
+    graph = plan["cmd"][plan["cmd"].index("-filter_complex") + 1]
+    assert not plan["copy"] and "aformat=channel_layouts=stereo,volume=2[a0]" in graph
+
+
+def test_salida_de_audio_descarta_el_video(infos, tmp_path):
+    infos.update({"a.mp4": H264})
+    plan = cortador.compile_edit_decision_list([rango("a.mp4", 0, 2)], str(tmp_path / "o.aac"))
+    assert plan["copy"] and "-vn" in plan["cmd"]
+    os.remove(plan["list_file"])
+
+
+def test_lista_vacia_o_formato_desconocido():
+    with pytest.raises(ValueError):
+        cortador.compile_edit_decision_list([], "o.mp4")
+    with pytest.raises(ValueError):
+        cortador.compile_edit_decision_list([rango("a.mp4", 0, 1)], "o.xyz")
+
+
+@requires_ffmpeg
+def test_render_une_los_rangos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = lavfi_media(tmp_path / "tono.wav", "-f", "lavfi", "-i", "sine=frequency=440:duration=6")
+    output = tmp_path / "lista.mp3"
+    progress = []
+
+    plan = cortador.render_edit_decision_list([rango(source, 0, 1.5), rango(source, 3, 4.5, audio_filters="volume=0.5")],
+                                              str(output), progress.append)
+
+    assert not plan["copy"] and not plan["cached"] and output.exists()
+    assert cortador.probe_media(str(output))["duration"] == pytest.approx(3.0, abs=0.15)
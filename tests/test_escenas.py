@@ -0,0 +1,49 @@
+import cortador
+from conftest import lavfi_media, requires_ffmpeg
+
+
+class FakeCanvas:
+    def __init__(self, width, height=100):
+        self.width, self.height = width, height
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+
+def test_ajuste_al_limite_mas_cercano(monkeypatch):
+    monkeypatch.setattr(cortador, "waveform_canvas", FakeCanvas(1000))
+    monkeypatch.setattr(cortador, "waveform_current_file_duration", 100.0)
+    monkeypatch.setattr(cortador, "view_span_seconds", 0.0)
+    monkeypatch.setattr(cortador, "scene_boundaries", [10.0, 50.0])
+    monkeypatch.setattr(cortador, "jingle_matches", [(50.5, 0.9)])
+
+    assert cortador.snap_x_to_targets(97) == 100 # A 3 px del límite de 10 s
+    assert cortador.snap_x_to_targets(504) == 505 # El jingle (50.5 s) está más cerca que la escena
+    assert cortador.snap_x_to_targets(300) == 300 # Lejos de todo: no se ajusta
+
+
+def test_sin_archivo_no_hay_ajuste(monkeypatch):
+    monkeypatch.setattr(cortador, "waveform_canvas", FakeCanvas(1000))
+    monkeypatch.setattr(cortador, "waveform_current_file_duration", 0)
+    monkeypatch.setattr(cortador, "scene_boundaries", [1.0])
+
+    assert cortador.snap_x_to_targets(10) == 10
+
+
+@requires_ffmpeg
+def test_detecta_cortes_aunque_crucen_tramos_paralelos(tmp_path, monkeypatch):
+    video = lavfi_media(tmp_path / "escenas.mp4", "-f", "lavfi", "-i",
+                        "color=c=black:s=128x72:r=25:d=6,"
+                        "drawbox=x=0:y=0:w=iw:h=ih:color=white:t=fill:enable='between(t,2,4)'",
+                        "-c:v", "libx264", "-g", "1")
+    monkeypatch.setattr(cortador, "SCENE_MIN_CHUNK_SECONDS", 1.5) # Varios tramos: un corte cae en el borde
+    monkeypatch.setattr(cortador, "get_cache_path", lambda path, kind, ext: str(tmp_path / f"{kind}{ext}"))
+
+    boundaries = cortador.detect_scene_changes(video, 6.0, max_workers=2)
+
+    assert [round(b) for b in boundaries] == [2, 4]
+    # La segunda llamada sale de la caché
+    assert cortador.detect_scene_changes(video, 6.0, max_workers=2) == boundaries
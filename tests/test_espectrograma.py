@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+
+import cortador
+from conftest import pcm_stub
+
+RATE = cortador.SPECTROGRAM_SAMPLE_RATE
+
+
+def test_nivel_segun_segundos_por_pixel():
+    base = cortador.SPECTROGRAM_BASE_COLUMN_SECONDS
+    assert cortador.get_spectrogram_level(base / 2) == 0
+    assert cortador.get_spectrogram_level(base) == 0
+    assert cortador.get_spectrogram_level(base * 4) == 2
+    assert cortador.get_spectrogram_level(base * 5) == 2 # Columnas iguales o más finas que un píxel
+
+
+def test_mosaico_muestra_la_frecuencia_del_tono(monkeypatch):
+    seconds = np.arange(4 * RATE) / RATE
+    tone = (0.5 * np.sin(2 * np.pi * 2000 * seconds)).astype(np.float32)
+
+    def stream_pcm(file_path, sample_rate, channels=1, start_sec=None, duration_sec=None, **kwargs):
+        start = int((start_sec or 0) * sample_rate)
+        yield from pcm_stub({file_path: tone[start:]})(file_path, sample_rate)
+
+    monkeypatch.setattr(cortador, "stream_pcm", stream_pcm)
+
+    image = cortador.compute_spectrogram_tile("tono", 0, 0)
+
+    pixels = np.asarray(image)
+    assert pixels.shape == (cortador.SPECTROGRAM_FFT_SIZE // 2 + 1, cortador.SPECTROGRAM_TILE_COLUMNS, 3)
+    brightest_row = int(np.argmax(pixels.sum(axis=2).mean(axis=1)))
+    frequency = (pixels.shape[0] - 1 - brightest_row) * RATE / cortador.SPECTROGRAM_FFT_SIZE
+    assert abs(frequency - 2000) <= RATE / cortador.SPECTROGRAM_FFT_SIZE
+
+
+def test_cache_en_memoria_descarta_el_menos_usado(monkeypatch):
+    monkeypatch.setattr(cortador, "spectrogram_tile_cache", cortador.OrderedDict())
+    monkeypatch.setattr(cortador, "SPECTROGRAM_MEMORY_TILES", 2)
+    monkeypatch.setattr(cortador, "is_live_file", lambda path: True) # Sin caché de disco
+    for index in range(2):
+        cortador._remember_spectrogram_tile(("archivo", 0, index), f"imagen{index}")
+
+    assert cortador.get_spectrogram_tile("archivo", "archivo", 0, 0) == "imagen0" # Pasa a ser el más reciente
+    cortador._remember_spectrogram_tile(("archivo", 0, 2), "imagen2")
+
+    assert list(cortador.spectrogram_tile_cache) == [("archivo", 0, 0), ("archivo", 0, 2)]
+
+
+def test_cache_soporta_hilos_que_agregan_mientras_otro_recorre(monkeypatch):
+    monkeypatch.setattr(cortador, "spectrogram_tile_cache", cortador.OrderedDict())
+    monkeypatch.setattr(cortador, "SPECTROGRAM_MEMORY_TILES", 8)
+    errors = []
+
+    def add_tiles(worker):
+        for index in range(2000):
+            cortador._remember_spectrogram_tile((worker, 0, index), None)
+
+    def iterate_like_live_mode():
+        try:
+            for _ in range(2000):
+                with cortador._spectrogram_lock:
+                    [key for key in cortador.spectrogram_tile_cache if key[0] == 0]
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=add_tiles, args=(worker,)) for worker in range(3)]
+    threads.append(threading.Thread(target=iterate_like_live_mode))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cortador.spectrogram_tile_cache) == 8
@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+import cortador
+from conftest import StubWidget
+
+
+@pytest.fixture(autouse=True)
+def eventos_vacios(monkeypatch):
+    monkeypatch.setattr(cortador, "ui_events", {})
+
+
+def test_eventos_con_clave_se_combinan_y_respetan_el_orden():
+    applied = []
+    cortador.post_ui_event(applied.append, ("progreso", 10), key="trabajo")
+    cortador.post_ui_event(applied.append, "listo")
+    cortador.post_ui_event(applied.append, ("progreso", 40), key="trabajo")
+    master = StubWidget()
+
+    cortador.drain_ui_events(master)
+
+    assert applied == ["listo", ("progreso", 40)]
+    assert master.calls[-1][0] == "after" # Se vuelve a programar
+    cortador.drain_ui_events(master)
+    assert len(applied) == 2
+
+
+def test_un_error_no_detiene_los_demas_eventos():
+    applied = []
+    cortador.post_ui_event(lambda: 1 / 0)
+    cortador.post_ui_event(applied.append, "sigue")
+    cortador.drain_ui_events(StubWidget())
+    assert applied == ["sigue"]
+
+
+def test_se_puede_publicar_desde_varios_hilos():
+    applied = []
+    threads = [threading.Thread(target=lambda i=i: [cortador.post_ui_event(applied.append, (i, n), key=i)
+                                                    for n in range(200)]) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cortador.drain_ui_events(StubWidget())
+    assert sorted(applied) == [(i, 199) for i in range(4)]
@@ -0,0 +1,35 @@
+import cortador
+
+
+def test_expande_carpetas_a_archivos_de_medios(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("b.MP3", "a.wav", "notas.txt", "sub/c.mp4"):
+        (tmp_path / name).write_bytes(b"")
+    suelto = str(tmp_path / "suelto.mkv")
+
+    paths = cortador.expand_media_paths([str(tmp_path), suelto])
+
+    assert paths == [str(tmp_path / "a.wav"), str(tmp_path / "b.MP3"), str(tmp_path / "sub" / "c.mp4"), suelto]
+
+
+def test_ingesta_reutiliza_los_picos_del_catalogo(tmp_path, monkeypatch):
+    peaks_path = tmp_path / "picos.npz"
+    peaks_path.write_bytes(b"")
+    extracted = []
+    monkeypatch.setattr(cortador, "extract_channel_peaks", lambda *args, **kwargs: extracted.append(args))
+    monkeypatch.setattr(cortador, "get_media_info",
+                        lambda path: {"duration": 12.5, "channels": 2, "peaks_path": str(peaks_path)})
+
+    assert cortador.ingest_media_file("grabacion.wav") == {"duration": 12.5, "channels": 2}
+    assert extracted == []
+
+    peaks_path.unlink() # El artefacto registrado ya no está en disco: se recalcula
+    cortador.ingest_media_file("grabacion.wav")
+    assert extracted == [("grabacion.wav", 2)]
+
+
+def test_ingesta_sin_audio_no_calcula_picos(monkeypatch):
+    monkeypatch.setattr(cortador, "extract_channel_peaks", lambda *args, **kwargs: 1 / 0)
+    monkeypatch.setattr(cortador, "get_media_info", lambda path: {"duration": 3.0, "channels": 0})
+
+    assert cortador.ingest_media_file("mudo.mp4") == {"duration": 3.0, "channels": 0}
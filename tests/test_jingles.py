@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import cortador
+from conftest import pcm_stub
+
+RATE = cortador.PCM_ANALYSIS_SAMPLE_RATE
+
+
+def jingle(seconds=0.5, seed=1):
+    return np.random.default_rng(seed).uniform(-0.8, 0.8, int(seconds * RATE)).astype(np.float32)
+
+
+def test_localiza_cada_aparicion_del_jingle(monkeypatch):
+    reference = jingle()
+    target = np.random.default_rng(2).normal(0, 0.05, 20 * RATE).astype(np.float32)
+    for seconds in (3.0, 11.25):
+        start = int(seconds * RATE)
+        target[start:start + len(reference)] += reference
+    monkeypatch.setattr(cortador, "stream_pcm", pcm_stub({"ref": reference, "grabacion": target}))
+
+    matches = cortador.find_jingle_matches("ref", "grabacion")
+
+    assert [round(seconds, 2) for seconds, _ in matches] == [3.0, 11.25]
+    assert all(0.9 <= confidence <= 1.0 for _, confidence in matches)
+
+
+def test_sin_coincidencias_en_ruido(monkeypatch):
+    reference = jingle()
+    target = np.random.default_rng(3).normal(0, 0.3, 10 * RATE).astype(np.float32)
+    monkeypatch.setattr(cortador, "stream_pcm", pcm_stub({"ref": reference, "grabacion": target}))
+
+    assert cortador.find_jingle_matches("ref", "grabacion") == []
+
+
+def test_coincidencia_al_final_del_ultimo_bloque(monkeypatch):
+    reference = jingle()
+    target = np.zeros(5 * RATE, dtype=np.float32)
+    target[-len(reference):] = reference
+    monkeypatch.setattr(cortador, "stream_pcm", pcm_stub({"ref": reference, "grabacion": target}))
+
+    matches = cortador.find_jingle_matches("ref", "grabacion")
+
+    assert len(matches) == 1
+    assert matches[0][0] == pytest.approx(4.5, abs=1 / RATE)
+
+
+def test_referencia_en_silencio_es_un_error(monkeypatch):
+    monkeypatch.setattr(cortador, "stream_pcm", pcm_stub({"ref": np.zeros(RATE, dtype=np.float32),
+                                                          "grabacion": jingle()}))
+
+    with pytest.raises(ValueError):
+        cortador.find_jingle_matches("ref", "grabacion")
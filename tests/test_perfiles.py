@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import cortador
+
+
+@pytest.fixture(autouse=True)
+def sin_autoajuste(tmp_path, monkeypatch):
+    monkeypatch.setattr(cortador, "ENCODING_PROFILES_PATH", str(tmp_path / "perfiles.json"))
+    monkeypatch.setattr(cortador, "tuned_encoding_profiles", None)
+    monkeypatch.setattr(cortador, "DEFAULT_ENCODING_PROFILE", None)
+
+
+def test_precedencia_del_perfil(tmp_path, monkeypatch):
+    assert cortador.resolve_encoding_profile(".mp3") == "equilibrado"
+    (tmp_path / "perfiles.json").write_text(json.dumps({"perfiles": {".mp3": "rapido"}}), encoding="utf-8")
+    monkeypatch.setattr(cortador, "tuned_encoding_profiles", None)
+    assert cortador.resolve_encoding_profile(".mp3") == "rapido"
+    assert cortador.resolve_encoding_profile(".aac") == "equilibrado"
+    monkeypatch.setattr(cortador, "DEFAULT_ENCODING_PROFILE", "calidad")
+    assert cortador.resolve_encoding_profile(".mp3") == "calidad"
+    assert cortador.resolve_encoding_profile(".mp3", "rapido") == "rapido"
+    assert cortador.resolve_encoding_profile(".mp3", "inexistente") == "equilibrado"
+
+
+def test_perfiles_guardados_ilegibles(tmp_path):
+    (tmp_path / "perfiles.json").write_text("{roto", encoding="utf-8")
+    assert cortador.resolve_encoding_profile(".mp3") == "equilibrado"
+
+
+def test_argumentos_de_codec(monkeypatch):
+    monkeypatch.setattr(cortador.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(cortador, "CUT_WORKERS", 2)
+    assert cortador.get_reencode_codec_args(".mp3", "calidad") == cortador.ENCODING_PROFILES[".mp3"]["calidad"]
+    assert cortador.get_reencode_codec_args(".mp4", "rapido")[-2:] == ['-threads', '4'] # Núcleos por trabajador
+    assert cortador.get_output_codec_args(".mp4", "calidad") == ['-c:v', 'copy', '-c:a', 'copy']
+    with pytest.raises(ValueError):
+        cortador.get_reencode_codec_args(".ogg")
+
+
+def test_autoajuste_elige_el_mas_rapido_que_cumple(tmp_path, monkeypatch):
+    sizes = {"rapido": 96, "equilibrado": 192, "calidad": 320} # kbps de cada perfil
+    speeds = {"rapido": 0.1, "equilibrado": 0.2, "calidad": 0.5}
+    monkeypatch.setattr(cortador, "AUTOTUNE_SOURCES", {".mp3": "ruido_estereo_60s"})
+    monkeypatch.setattr(cortador, "generate_benchmark_media", lambda spec: "fuente.wav")
+
+    def run_ffmpeg_quiet(cmd):
+        profile = next(name for name in sizes if cortador.get_reencode_codec_args(".mp3", name) == cmd[8:-1])
+        with open(cmd[-1], "wb") as f:
+            f.write(b"x" * (sizes[profile] * 1000 // 8 * cortador.AUTOTUNE_SECONDS))
+        return profile
+
+    monkeypatch.setattr(cortador, "run_ffmpeg_quiet", run_ffmpeg_quiet)
+    monkeypatch.setattr(cortador, "time_benchmark", lambda function, repeats: ([speeds[function()]], None))
+
+    assert cortador.run_autotune(min_audio_kbps=128, repeats=1) == 0
+
+    assert cortador.tuned_encoding_profiles == {".mp3": "equilibrado"}
+    with open(cortador.ENCODING_PROFILES_PATH, encoding="utf-8") as f:
+        assert json.load(f)["perfiles"] == {".mp3": "equilibrado"}
+    assert cortador.resolve_encoding_profile(".mp3") == "equilibrado"
@@ -0,0 +1,61 @@
+import numpy as np
+
+import cortador
+
+RATE = cortador.PCM_ANALYSIS_SAMPLE_RATE
+BIN = RATE // cortador.PEAKS_PER_SECOND
+
+
+def stereo(seconds):
+    frames = int(seconds * RATE)
+    left = np.linspace(-1, 1, frames, dtype=np.float32)
+    right = np.full(frames, 0.25, dtype=np.float32)
+    return np.column_stack((left, right))
+
+
+def chunked(signal, size):
+    for start in range(0, len(signal), size):
+        yield signal[start:start + size].ravel() # Intercalado, como lo entrega FFmpeg
+
+
+def test_bins_por_canal_independientes_del_tamano_de_bloque():
+    signal = stereo(1.01) # El último bin queda incompleto
+    expected = cortador._reduce_channel_peaks(chunked(signal, len(signal)), 2)
+    for size in (7, BIN, 3 * BIN + 1):
+        peaks = cortador._reduce_channel_peaks(chunked(signal, size), 2)
+        for name in ("mins", "maxs", "rms"):
+            np.testing.assert_allclose(peaks[name], expected[name], rtol=1e-6)
+
+    assert expected["maxs"].shape == (cortador.PEAKS_PER_SECOND + 1, 2)
+    np.testing.assert_allclose(expected["maxs"][:, 1], 0.25)
+    np.testing.assert_allclose(expected["rms"][:, 1], 0.25, rtol=1e-6)
+    assert expected["mins"][0, 0] == -1.0
+    assert expected["maxs"][-1, 0] == 1.0
+
+
+def test_sin_audio_retorna_arrays_vacios():
+    peaks = cortador._reduce_channel_peaks(iter(()), 3)
+    assert peaks["maxs"].shape == (0, 3)
+
+
+def test_extender_solo_decodifica_la_parte_nueva(monkeypatch):
+    signal = stereo(3)
+    recorded = {"available": 2 * RATE}
+    starts = []
+
+    def stream_pcm(file_path, sample_rate, channels=1, start_sec=None, **kwargs):
+        starts.append(start_sec)
+        first = int(round((start_sec or 0) * sample_rate))
+        yield from chunked(signal[first:recorded["available"]], RATE // 3)
+
+    monkeypatch.setattr(cortador, "stream_pcm", stream_pcm)
+    peaks = {"path": "vivo", "channels": 2}
+    peaks.update(cortador._reduce_channel_peaks(stream_pcm("vivo", RATE, 2), 2))
+
+    recorded["available"] = len(signal)
+    extended = cortador.extend_channel_peaks(peaks)
+
+    full = cortador._reduce_channel_peaks(chunked(signal, len(signal)), 2)
+    assert starts[-1] == (len(peaks["maxs"]) - 1) / cortador.PEAKS_PER_SECOND
+    for name in ("mins", "maxs", "rms"):
+        np.testing.assert_allclose(extended[name], full[name], rtol=1e-6)
@@ -0,0 +1,36 @@
+import cortador
+from conftest import lavfi_media, requires_ffmpeg
+
+
+def test_artefactos_faltantes_segun_el_tipo_de_medio(tmp_path):
+    peaks = tmp_path / "picos.npz"
+    peaks.write_bytes(b"")
+    audio = {"channels": 2, "video_codec": None, "peaks_path": str(peaks)}
+    video = {"channels": 0, "video_codec": "h264", "keyframes_path": str(tmp_path / "borrado.json"),
+             "thumbnail_path": None}
+
+    assert cortador.missing_artifacts(None) == ["probe", "peaks_path", "keyframes_path", "thumbnail_path"]
+    assert cortador.missing_artifacts(audio) == []
+    assert cortador.missing_artifacts(video) == ["keyframes_path", "thumbnail_path"]
+
+
+@requires_ffmpeg
+def test_precalculo_completo_y_reanudable(tmp_path):
+    media_dir = tmp_path / "medios"
+    media_dir.mkdir()
+    lavfi_media(media_dir / "tono.wav", "-f", "lavfi", "-i", "sine=frequency=440:duration=2")
+    lavfi_media(media_dir / "video.mp4", "-f", "lavfi", "-i", "testsrc=size=160x90:rate=10:duration=2",
+                "-f", "lavfi", "-i", "sine=duration=2", "-c:v", "libx264", "-g", "5", "-shortest")
+    (media_dir / "notas.txt").write_text("no es un medio")
+
+    assert len(cortador.find_pending_media(str(media_dir))) == 2
+    assert cortador.run_precompute(str(media_dir), workers=2, io_limit=1) == 0
+
+    assert cortador.find_pending_media(str(media_dir)) == []
+    video = cortador.catalog_get_media(str(media_dir / "video.mp4"))
+    assert all(video[column] for column in ("peaks_path", "keyframes_path", "thumbnail_path"))
+    with open(video["keyframes_path"], encoding="utf-8") as f:
+        assert f.read().startswith("[0.0, 0.5")
+
+    lavfi_media(media_dir / "tono.wav", "-f", "lavfi", "-i", "sine=frequency=880:duration=3")
+    assert cortador.find_pending_media(str(media_dir)) == [str(media_dir / "tono.wav")]
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import cortador
+
+BLOCK = 1024
+DATA = bytes(range(256)) * 80 # 20 KiB = 20 bloques
+
+
+class OrigenConRangos(BaseHTTPRequestHandler):
+    """Servidor de origen mínimo con peticiones por rango; anota cada rango que recibe."""
+    protocol_version = "HTTP/1.1"
+    requests = []
+    truncate_after = None # Si se indica, corta las respuestas de más de un byte tras esa cantidad
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        start, end = cortador.parse_byte_range(self.headers["Range"], len(DATA))
+        self.requests.append((start, end))
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        if self.truncate_after is not None and end > start:
+            self.wfile.write(DATA[start:start + self.truncate_after])
+            self.close_connection = True
+            return
+        self.wfile.write(DATA[start:end + 1])
+
+
+@pytest.fixture
+def origen(tmp_path, monkeypatch):
+    monkeypatch.setattr(cortador, "RANGE_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setattr(cortador, "RANGE_BLOCK_SIZE", BLOCK)
+    monkeypatch.setattr(cortador, "RANGE_READAHEAD_BLOCKS", 4)
+    monkeypatch.setattr(cortador, "remote_sources", {})
+    OrigenConRangos.requests = []
+    OrigenConRangos.truncate_after = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OrigenConRangos)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/medio.mp4"
+    server.shutdown()
+    server.server_close()
+
+
+def pedir(url, range_header=None):
+    """Retorna (estado, encabezados, cuerpo) de un GET al proxy, incluso si responde con error."""
+    request = urllib.request.Request(url, headers={"Range": range_header} if range_header else {})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_interpretar_rangos():
+    assert cortador.parse_byte_range("", 100) is None
+    assert cortador.parse_byte_range("bytes=10-19", 100) == (10, 19)
+    assert cortador.parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert cortador.parse_byte_range("bytes=50-500", 100) == (50, 99)
+    assert cortador.parse_byte_range("bytes=-30", 100) == (70, 99)
+    assert cortador.parse_byte_range("bytes=-300", 100) == (0, 99)
+    assert cortador.parse_byte_range("bytes=-0", 100)[0] >= 100 # Sufijo vacío: no satisfacible
+    for malformed in ("bytes=-", "bytes=abc-", "bytes=5-2", "bytes=1-x"):
+        with pytest.raises(ValueError):
+            cortador.parse_byte_range(malformed, 100)
+
+
+def test_rango_sin_cachear_se_descarga_y_luego_sale_de_la_cache(origen):
+    proxy_url = cortador.local_media_input(origen)
+    OrigenConRangos.requests.clear() # Sin el pedido de un byte que lee el tamaño
+
+    status, headers, body = pedir(proxy_url, "bytes=1500-2499")
+    assert status == 206 and body == DATA[1500:2500]
+    assert headers["Content-Range"] == f"bytes 1500-2499/{len(DATA)}"
+    assert OrigenConRangos.requests == [(1024, 3071)] # Bloques completos, sin pasar del rango pedido
+
+    assert pedir(proxy_url, "bytes=1100-2000")[2] == DATA[1100:2001]
+    assert len(OrigenConRangos.requests) == 1
+
+
+def test_lectura_abierta_adelanta_bloques(origen):
+    proxy_url = cortador.local_media_input(origen)
+    OrigenConRangos.requests.clear()
+
+    status, _, body = pedir(proxy_url, "bytes=0-")
+    assert status == 206 and body == DATA
+    assert OrigenConRangos.requests == [(start, start + 4 * BLOCK - 1) for start in range(0, len(DATA), 4 * BLOCK)]
+
+    status, _, body = pedir(proxy_url) # Todo en caché: sin nuevos pedidos al origen
+    assert status == 200 and body == DATA
+    assert len(OrigenConRangos.requests) == 5
+
+
+def test_respuesta_cortada_no_queda_en_cache(origen):
+    proxy_url = cortador.local_media_input(origen)
+    source = cortador.remote_sources[cortador.hashlib.sha1(origen.encode()).hexdigest()]
+    OrigenConRangos.truncate_after = 500
+
+    with pytest.raises(OSError):
+        source.read(0, BLOCK, BLOCK - 1)
+    assert not any(source.blocks)
+    with open(source.meta_path, encoding="utf-8") as f:
+        assert not any(bytes.fromhex(json.load(f)["bloques"]))
+
+    OrigenConRangos.truncate_after = None
+    OrigenConRangos.requests.clear()
+    assert pedir(proxy_url, "bytes=0-2047")[2] == DATA[:2048] # Se vuelve a pedir al origen, sin ceros
+    assert OrigenConRangos.requests == [(0, 2047)]
+
+
+def test_sufijos_y_rangos_invalidos(origen):
+    proxy_url = cortador.local_media_input(origen)
+
+    status, _, body = pedir(proxy_url, "bytes=-100")
+    assert status == 206 and body == DATA[-100:]
+    assert pedir(proxy_url, "bytes=-")[0] == 400
+    assert pedir(proxy_url, "bytes=9-3")[0] == 400
+    status, headers, _ = pedir(proxy_url, f"bytes={len(DATA)}-")
+    assert status == 416 and headers["Content-Range"] == f"bytes */{len(DATA)}"
+    assert pedir(proxy_url, "bytes=0-9")[2] == DATA[:10] # El proxy sigue atendiendo
+
+
+def test_desalojo_de_origenes_no_usados(origen):
+    cortador.local_media_input(origen)
+    source = cortador.remote_sources[cortador.hashlib.sha1(origen.encode()).hexdigest()]
+    source.ensure(0, 19)
+    stale = os.path.join(cortador.RANGE_CACHE_DIR, "viejo")
+    with open(stale + ".json", "w", encoding="utf-8") as f:
+        f.write('{"bytes_en_cache": 4096}')
+    open(stale + ".datos", "wb").close()
+    os.utime(stale + ".json", (0, 0)) # Usado hace más tiempo
+
+    cortador.evict_range_cache(max_bytes=len(DATA))
+
+    assert not os.path.exists(stale + ".json") and not os.path.exists(stale + ".datos")
+    assert os.path.exists(source.meta_path) # En uso en esta sesión: no se borra aunque supere el límite
+    cortador.evict_range_cache(max_bytes=0)
+    assert os.path.exists(source.data_path)
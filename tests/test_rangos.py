@@ -0,0 +1,41 @@
+import cortador
+
+
+class FakeEntry:
+    def __init__(self, text):
+        self.text = text
+
+    def get(self):
+        return self.text
+
+
+def seleccion(monkeypatch, start, end, extra):
+    monkeypatch.setattr(cortador, "entry_start_time", FakeEntry(start))
+    monkeypatch.setattr(cortador, "entry_end_time", FakeEntry(end))
+    monkeypatch.setattr(cortador, "extra_selection_ranges", list(extra))
+
+
+def test_rangos_se_ordenan_y_se_unen_los_solapados(monkeypatch):
+    seleccion(monkeypatch, "00:00:10", "00:00:20", [(30.0, 40.0), (15.0, 25.0), (1.0, 2.0)])
+    assert cortador.get_selected_ranges() == [(1.0, 2.0), (10.0, 25.0), (30.0, 40.0)]
+
+
+def test_seleccion_principal_invalida_se_ignora(monkeypatch):
+    seleccion(monkeypatch, "00:00:20", "00:00:10", [(5.0, 6.0)])
+    assert cortador.get_selected_ranges() == [(5.0, 6.0)]
+    seleccion(monkeypatch, "no es un tiempo", "00:00:10", [])
+    assert cortador.get_selected_ranges() == []
+
+
+def test_exportar_la_seleccion_arma_un_rango_por_tramo(tmp_path, monkeypatch):
+    media = tmp_path / "a.wav"
+    media.write_bytes(b"x")
+    seleccion(monkeypatch, "00:00:00", "00:00:02", [(4.0, 5.0)])
+    monkeypatch.setattr(cortador, "entry_file_path", FakeEntry(str(media)))
+    exported = []
+    monkeypatch.setattr(cortador, "export_ranges", lambda ranges, title, description: exported.append(ranges))
+
+    cortador.export_selected_ranges()
+
+    assert [(item["source"], item["start"], item["end"]) for item in exported[0]] == [
+        (str(media), 0.0, 2.0), (str(media), 4.0, 5.0)]
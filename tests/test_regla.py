@@ -0,0 +1,53 @@
+import pytest
+
+import cortador
+
+
+@pytest.fixture(autouse=True)
+def cache_vacia(monkeypatch):
+    monkeypatch.setattr(cortador, "ruler_tile_cache", cortador.OrderedDict())
+
+
+def test_etiquetas():
+    assert cortador.format_ruler_label(75.0, False, False) == "01:15"
+    assert cortador.format_ruler_label(3725.0, False, False) == "62:05"
+    assert cortador.format_ruler_label(3725.0, True, False) == "01:02:05"
+    assert cortador.format_ruler_label(1.25, False, True) == "00:01.2"
+    assert cortador.format_ruler_label(59.96, False, True) == "01:00.0" # El redondeo lleva al minuto siguiente
+
+
+@pytest.mark.parametrize("view_span, width, long_format, step", [
+    (10, 1000, False, 1),         # 100 px/s: 50 px no alcanzan para "00:00.0"
+    (600, 1000, False, 30),
+    (7200, 1000, True, 600),
+    (10 ** 7, 1000, True, 21600), # Más allá del paso mayor se usa el último
+])
+def test_paso_segun_el_zoom(view_span, width, long_format, step):
+    assert cortador.choose_ruler_step(view_span, width, long_format)[0] == step
+
+
+def test_pasos_elegidos_no_superponen_etiquetas():
+    for view_span in (1, 7, 45, 300, 3000, 30000):
+        for long_format in (False, True):
+            step, _ = cortador.choose_ruler_step(view_span, 800, long_format)
+            chars = (8 if long_format else 5) + (2 if step < 1 else 0)
+            if step != cortador.RULER_STEPS[-1][0]:
+                assert step * 800 / view_span >= chars * cortador.RULER_CHAR_PIXELS
+
+
+def test_mosaicos_contiguos_y_reutilizados():
+    first = cortador.get_ruler_tile(10, 5, False, 0)
+    second = cortador.get_ruler_tile(10, 5, False, 1)
+    assert len(first) == cortador.RULER_TILE_MARKS * 5
+    assert first[0] == (0.0, "00:00") and first[1] == (2.0, None)
+    assert second[0][0] == pytest.approx(first[-1][0] + 2.0)
+    assert cortador.get_ruler_tile(10, 5, False, 0) is first
+
+
+def test_cache_de_mosaicos_limitada(monkeypatch):
+    monkeypatch.setattr(cortador, "RULER_TILE_CACHE_SIZE", 3)
+    tiles = [cortador.get_ruler_tile(1, 5, False, index) for index in range(3)]
+    cortador.get_ruler_tile(1, 5, False, 0) # El mosaico 0 pasa a ser el más reciente
+    cortador.get_ruler_tile(1, 5, False, 3)
+    assert list(cortador.ruler_tile_cache) == [(1, False, 2), (1, False, 0), (1, False, 3)]
+    assert cortador.get_ruler_tile(1, 5, False, 0) is tiles[0]
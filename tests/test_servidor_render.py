@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import cortador
+from conftest import lavfi_media, requires_ffmpeg
+
+TOKEN = "secreto-de-prueba"
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    """Servidor de render en 127.0.0.1 sin trabajadores locales: los trabajos solo los toma un trabajador remoto."""
+    media_root = tmp_path / "medios"
+    media_root.mkdir()
+    monkeypatch.setattr(cortador, "render_token", TOKEN)
+    monkeypatch.setattr(cortador, "render_media_root", str(media_root))
+    monkeypatch.setattr(cortador, "RENDER_OUTPUT_DIR", str(tmp_path / "render"))
+    monkeypatch.setattr(cortador, "RENDER_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(cortador, "render_jobs", {})
+    monkeypatch.setattr(cortador, "render_leases", {})
+    monkeypatch.setattr(cortador, "active_jobs", {})
+    monkeypatch.setattr(cortador, "cut_job_queue", cortador.queue.PriorityQueue())
+    monkeypatch.setattr(cortador, "start_cut_workers", lambda num_workers=cortador.CUT_WORKERS: None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), cortador._create_render_handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", media_root
+    server.shutdown()
+    server.server_close()
+
+
+def estado(url, authorization=None):
+    request = urllib.request.Request(url + "/estado", headers={"Authorization": authorization} if authorization else {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_sin_token_valido_no_se_atiende(servidor, monkeypatch):
+    url, _ = servidor
+    assert estado(url) == 401
+    assert estado(url, "Bearer otro") == 401
+    assert estado(url, f"Bearer {TOKEN}") == 200
+    monkeypatch.setattr(cortador, "render_token", None) # Sin token configurado no se acepta ningún pedido
+    assert estado(url, "Bearer None") == 401 and estado(url) == 401
+
+
+def test_origenes_y_filtros_no_permitidos(servidor, tmp_path):
+    url, media_root = servidor
+    outside = tmp_path / "fuera.wav"
+    outside.write_bytes(b"x")
+    (media_root / "enlace.wav").symlink_to(outside)
+    for origin in (str(outside), "../fuera.wav", "enlace.wav", "no_existe.wav"):
+        status, reply = cortador.render_api_request(url, "POST", "/trabajos",
+                                                    {"origen": origin, "inicio": 0, "fin": 1})
+        assert status == 400 and "carpeta de medios" in reply["error"]
+
+    (media_root / "a.wav").write_bytes(b"x")
+    status, reply = cortador.render_api_request(url, "POST", "/trabajos", {
+        "tipo": "lista", "rangos": [{"origen": "a.wav", "inicio": 0, "fin": 1, "filtros_audio": "volume=2"}]})
+    assert status == 400 and "filtros" in reply["error"]
+
+
+@requires_ffmpeg
+def test_ida_y_vuelta_con_trabajador_remoto(servidor, tmp_path):
+    url, media_root = servidor
+    lavfi_media(media_root / "tono.wav", "-f", "lavfi", "-i", "sine=frequency=440:duration=4")
+    output = tmp_path / "cliente" / "corte.mp3"
+    output.parent.mkdir()
+    done = threading.Event()
+    result = {}
+
+    def on_done(job, error):
+        result.update(job=job, error=error)
+        done.set()
+
+    job = cortador.submit_remote_cut_job(url, "tono.wav", 1, 3, str(output), on_done=on_done)
+    deadline = time.monotonic() + 10
+    while job["id"] is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    status, reply = cortador.render_api_request(url, "GET", f"/trabajos/{job['id']}")
+    assert status == 200 and reply["estado"] == "en_cola"
+
+    # Un trabajador remoto toma el trabajo, lo corta en su máquina y sube el resultado
+    status, claim = cortador.render_api_request(url, "POST", "/asignaciones", {"trabajador": "prueba", "espera": 5})
+    assert status == 200 and claim["trabajo"]["input"] == str((media_root / "tono.wav").resolve())
+    cortador._run_claimed_job(url, claim["asignacion"], claim["trabajo"], str(tmp_path))
+
+    assert done.wait(15) and result["error"] is None
+    assert cortador.probe_media(str(output))["duration"] == pytest.approx(2.0, abs=0.15)
+    assert os.listdir(cortador.RENDER_OUTPUT_DIR) == [] # Descargado: el cliente lo borró del servidor
+
+
+def test_cancelar_un_trabajo_en_cola(servidor):
+    url, media_root = servidor
+    (media_root / "a.wav").write_bytes(b"x")
+    status, reply = cortador.render_api_request(url, "POST", "/trabajos", {"origen": "a.wav", "inicio": 0, "fin": 1})
+    assert status == 201
+
+    assert cortador.render_api_request(url, "DELETE", f"/trabajos/{reply['id']}") == (
+        200, {"id": reply["id"], "cancelado": True})
+    status, _ = cortador.render_api_request(url, "POST", "/asignaciones", {"trabajador": "prueba", "espera": 0.2})
+    assert status == 204 # El trabajo cancelado no se entrega a ningún trabajador
+    assert cortador.render_api_request(url, "GET", f"/trabajos/{reply['id']}")[1]["estado"] == "cancelado"
+
+    request = urllib.request.Request(f"{url}/trabajos/{reply['id']}/resultado",
+                                     headers=cortador.render_auth_headers())
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request, timeout=5)
+    assert error.value.code == 409
+
+
+def test_el_servidor_no_arranca_sin_token(monkeypatch, capsys):
+    monkeypatch.setattr(cortador, "render_token", None)
+    assert cortador.run_render_server("127.0.0.1:0") == 1
+    assert cortador.RENDER_TOKEN_ENV in capsys.readouterr().out
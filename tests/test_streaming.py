@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+import cortador
+from conftest import lavfi_media, requires_ffmpeg
+
+
+def test_carpeta_de_segmentos_junto_a_la_lista(tmp_path):
+    assert cortador.streaming_segments_dir(str(tmp_path / "clip.m3u8")) == str(tmp_path / "clip_hls")
+    assert cortador.streaming_segments_dir(str(tmp_path / "clip.MPD")) == str(tmp_path / "clip_dash")
+
+
+def test_solo_se_recodifican_los_flujos_incompatibles():
+    args, copied = cortador.get_streaming_codec_args(".m3u8", {"video_codec": "h264", "audio_codec": "mp3"})
+    assert copied and args == ['-c:v', 'copy', '-c:a', 'copy']
+
+    args, copied = cortador.get_streaming_codec_args(".mpd", {"video_codec": "h264", "audio_codec": "mp3"})
+    assert not copied and args[:2] == ['-c:v', 'copy'] and args[args.index('-c:a') + 1] == "aac"
+
+    args, copied = cortador.get_streaming_codec_args(".m3u8", {"video_codec": "mpeg4", "audio_codec": "aac"})
+    assert not copied and "libx264" in args and "-force_key_frames" in args and args[-2:] == ['-c:a', 'copy']
+
+    args, _ = cortador.get_streaming_codec_args(".m3u8", {"video_codec": None, "audio_codec": "aac"})
+    assert args == ['-vn', '-c:a', 'copy']
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("extension, segment_glob", [(".m3u8", ".ts"), (".mpd", ".m4s")])
+def test_paquete_completo_y_sin_restos(tmp_path, extension, segment_glob):
+    source = lavfi_media(tmp_path / "clip.mp4", "-f", "lavfi", "-i", "testsrc=size=64x48:rate=10:duration=14",
+                         "-f", "lavfi", "-i", "sine=duration=14", "-c:v", "libx264", "-g", "10",
+                         "-c:a", "aac", "-shortest")
+    output = str(tmp_path / "web" / ("clip" + extension))
+    os.makedirs(os.path.dirname(output))
+
+    result = cortador.process_video(source, 0, 13, output, lambda p: None)
+
+    assert result == output and os.path.exists(output)
+    segments = os.listdir(cortador.streaming_segments_dir(output))
+    assert len([name for name in segments if name.endswith(segment_glob)]) >= 2
+    assert sorted(os.listdir(os.path.dirname(output))) == sorted(
+        [os.path.basename(output), os.path.basename(cortador.streaming_segments_dir(output))])
+    with open(output, encoding="utf-8") as f:
+        playlist = f.read()
+    assert "clip_" in playlist # Los segmentos se referencian en su carpeta
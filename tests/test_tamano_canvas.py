@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+
+import cortador
+from conftest import StubWidget
+
+
+class CanvasSinWinfo(StubWidget):
+    """Canvas cuyo tamaño solo se conoce por <Configure>: consultar winfo hace fallar la prueba."""
+
+    def winfo_width(self):
+        raise AssertionError("winfo_width consultado en un evento")
+
+    winfo_height = winfo_width
+
+
+@pytest.fixture
+def canvas(monkeypatch):
+    canvas = CanvasSinWinfo()
+    monkeypatch.setattr(cortador, "canvas_sizes", {})
+    monkeypatch.setattr(cortador, "waveform_canvas", None) # request_redraw no programa nada
+    cortador.on_timeline_configure(SimpleNamespace(widget=canvas, width=1000, height=80), "onda")
+    monkeypatch.setattr(cortador, "waveform_canvas", canvas)
+    monkeypatch.setattr(cortador, "waveform_current_file_duration", 100.0)
+    monkeypatch.setattr(cortador, "view_span_seconds", 0.0)
+    return canvas
+
+
+def test_ajuste_usa_el_tamano_guardado(canvas, monkeypatch):
+    monkeypatch.setattr(cortador, "scene_boundaries", [10.0])
+    monkeypatch.setattr(cortador, "jingle_matches", [])
+    assert cortador.snap_x_to_targets(97) == 100
+
+
+def test_dibujos_usan_el_tamano_guardado(canvas, monkeypatch):
+    monkeypatch.setattr(cortador, "extra_selection_ranges", [(10.0, 20.0)])
+    cortador.draw_extra_selections(canvas)
+    assert ("create_rectangle", (100, 0, 200, 80)) in [(name, args) for name, args, _ in canvas.calls]
+
+    monkeypatch.setattr(cortador, "waveform_peaks", None)
+    monkeypatch.setattr(cortador, "waveform_start_line", None)
+    for name in ("selected_start_time_label", "selected_end_time_label", "entry_start_time", "entry_end_time"):
+        monkeypatch.setattr(cortador, name, StubWidget())
+    cortador.draw_waveform(canvas, 100.0)
+    monkeypatch.setattr(cortador, "scene_boundaries", [50.0])
+    cortador.draw_scene_markers(canvas, 100.0)
+    monkeypatch.setattr(cortador, "jingle_matches", [(50.0, 0.9)])
+    cortador.draw_jingle_markers(canvas, 100.0)
@@ -0,0 +1,64 @@
+import json
+import threading
+
+import pytest
+
+import cortador
+
+
+@pytest.fixture(autouse=True)
+def trazas_limpias(monkeypatch):
+    monkeypatch.setattr(cortador, "TRACE_ENABLED", False)
+    cortador.clear_traces()
+    yield
+    cortador.clear_traces()
+
+
+def test_apagadas_no_registran_nada():
+    assert cortador.trace_span("corte") is cortador.NULL_TRACE_SPAN
+    with cortador.trace_span("corte"):
+        pass
+    assert list(cortador.trace_events) == []
+
+
+def test_tramos_y_decorador_registran_la_etapa():
+    @cortador.traced("prueba.funcion")
+    def doble(x):
+        return 2 * x
+
+    cortador.set_tracing(True)
+    with cortador.trace_span("prueba.bloque", formato=".mp3"):
+        assert doble(4) == 8
+    names = [(event[0], event[4]) for event in cortador.trace_events]
+    assert names == [("prueba.funcion", None), ("prueba.bloque", {"formato": ".mp3"})]
+
+
+def test_percentiles_por_etapa():
+    for ms in range(1, 101):
+        cortador.record_trace("etapa", 0, ms * 1_000_000)
+    [(name, count, p50, p95, maximum)] = cortador.trace_percentiles()
+    assert (name, count, maximum) == ("etapa", 100, 100.0)
+    assert p50 == pytest.approx(50.5) and p95 == pytest.approx(95.05)
+
+
+def test_ventana_de_estadisticas_limitada():
+    cortador.record_trace("etapa", 0, 1)
+    cortador.trace_stats["etapa"] = cortador.deque(maxlen=3)
+    for duration in (10, 20, 30, 40):
+        cortador.record_trace("etapa", 0, duration)
+    assert list(cortador.trace_stats["etapa"]) == [20, 30, 40]
+
+
+def test_exportacion_en_formato_de_chrome(tmp_path):
+    thread = threading.Thread(target=cortador.record_trace, args=("ui.evento", 5_000, 2_000), name="Trabajador")
+    thread.start()
+    thread.join()
+    path = tmp_path / "trazas" / "salida.json"
+
+    assert cortador.export_trace(str(path)) == 1
+
+    trace = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    [event] = [event for event in trace if event["ph"] == "X"]
+    [metadata] = [item for item in trace if item["ph"] == "M" and item["tid"] == event["tid"]]
+    assert metadata["args"]["name"] == "Trabajador"
+    assert (event["cat"], event["ts"], event["dur"]) == ("ui", 5.0, 2.0)
@@ -0,0 +1,115 @@
+import json
+import os
+
+import pytest
+
+import cortador
+
+
+def write_rules(path, rules):
+    path.write_text(json.dumps(rules), encoding="utf-8")
+
+
+def test_reglas_de_carpeta_y_sidecar_se_combinan(tmp_path):
+    (tmp_path / "noticias").mkdir()
+    write_rules(tmp_path / "cortador.json", {"formatos": [".mp3"], "inicio": 5})
+    write_rules(tmp_path / "noticias" / "cortador.json", {"inicio": 10, "subcarpeta": "{fecha}"})
+    media = tmp_path / "noticias" / "nota.wav"
+    write_rules(tmp_path / "noticias" / "nota.cortador.json", {"fin": "00:01:00"})
+
+    rules = cortador.find_watch_rules(str(media), str(tmp_path))
+
+    assert rules == {"formatos": [".mp3"], "inicio": 10, "subcarpeta": "{fecha}", "fin": "00:01:00"}
+
+
+def test_plan_de_cortes(tmp_path):
+    media = tmp_path / "sub" / "nota.wav"
+    media.parent.mkdir()
+    media.write_bytes(b"")
+    os.utime(media, (0, 86400 * 365))
+    rules = {"inicio": "00:00:05", "recortar_final": 2, "formatos": ["mp3", ".AAC"], "nombre": "{nombre}_{formato}",
+             "subcarpeta": "{fecha}"}
+
+    cuts = cortador.plan_watch_cuts(str(media), str(tmp_path), "/salida", rules, 60.0)
+
+    date = cortador.time.strftime("%Y%m%d", cortador.time.localtime(86400 * 365))
+    assert cuts == [(5.0, 58.0, f"/salida/sub/{date}/nota_mp3.mp3"), (5.0, 58.0, f"/salida/sub/{date}/nota_aac.aac")]
+    with pytest.raises(ValueError):
+        cortador.plan_watch_cuts(str(media), str(tmp_path), "/salida", {"inicio": 70}, 60.0)
+
+
+def test_carpeta_hermana_no_cuenta_como_salida(tmp_path):
+    assert cortador.path_is_within(str(tmp_path / "out" / "a.mp3"), str(tmp_path / "out"))
+    assert cortador.path_is_within(str(tmp_path / "out"), str(tmp_path / "out"))
+    assert not cortador.path_is_within(str(tmp_path / "out2" / "a.mp3"), str(tmp_path / "out"))
+
+
+def stable_candidate(path):
+    stat = os.stat(path)
+    return {str(path): (stat.st_size, stat.st_mtime_ns, 0.0)}
+
+
+def test_archivo_sin_reglas_se_reintenta_y_no_queda_procesado(tmp_path, monkeypatch):
+    media = tmp_path / "nota.wav"
+    media.write_bytes(b"audio")
+    results = [None, RuntimeError("ffprobe falló"), 1]
+    calls = []
+
+    def handle_watched_file(path, root, output_root):
+        calls.append(path)
+        result = results[len(calls) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(cortador, "handle_watched_file", handle_watched_file)
+    candidates, handled = stable_candidate(media), set()
+    now = 100.0
+
+    cortador.process_watch_candidates(candidates, handled, str(tmp_path), str(tmp_path / "out"), now)
+    assert handled == set() and str(media) in candidates
+    cortador.process_watch_candidates(candidates, handled, str(tmp_path), str(tmp_path / "out"), now + 1)
+    assert len(calls) == 1 # Todavía no pasó WATCH_RETRY_SECONDS
+
+    now += cortador.WATCH_RETRY_SECONDS
+    cortador.process_watch_candidates(candidates, handled, str(tmp_path), str(tmp_path / "out"), now)
+    assert len(calls) == 2 and handled == set() # Falló: se reintentará
+
+    now += cortador.WATCH_RETRY_SECONDS
+    cortador.process_watch_candidates(candidates, handled, str(tmp_path), str(tmp_path / "out"), now)
+    assert len(calls) == 3 and len(handled) == 1 and candidates == {}
+
+
+def test_archivo_procesado_no_se_repite_hasta_que_cambia(tmp_path, monkeypatch):
+    media = tmp_path / "nota.wav"
+    media.write_bytes(b"audio")
+    calls = []
+    monkeypatch.setattr(cortador, "handle_watched_file", lambda path, root, out: calls.append(path) or 1)
+    handled = set()
+
+    cortador.process_watch_candidates(stable_candidate(media), handled, str(tmp_path), "/out", 100.0)
+    cortador.process_watch_candidates(stable_candidate(media), handled, str(tmp_path), "/out", 100.0)
+    assert len(calls) == 1
+
+    media.write_bytes(b"audio nuevo")
+    cortador.process_watch_candidates(stable_candidate(media), handled, str(tmp_path), "/out", 100.0)
+    assert len(calls) == 2
+
+
+def test_encola_solo_los_cortes_que_faltan(tmp_path, monkeypatch):
+    media = tmp_path / "nota.wav"
+    media.write_bytes(b"audio")
+    write_rules(tmp_path / "cortador.json", {"formatos": [".mp3", ".aac"], "inicio": 1})
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "nota.mp3").write_bytes(b"ya existe")
+    submitted = []
+    monkeypatch.setattr(cortador, "get_media_info", lambda path: {"duration": 30.0})
+    monkeypatch.setattr(cortador, "submit_cut_job", lambda *args, **kwargs: submitted.append((args, kwargs)))
+
+    assert cortador.handle_watched_file(str(media), str(tmp_path), str(out)) == 1
+    (args, kwargs), = submitted
+    assert args[:4] == (str(media), 1.0, 30.0, str(out / "nota.aac")) and kwargs["priority"] == "fondo"
+
+    os.remove(tmp_path / "cortador.json")
+    assert cortador.handle_watched_file(str(media), str(tmp_path), str(out)) is None
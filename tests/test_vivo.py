@@ -0,0 +1,44 @@
+import cortador
+from conftest import StubWidget, lavfi_media, requires_ffmpeg
+
+
+class Var:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def test_al_cargar_en_vivo_se_sondea_una_sola_vez(tmp_path, monkeypatch):
+    media = tmp_path / "grabando.wav"
+    media.write_bytes(b"audio")
+    probes = []
+
+    def probe_media(file_path, backend=None):
+        probes.append(file_path)
+        return {"duration": 30.0, "start_time": 1.5, "channels": 1}
+
+    monkeypatch.setattr(cortador, "probe_media", probe_media)
+    monkeypatch.setattr(cortador, "get_media_info", lambda path: 1 / 0)
+    monkeypatch.setattr(cortador, "start_peak_extraction_thread", lambda *args: None)
+    monkeypatch.setattr(cortador, "live_mode_var", Var(True))
+    monkeypatch.setattr(cortador, "live_state", None)
+    for name in ("waveform_canvas", "entry_start_time", "entry_end_time", "status_label",
+                 "selected_start_time_label", "selected_end_time_label"):
+        monkeypatch.setattr(cortador, name, StubWidget())
+
+    cortador.select_file_from_path(str(media), StubWidget(), StubWidget())
+
+    assert probes == [str(media)]
+    assert cortador.live_state["start_time"] == 1.5 and cortador.live_state["duration"] == 30.0
+
+
+@requires_ffmpeg
+def test_borde_en_vivo_lee_solo_la_cola(tmp_path):
+    media = lavfi_media(tmp_path / "grabando.mp3", "-f", "lavfi", "-i", "sine=duration=12")
+
+    edge = cortador.probe_live_edge(media, 5.0)
+
+    assert 11.9 <= edge <= 12.1
+    assert cortador.probe_live_edge(media, 20.0) == 20.0 # Nunca retrocede